@@ -2,34 +2,415 @@
 # -*- coding: utf-8 -*-
 # HAR File Analyzer - A Python GUI Application for analyzing HTTP Archive files
 # This application allows users to load and analyze HAR files to extract network request data
+#
+# Run without arguments for the GUI, or use a subcommand on headless machines:
+#   python PythonPoweredHARAnalysis.py flags capture.har
+#   python PythonPoweredHARAnalysis.py {analyze,flags,tokens,credentials,replay,report,diff,visualize} --help
+#
+# Heavy libraries (tkinter, pandas, numpy, matplotlib, requests) are imported
+# only by the code paths that need them, so the CLI starts quickly.
 
 # Import required libraries
-import tkinter as tk                    # Main GUI library
-from tkinter import filedialog         # File dialog for selecting HAR files
-from tkinter import ttk                 # Enhanced GUI widgets
-from tkinter import messagebox         # Message boxes for alerts
-from tkinter import scrolledtext       # Scrollable text widget for detailed output
+import argparse                        # Command line interface
 import json                            # JSON parsing for HAR files
-import re                              # Regular expressions for pattern matching
+import os                              # File size for the load progress bar
+import queue                           # Hand-off of parsed rows from the loader thread
+import sys                             # Exit codes for the CLI
+import threading                       # Background HAR loading
+import time                            # Batch flush timing
+from array import array                # Compact column storage for the request table
 # from haralyzer import HarParser        # HAR file parsing library - REMOVED (not needed)
-import pandas as pd                    # Data manipulation and analysis
-import requests                        # HTTP requests library
-import matplotlib.pyplot as plt       # Plotting and visualization
-import seaborn as sns                  # Statistical data visualization
+from har_stream import iter_har_entries, HARFollower, EntryFile  # Incremental HAR reader, follower and lazy entry access
+from har_scanner import DECODED_BODY_KEY, decoded_body  # Decoded response bodies for the details window
+from har_analysis import (analyze_entry, CaptureAnalysis, analyze_har_file,  # Headless analysis shared with the other tools
+                          to_int, to_number, STATUS_RANGE, SIZE_RANGE, HAR_TIMING_PHASES,
+                          extract_entry, analyze_har_with_pandas, url_template)
+
+# GUI modules - filled in by load_gui_libraries() when the Tk frontend starts
+tk = ttk = filedialog = messagebox = scrolledtext = None
+
+def load_gui_libraries():
+    """Import tkinter on demand so the CLI also works on headless servers"""
+    global tk, ttk, filedialog, messagebox, scrolledtext
+    import tkinter                         # Main GUI library
+    from tkinter import filedialog as tk_filedialog      # File dialog for selecting HAR files
+    from tkinter import ttk as tk_ttk                    # Enhanced GUI widgets
+    from tkinter import messagebox as tk_messagebox      # Message boxes for alerts
+    from tkinter import scrolledtext as tk_scrolledtext  # Scrollable text widget for detailed output
+    tk, ttk, filedialog = tkinter, tk_ttk, tk_filedialog
+    messagebox, scrolledtext = tk_messagebox, tk_scrolledtext
+
+# Background loading: rows are sent to the GUI in batches through a bounded queue
+ROW_BATCH_SIZE = 500                   # Max rows per batch sent by the loader thread
+ROW_BATCH_MAX_DELAY = 0.05             # Seconds before a partial batch is sent anyway
+LOAD_QUEUE_SIZE = 64                   # Max batches waiting for the GUI (back-pressure)
+LOAD_POLL_MS = 30                      # How often the GUI drains the queue
+MAX_ROWS_PER_TICK = 5000               # Rows inserted per tick so the window stays responsive
+FOLLOW_POLL_SECONDS = 1.0              # Wait between checks of a followed file with no new data
+
+# Max number of non-flag secrets listed in the Flag Analysis tab
+SECRETS_DISPLAY_LIMIT = 200
+
+# Max characters of an entry shown in the details window
+DETAILS_DISPLAY_LIMIT = 1 << 20
+
+def summarize_entry(entry, start=-1, end=-1):
+    """
+    Return the row stored in the request table for one entry
+    
+    Args:
+        entry (dict): One HAR entry
+        start, end (int): Byte span of the entry in its file (-1 if unknown)
+        
+    Returns:
+        tuple: (url, status, time, method, size, start, end)
+    """
+    # Extract data from JSON structure with safe access
+    request = entry.get('request', {})
+    response = entry.get('response', {})
+    
+    url = request.get('url', 'Unknown URL')                    # Request URL
+    status = response.get('status', 'Unknown')                 # HTTP status code
+    response_time = entry.get('time', 0)                       # Response time in milliseconds
+    method = request.get('method', 'Unknown')                  # HTTP method
+    size = response.get('bodySize', -1)                        # Response body size in bytes
+    
+    # Handle missing or invalid time values
+    if response_time is None:
+        response_time = 0
+    
+    return (url, status, response_time, method, size, start, end)
+
+def placeholder_row(start=-1, end=-1):
+    """Row kept for an entry summarize_entry() can't read, so row numbers stay entry indexes"""
+    return ('Unreadable entry', 'Unknown', 0, 'Unknown', -1, start, end)
+
+class EntryRecord:
+    """
+    Compact view of one request: the table columns plus where the entry
+    lives in the file, so the full entry can be re-read on demand
+    """
+    
+    __slots__ = ('index', 'url', 'method', 'status', 'time', 'size', 'offset', 'length')
+    
+    def __init__(self, index, url, method, status, time, size, offset, length):
+        self.index = index
+        self.url = url
+        self.method = method
+        self.status = status
+        self.time = time
+        self.size = size
+        self.offset = offset                     # Byte offset of the entry in the HAR file (-1 = unknown)
+        self.length = length                     # Byte length of the entry
+
+class RequestStore:
+    """Column store for the request table: one list/array per column instead of a widget row per entry"""
+    
+    UNKNOWN_STATUS = -1                          # Stored when the entry has no usable status code
+    
+    def __init__(self):
+        self.urls = []                           # Request URLs
+        self.statuses = array('i')               # HTTP status codes
+        self.times = array('d')                  # Response times in milliseconds
+        self.methods = array('B')                # Index into method_names
+        self.method_names = []                   # Distinct HTTP methods
+        self.method_codes = {}                   # method -> index in method_names
+        self.sizes = array('q')                  # Response body sizes (-1 = unknown)
+        self.offsets = array('q')                # Byte offset of each entry in the file
+        self.lengths = array('q')                # Byte length of each entry
+        
+    def __len__(self):
+        return len(self.urls)
+        
+    def append(self, row):
+        """Add one row from summarize_entry()"""
+        url, status, response_time, method, size, start, end = row
+        # Coerce every field before touching a column, so a value that doesn't
+        # fit its typed array can't leave the columns different lengths
+        status = to_int(status, self.UNKNOWN_STATUS, STATUS_RANGE)
+        response_time = to_number(response_time, 0.0)
+        size = to_int(size, -1, SIZE_RANGE)
+        url = str(url)
+        
+        method = str(method)
+        code = self.method_codes.get(method)
+        if code is None:
+            # Nonstandard methods beyond the first 255 share the last slot
+            code = min(len(self.method_names), 255)
+            if code == len(self.method_names):
+                self.method_names.append(method)
+            self.method_codes[method] = code
+            
+        self.urls.append(url)
+        self.statuses.append(status)
+        self.times.append(response_time)
+        self.methods.append(code)
+        self.sizes.append(size)
+        self.offsets.append(start)
+        self.lengths.append(end - start if start >= 0 else 0)
+        
+    def row(self, index):
+        """Return display values for one stored entry"""
+        status = self.statuses[index]
+        return (
+            self.urls[index],
+            'Unknown' if status == self.UNKNOWN_STATUS else status,
+            f"{self.times[index]:.2f}"
+        )
+        
+    def record(self, index):
+        """Return an EntryRecord for one stored entry"""
+        return EntryRecord(index, self.urls[index], self.method_names[self.methods[index]],
+                           self.statuses[index], self.times[index], self.sizes[index],
+                           self.offsets[index], self.lengths[index])
+
+class VirtualRequestTable:
+    """
+    Request table that only creates widget rows for the visible window
+    
+    The Treeview holds a small, fixed pool of items whose values are rewritten
+    as the user scrolls, so Tk's cost depends on the window height rather than
+    on the number of entries. Sorting and filtering reorder a compact array of
+    entry indices (the "view") instead of rebuilding the widget.
+    """
+    
+    COLUMNS = ("URL", "Status", "Time")
+    HEADINGS = {"URL": "Request URL", "Status": "Status Code", "Time": "Time (ms)"}
+    ROW_HEIGHT = 20                              # Default ttk Treeview row height in pixels
+    
+    def __init__(self, parent, on_open=None):
+        """
+        Args:
+            parent: Tk container for the filter bar and table
+            on_open (callable): Called with the entry index of a double-clicked row
+        """
+        self.store = RequestStore()
+        self.on_open = on_open
+        self.view = None                         # array of entry indices, None = all in load order
+        self.offset = 0                          # First visible position in the view
+        self.visible_rows = 0
+        self.sort_column = None
+        self.sort_descending = False
+        self.filter_text = ''
+        
+        # Filter bar
+        filter_frame = tk.Frame(parent)
+        filter_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        tk.Label(filter_frame, text="Filter URL:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        filter_entry = tk.Entry(filter_frame, textvariable=self.filter_var)
+        filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 10))
+        self.count_label = tk.Label(filter_frame, text="0 requests")
+        self.count_label.pack(side=tk.RIGHT)
+        self.filter_job = None
+        self.filter_var.trace_add("write", self.schedule_filter)
+        
+        table_frame = tk.Frame(parent)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Create table (Treeview) for displaying the visible window only
+        self.tree = ttk.Treeview(table_frame, columns=self.COLUMNS, show="headings", height=1)
+        
+        # Define column headings (click to sort)
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=self.HEADINGS[col], command=lambda c=col: self.sort_by(c))
+        
+        # Set column widths and alignment
+        self.tree.column("URL", width=400, anchor="w")        # Left align URLs
+        self.tree.column("Status", width=100, anchor="center") # Center align status
+        self.tree.column("Time", width=100, anchor="center")   # Center align time
+        
+        # Scrollbar drives our own offset, not the Treeview's
+        self.scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.on_scrollbar)
+        
+        # Pack treeview and scrollbar
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        # Resize the row pool with the window, scroll with the mouse wheel
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_by(-3 if e.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.tree.bind("<Double-1>", self.on_double_click)
+        
+    def view_length(self):
+        return len(self.store) if self.view is None else len(self.view)
+        
+    def view_index(self, position):
+        return position if self.view is None else self.view[position]
+        
+    def clear(self):
+        """Forget all rows (keeps sort column and filter text)"""
+        self.store = RequestStore()
+        self.view = None if not self.is_reordered() else array('q')
+        self.offset = 0
+        self.render()
+        
+    def is_reordered(self):
+        return self.sort_column is not None or bool(self.filter_text)
+        
+    def append_rows(self, rows):
+        """
+        Add rows while a file is loading
+        
+        Rows matching the active filter are appended to the end of the view;
+        call apply_view() afterwards to restore the sort order.
+        """
+        start = len(self.store)
+        for row in rows:
+            self.store.append(row)
+            
+        if self.view is not None:
+            needle = self.filter_text
+            urls = self.store.urls
+            self.view.extend(i for i in range(start, len(self.store)) if needle in urls[i].lower())
+            
+    def apply_view(self, candidates=None):
+        """
+        Rebuild the view from the current filter and sort settings
+        
+        Args:
+            candidates: Optional iterable of entry indices to filter instead
+                        of the whole store (used for incremental filtering)
+        """
+        if not self.is_reordered():
+            self.view = None
+        else:
+            if candidates is None:
+                candidates = range(len(self.store))
+            if self.filter_text:
+                urls = self.store.urls
+                needle = self.filter_text
+                candidates = [i for i in candidates if needle in urls[i].lower()]
+            if self.sort_column is not None:
+                key = {
+                    "URL": self.store.urls.__getitem__,
+                    "Status": self.store.statuses.__getitem__,
+                    "Time": self.store.times.__getitem__,
+                }[self.sort_column]
+                candidates = sorted(candidates, key=key, reverse=self.sort_descending)
+            self.view = array('q', candidates)
+        
+        self.offset = min(self.offset, max(0, self.view_length() - self.visible_rows))
+        self.render()
+        
+    def sort_by(self, column):
+        """Sort by a column; clicking the same heading again reverses the order"""
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+            
+        # Show the sort direction in the headings
+        for col in self.COLUMNS:
+            arrow = ''
+            if col == column:
+                arrow = ' ▼' if self.sort_descending else ' ▲'
+            self.tree.heading(col, text=self.HEADINGS[col] + arrow)
+            
+        # Re-sorting only reorders the entries that already pass the filter
+        self.apply_view(self.view)
+        
+    def schedule_filter(self, *args):
+        """Debounce typing in the filter box"""
+        if self.filter_job:
+            self.tree.after_cancel(self.filter_job)
+        self.filter_job = self.tree.after(150, self.update_filter)
+        
+    def update_filter(self):
+        """Apply the filter text, narrowing the current view when the text was only extended"""
+        self.filter_job = None
+        new_text = self.filter_var.get().strip().lower()
+        if new_text == self.filter_text:
+            return
+            
+        # Typing more characters can only remove rows, so filter the current view
+        narrowing = self.filter_text and new_text.startswith(self.filter_text)
+        candidates = self.view if narrowing else None
+        
+        self.filter_text = new_text
+        self.offset = 0
+        self.apply_view(candidates)
+        
+    def on_double_click(self, event):
+        """Open the entry under the mouse (pool rows map to offset + row number)"""
+        item = self.tree.identify_row(event.y)
+        if not item or not self.on_open:
+            return
+        position = self.offset + self.tree.index(item)
+        if position < self.view_length():
+            self.on_open(self.view_index(position))
+        
+    def on_resize(self, event):
+        """Grow or shrink the pool of widget rows to fill the window"""
+        rows = max(1, (event.height - self.ROW_HEIGHT) // self.ROW_HEIGHT)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render()
+            
+    def on_scrollbar(self, action, amount, unit=None):
+        """Translate scrollbar commands into a new offset"""
+        if action == "moveto":
+            self.offset = int(float(amount) * self.view_length())
+            self.clamp_and_render()
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+            
+    def scroll_by(self, rows):
+        self.offset += rows
+        self.clamp_and_render()
+        
+    def clamp_and_render(self):
+        self.offset = max(0, min(self.offset, self.view_length() - self.visible_rows))
+        self.render()
+        
+    def render(self):
+        """Write the visible window of the view into the widget row pool"""
+        total = self.view_length()
+        items = self.tree.get_children()
+        shown = max(0, min(self.visible_rows, total - self.offset))
+        
+        # Create missing pool rows, remove surplus ones
+        for _ in range(len(items), shown):
+            self.tree.insert("", "end", values=())
+        if len(items) > shown:
+            self.tree.delete(*items[shown:])
+        items = self.tree.get_children()
+        
+        for k, item in enumerate(items):
+            self.tree.item(item, values=self.store.row(self.view_index(self.offset + k)))
+        
+        # Update scrollbar position and row count
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + shown) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{total} of {len(self.store)} requests")
 
 class HARAnalyzerApp:
     """Main application class for HAR file analysis"""
     
     def __init__(self, root):
         """Initialize the GUI application"""
+        load_gui_libraries()
         self.root = root
         self.root.title("HAR File Analyzer - Enhanced with Flag Detection")      # Set window title
         self.root.geometry("900x600")             # Increased window size
         
-        # Store data for analysis
-        self.har_data = None
-        self.flags_found = []
-        self.session_tokens = []
+        # Store data for analysis (only the path - entries are streamed from disk on demand)
+        self.har_file_path = None
+        self.entry_file = None                    # Re-reads single entries for the details window
+        self.entry_count = 0
+        self.analysis = CaptureAnalysis()         # Findings and credential index built while loading
+        
+        # Background loader state
+        self.load_queue = None
+        self.load_cancel = None
+        self.load_file_path = None
+        self.following = False                    # True while a growing file is being followed
         
         self.setup_gui()
         
@@ -82,7 +463,44 @@ class HARAnalyzerApp:
             pady=10,
             state=tk.DISABLED
         )
-        self.token_button.pack(side=tk.LEFT)
+        self.token_button.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Create follow button (tail a capture that is still being written)
+        self.follow_button = tk.Button(
+            button_frame, 
+            text="Follow File", 
+            command=self.follow_har_file,
+            font=("Arial", 12),
+            bg="#9C27B0",
+            fg="white",
+            padx=20,
+            pady=10
+        )
+        self.follow_button.pack(side=tk.LEFT)
+        
+        # Create cancel button (only active while a file is loading)
+        self.cancel_button = tk.Button(
+            button_frame, 
+            text="Cancel", 
+            command=self.cancel_loading,
+            font=("Arial", 12),
+            bg="#F44336",
+            fg="white",
+            padx=20,
+            pady=10,
+            state=tk.DISABLED
+        )
+        self.cancel_button.pack(side=tk.RIGHT)
+        
+        # Progress frame: bar + status text for background loading
+        progress_frame = tk.Frame(main_frame)
+        progress_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.status_label = tk.Label(progress_frame, text="No file loaded", width=30, anchor="e")
+        self.status_label.pack(side=tk.RIGHT, padx=(10, 0))
         
         # Create notebook for tabs
         self.notebook = ttk.Notebook(main_frame)
@@ -102,26 +520,9 @@ class HARAnalyzerApp:
         overview_frame = ttk.Frame(self.notebook)
         self.notebook.add(overview_frame, text="Request Overview")
         
-        # Create table (Treeview) for displaying data
-        self.tree = ttk.Treeview(overview_frame, columns=("URL", "Status", "Time"), show="headings")
-        
-        # Define column headings
-        self.tree.heading("URL", text="Request URL")
-        self.tree.heading("Status", text="Status Code")
-        self.tree.heading("Time", text="Time (ms)")
-        
-        # Set column widths and alignment
-        self.tree.column("URL", width=400, anchor="w")        # Left align URLs
-        self.tree.column("Status", width=100, anchor="center") # Center align status
-        self.tree.column("Time", width=100, anchor="center")   # Center align time
-        
-        # Pack the treeview with scrollbar
-        tree_scrollbar = ttk.Scrollbar(overview_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=tree_scrollbar.set)
-        
-        # Pack treeview and scrollbar
-        self.tree.pack(side="left", fill="both", expand=True, padx=(10, 0), pady=10)
-        tree_scrollbar.pack(side="right", fill="y", padx=(0, 10), pady=10)
+        # Virtual table: only the visible rows exist as widget items
+        # Double-click a row to see the full entry (read back from the file on demand)
+        self.request_table = VirtualRequestTable(overview_frame, on_open=self.show_entry_details)
         
     def setup_flag_tab(self):
         """Setup the flag analysis tab"""
@@ -145,6 +546,17 @@ class HARAnalyzerApp:
         token_frame = ttk.Frame(self.notebook)
         self.notebook.add(token_frame, text="Session Tokens")
         
+        # Credential trace: where a token, cookie or auth value was issued and replayed
+        trace_frame = tk.Frame(token_frame)
+        trace_frame.pack(side="top", fill="x", padx=10, pady=(10, 0))
+        tk.Label(trace_frame, text="Trace credential:").pack(side=tk.LEFT)
+        self.trace_entry = tk.Entry(trace_frame)
+        self.trace_entry.pack(side=tk.LEFT, fill="x", expand=True, padx=5)
+        self.trace_entry.bind("<Return>", lambda event: self.trace_credential())
+        tk.Button(trace_frame, text="Trace", command=self.trace_credential).pack(side=tk.LEFT)
+        self.trace_label = tk.Label(trace_frame, text="", anchor="w")
+        self.trace_label.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Token table
         self.token_tree = ttk.Treeview(token_frame, columns=("Index", "URL", "Token"), show="headings")
         
@@ -166,8 +578,12 @@ class HARAnalyzerApp:
         self.token_tree.pack(side="left", fill="both", expand=True, padx=(10, 0), pady=10)
         token_scrollbar.pack(side="right", fill="y", padx=(0, 10), pady=10)
         
+        # Double-click a token to see the response it came from; select one to trace it
+        self.token_tree.bind("<Double-1>", self.on_token_double_click)
+        self.token_tree.bind("<<TreeviewSelect>>", self.on_token_select)
+        
     def load_har_file(self):
-        """Load and parse HAR file selected by user"""
+        """Ask for a HAR file and load it on a background thread"""
         # Open file dialog to select HAR file
         file_path = filedialog.askopenfilename(
             title="Select HAR File",
@@ -177,41 +593,364 @@ class HARAnalyzerApp:
         # Return if no file selected
         if not file_path:
             return
-            
+        
+        # Clear previous data in treeview and analysis results
+        self.reset_loaded_data(file_path)
+        self.har_file_path = None
+        
+        # Lock the buttons while loading
+        self.following = False
+        self.load_button.config(state=tk.DISABLED)
+        self.follow_button.config(state=tk.DISABLED)
+        self.flag_button.config(state=tk.DISABLED)
+        self.token_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        
+        # Progress is measured in bytes read from disk
         try:
-            # Read and parse the HAR file directly
-            with open(file_path, 'r', encoding='utf-8') as file:
-                self.har_data = json.load(file)          # Store HAR data for analysis
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            file_size = 0
+        self.progress_bar.config(maximum=max(file_size, 1), value=0)
+        self.status_label.config(text="Loading...")
+        
+        # Start the loader thread and begin polling its queue
+        self.load_file_path = file_path
+        self.load_queue = queue.Queue(maxsize=LOAD_QUEUE_SIZE)
+        self.load_cancel = threading.Event()
+        
+        load_thread = threading.Thread(
+            target=self.load_worker,
+            args=(file_path, self.load_queue, self.load_cancel)
+        )
+        load_thread.daemon = True
+        load_thread.start()
+        
+        self.root.after(LOAD_POLL_MS, self.poll_load_queue)
+    
+    def follow_har_file(self):
+        """Ask for a capture that is still being written and follow it live"""
+        file_path = filedialog.askopenfilename(
+            title="Select HAR File to Follow",
+            filetypes=[("HAR files", "*.har"), ("JSON lines", "*.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        # Start from a clean slate; findings are then updated as entries arrive
+        self.reset_loaded_data(file_path)
+        
+        # Analysis works on whatever has arrived so far
+        self.following = True
+        self.har_file_path = file_path
+        self.load_file_path = file_path
+        self.load_button.config(state=tk.DISABLED)
+        self.follow_button.config(state=tk.DISABLED)
+        self.flag_button.config(state=tk.NORMAL)
+        self.token_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_bar.config(maximum=1, value=0)
+        self.status_label.config(text="Following...")
+        
+        self.load_queue = queue.Queue(maxsize=LOAD_QUEUE_SIZE)
+        self.load_cancel = threading.Event()
+        
+        follow_thread = threading.Thread(
+            target=self.follow_worker,
+            args=(file_path, self.load_queue, self.load_cancel)
+        )
+        follow_thread.daemon = True
+        follow_thread.start()
+        
+        self.root.after(LOAD_POLL_MS, self.poll_load_queue)
+    
+    def reset_loaded_data(self, file_path):
+        """Forget the rows and findings of the previous capture"""
+        self.request_table.clear()
+        self.open_entry_file(file_path)
+        self.entry_count = 0
+        self.analysis = CaptureAnalysis()
+        self.token_tree.delete(*self.token_tree.get_children())
+        self.flag_text.delete(1.0, tk.END)
+    
+    @staticmethod
+    def follow_worker(file_path, load_queue, cancel_event):
+        """
+        Parse entries appended to a growing capture until cancelled
+        
+        Uses the same queue protocol as load_worker, plus:
+            ('records', [record, ...]) - analysis records of new entries
+            ('progress', (offset, size)) - checkpoint and current file size
+            ('restart', None) - the file was truncated or replaced; entries
+                                are read again from index 0
+            ('stopped', count)
+        """
+        def send(message):
+            while not cancel_event.is_set():
+                try:
+                    load_queue.put(message, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        follower = HARFollower(file_path)
+        count = 0
+        
+        try:
+            while not cancel_event.is_set():
+                restarts = follower.restarts
+                entries = follower.poll(spans=True)
+                if follower.restarts != restarts:
+                    # Earlier rows point into the old content
+                    count = 0
+                    if not send(('restart', None)):
+                        break
+                if not entries:
+                    send(('progress', (follower.offset, follower.size())))
+                    cancel_event.wait(FOLLOW_POLL_SECONDS)
+                    continue
                 
-            # Extract entries directly from JSON structure
-            entries = self.har_data['log']['entries']
+                rows = []
+                records = []
+                for entry, start, end in entries:
+                    row = placeholder_row(start, end)
+                    try:
+                        row = summarize_entry(entry, start, end)
+                        record = analyze_entry(count, entry)
+                        if record:
+                            records.append(record)
+                    except Exception as entry_error:
+                        print(f"Warning: Skipping entry due to error: {entry_error}")
+                    rows.append(row)
+                    count += 1
+                
+                for start in range(0, len(rows), ROW_BATCH_SIZE):
+                    send(('rows', rows[start:start + ROW_BATCH_SIZE]))
+                if records:
+                    send(('records', records))
+            
+            load_queue.put(('stopped', count))
             
-            # Clear previous data in treeview
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+        except Exception as e:
+            load_queue.put(('error', e))
+    
+    def add_live_records(self, records):
+        """Fold records of newly followed entries into the findings, credential index and token list"""
+        tokens_before = len(self.analysis.session_tokens)
+        new_findings = sum(self.analysis.add(record) for record in records)
+        
+        for token in self.analysis.session_tokens[tokens_before:]:
+            self.token_tree.insert("", "end", values=(token['entry_index'], token['url'], token['session_token']))
+        
+        if new_findings:
+            self.display_flag_results()
+    
+    def open_entry_file(self, file_path):
+        """Switch the details window over to a new capture"""
+        if self.entry_file:
+            self.entry_file.close()
+        self.entry_file = EntryFile(file_path)
+    
+    def on_token_double_click(self, event):
+        item = self.token_tree.identify_row(event.y)
+        if item:
+            self.show_entry_details(int(self.token_tree.item(item, 'values')[0]))
+    
+    def on_token_select(self, event):
+        selection = self.token_tree.selection()
+        if selection:
+            self.trace_entry.delete(0, tk.END)
+            self.trace_entry.insert(0, self.token_tree.item(selection[0], 'values')[2])
+            self.trace_credential()
+    
+    def trace_credential(self):
+        """Show where the value in the trace box was issued and used (one index lookup)"""
+        value = self.trace_entry.get().strip()
+        if not value:
+            self.trace_label.config(text="")
+            return
+        self.trace_label.config(text=describe_credential(value, self.analysis.credential_index.lookup(value)))
+    
+    def show_entry_details(self, index):
+        """
+        Show one full entry in a new window
+        
+        Only a compact record is kept per request, so the entry is parsed
+        again from its byte span in the (memory-mapped) file.
+        """
+        store = self.request_table.store
+        if index >= len(store):
+            return
+        record = store.record(index)
+        if record.offset < 0 or not self.entry_file:
+            messagebox.showwarning("Warning", "The location of this entry in the file is unknown.")
+            return
+        
+        try:
+            entry = self.entry_file.entry(record.offset, record.offset + record.length)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not read entry {index} from the HAR file: {str(e)}")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"Entry {index}: {record.method} {record.url[:100]}")
+        window.geometry("800x600")
+        
+        text = scrolledtext.ScrolledText(window, wrap=tk.WORD, font=("Consolas", 10))
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        status = 'Unknown' if record.status == RequestStore.UNKNOWN_STATUS else record.status
+        size = 'Unknown' if record.size < 0 else f"{record.size} bytes"
+        text.insert(tk.END, f"{record.method} {record.url}\n")
+        text.insert(tk.END, f"Status: {status}   Time: {record.time:.2f} ms   Size: {size}\n\n")
+        
+        # Response body with base64/compression undone
+        body = decoded_body(entry)
+        if body:
+            text.insert(tk.END, "RESPONSE BODY\n" + "=" * 50 + "\n")
+            text.insert(tk.END, body[:DETAILS_DISPLAY_LIMIT] + ("\n... (truncated)" if len(body) > DETAILS_DISPLAY_LIMIT else "") + "\n\n")
+        
+        # The raw entry, without the memoized decoded body
+        (entry.get('response', {}).get('content') or {}).pop(DECODED_BODY_KEY, None)
+        raw = json.dumps(entry, indent=2, ensure_ascii=False)
+        text.insert(tk.END, "HAR ENTRY\n" + "=" * 50 + "\n")
+        text.insert(tk.END, raw[:DETAILS_DISPLAY_LIMIT] + ("\n... (truncated)" if len(raw) > DETAILS_DISPLAY_LIMIT else ""))
+        text.config(state=tk.DISABLED)
+    
+    def cancel_loading(self):
+        """Ask the loader thread to stop"""
+        if self.load_cancel:
+            self.load_cancel.set()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_label.config(text="Cancelling...")
+    
+    @staticmethod
+    def load_worker(file_path, load_queue, cancel_event):
+        """
+        Parse and analyse a HAR file off the GUI thread
+        
+        Runs on a worker thread, so it never touches Tk widgets. Everything it
+        produces goes through load_queue as (kind, payload) messages:
+            ('rows', [row, ...])     - rows for the request table
+            ('progress', bytes_read) - bytes read so far
+            ('done', (count, analysis))
+            ('cancelled', count)
+            ('error', exception)
+        """
+        def send(message):
+            # Block while the GUI is behind, but give up if loading was cancelled
+            while not cancel_event.is_set():
+                try:
+                    load_queue.put(message, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        progress = {'bytes': 0}
+        count = 0
+        analysis = CaptureAnalysis()
+        batch = []
+        last_flush = time.monotonic()
+        
+        try:
+            entries = iter_har_entries(file_path, on_progress=lambda n: progress.update(bytes=n), spans=True)
+            for entry, start, end in entries:
+                if cancel_event.is_set():
+                    break
                 
-            # Extract and display key data
-            for entry in entries:
+                # Every entry gets a row, so row numbers stay entry indexes
+                row = placeholder_row(start, end)
                 try:
-                    # Extract data from JSON structure with safe access
-                    request = entry.get('request', {})
-                    response = entry.get('response', {})
-                    
-                    url = request.get('url', 'Unknown URL')                    # Request URL
-                    status = response.get('status', 'Unknown')                 # HTTP status code
-                    time = entry.get('time', 0)                              # Response time in milliseconds
-                    
-                    # Handle missing or invalid time values
-                    if time is None:
-                        time = 0
-                    
-                    # Insert data into table
-                    self.tree.insert("", "end", values=(url, status, f"{time:.2f}"))
-                    
+                    row = summarize_entry(entry, start, end)
+                    record = analyze_entry(count, entry)
+                    if record:
+                        analysis.add(record)
                 except Exception as entry_error:
                     # Skip this entry if there's an error processing it
                     print(f"Warning: Skipping entry due to error: {entry_error}")
-                    continue
+                batch.append(row)
+                count += 1
+                
+                # Send full batches, or partial ones so the first rows show up quickly
+                if len(batch) >= ROW_BATCH_SIZE or time.monotonic() - last_flush >= ROW_BATCH_MAX_DELAY:
+                    if not send(('rows', batch)) or not send(('progress', progress['bytes'])):
+                        break
+                    batch = []
+                    last_flush = time.monotonic()
+            
+            if cancel_event.is_set():
+                load_queue.put(('cancelled', count))
+                return
+            
+            if batch:
+                send(('rows', batch))
+            send(('progress', progress['bytes']))
+            send(('done', (count, analysis)))
+            
+        except Exception as e:
+            # Reported to the user by the GUI thread
+            load_queue.put(('error', e))
+    
+    def poll_load_queue(self):
+        """Drain loader messages on the GUI thread and insert rows in batches"""
+        rows_inserted = 0
+        
+        while rows_inserted < MAX_ROWS_PER_TICK:
+            try:
+                kind, payload = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'rows':
+                self.request_table.append_rows(payload)
+                rows_inserted += len(payload)
+                self.entry_count += len(payload)
+                action = "Following" if self.following else "Loading"
+                self.status_label.config(text=f"{action}... {self.entry_count} requests")
+            elif kind == 'records':
+                self.add_live_records(payload)
+            elif kind == 'restart':
+                self.reset_loaded_data(self.load_file_path)
+                self.status_label.config(text="File was truncated - following from the start")
+            elif kind == 'progress' and self.following:
+                offset, size = payload
+                self.progress_bar.config(maximum=max(size, 1), value=offset)
+            elif kind == 'progress':
+                self.progress_bar.config(value=payload)
+            else:
+                self.finish_loading(kind, payload)
+                return
+        
+        # Draw the visible window once per tick, however many rows arrived
+        if rows_inserted:
+            self.request_table.render()
+        
+        # Keep polling until the worker reports it is finished
+        self.root.after(LOAD_POLL_MS, self.poll_load_queue)
+    
+    def finish_loading(self, kind, payload):
+        """Restore the GUI once the loader thread has stopped"""
+        # Rows that arrived while sorted/filtered were appended unsorted
+        self.request_table.apply_view()
+        
+        self.load_queue = None
+        self.load_cancel = None
+        self.following = False
+        self.load_button.config(state=tk.NORMAL)
+        self.follow_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        
+        if kind == 'stopped':
+            # Everything parsed so far stays available for analysis
+            self.status_label.config(text=f"Stopped following after {payload} requests")
+        elif kind == 'done':
+            count, self.analysis = payload
+            
+            # Remember which file the findings belong to
+            self.har_file_path = self.load_file_path
+            self.status_label.config(text=f"Loaded {count} requests")
             
             # Enable analysis buttons
             self.flag_button.config(state=tk.NORMAL)
@@ -220,96 +959,39 @@ class HARAnalyzerApp:
             # Show success message
             messagebox.showinfo(
                 "Success", 
-                f"Successfully loaded {len(entries)} requests from HAR file.\nYou can now search for flags and session tokens!"
+                f"Successfully loaded {count} requests from HAR file.\nYou can now search for flags and session tokens!"
             )
-            
-        except KeyError as e:
+        elif kind == 'cancelled':
+            self.status_label.config(text=f"Cancelled after {payload} requests")
+        elif isinstance(payload, KeyError):
             # Handle missing keys in HAR structure
+            self.status_label.config(text="Load failed")
             messagebox.showerror(
                 "Error", 
-                f"Invalid HAR file structure. Missing key: {str(e)}"
+                f"Invalid HAR file structure. Missing key: {str(payload)}"
             )
-        except json.JSONDecodeError:
+        elif isinstance(payload, json.JSONDecodeError):
             # Handle invalid JSON format
+            self.status_label.config(text="Load failed")
             messagebox.showerror(
                 "Error", 
                 "Invalid JSON format. Please select a valid HAR file."
             )
-        except Exception as e:
+        else:
             # Handle other errors (invalid file format, etc.)
+            self.status_label.config(text="Load failed")
             messagebox.showerror(
                 "Error", 
-                f"Failed to load HAR file: {str(e)}"
+                f"Failed to load HAR file: {str(payload)}"
             )
     
     def search_flags(self):
         """Search for flags in the loaded HAR data"""
-        if not self.har_data:
+        if not self.har_file_path:
             messagebox.showwarning("Warning", "Please load a HAR file first!")
             return
             
-        self.flags_found = []
-        entries = self.har_data['log']['entries']
-        
-        # Clear previous results
-        self.flag_text.delete(1.0, tk.END)
-        self.flag_text.insert(tk.END, "🔍 Searching for flags in HAR file...\n\n")
-        self.root.update()
-        
-        # Search for flags in each entry
-        for i, entry in enumerate(entries):
-            try:
-                # Get response data
-                response = entry.get('response', {})
-                content = response.get('content', {})
-                response_text = content.get('text', '')
-                
-                # Skip empty responses
-                if not response_text:
-                    continue
-                    
-                # Try to parse JSON responses
-                try:
-                    if response_text.strip().startswith('{'):
-                        json_data = json.loads(response_text)
-                        
-                        # Look for session tokens with flags
-                        session_token = json_data.get('session_token')
-                        if session_token and 'FLAG{' in session_token:
-                            self.flags_found.append({
-                                'entry_index': i,
-                                'url': entry.get('request', {}).get('url', 'Unknown'),
-                                'flag': session_token,
-                                'context': 'Session Token',
-                                'full_response': json_data
-                            })
-                        
-                        # Search for any FLAG pattern in the entire response
-                        response_str = str(json_data)
-                        flag_matches = re.findall(r'FLAG\{[^}]+\}', response_str)
-                        for flag in flag_matches:
-                            if flag not in [f['flag'] for f in self.flags_found]:
-                                self.flags_found.append({
-                                    'entry_index': i,
-                                    'url': entry.get('request', {}).get('url', 'Unknown'),
-                                    'flag': flag,
-                                    'context': 'JSON Response'
-                                })
-                                
-                except json.JSONDecodeError:
-                    # Not JSON, search for flags in plain text
-                    flag_matches = re.findall(r'FLAG\{[^}]+\}', response_text)
-                    for flag in flag_matches:
-                        self.flags_found.append({
-                            'entry_index': i,
-                            'url': entry.get('request', {}).get('url', 'Unknown'),
-                            'flag': flag,
-                            'context': 'Plain Text Response'
-                        })
-                        
-            except Exception as e:
-                continue
-        
+        # Flags and secrets were collected while loading (no re-parsing)
         # Display results
         self.display_flag_results()
         
@@ -318,57 +1000,22 @@ class HARAnalyzerApp:
     
     def extract_session_tokens(self):
         """Extract session tokens from the loaded HAR data"""
-        if not self.har_data:
+        if not self.har_file_path:
             messagebox.showwarning("Warning", "Please load a HAR file first!")
             return
             
-        self.session_tokens = []
-        entries = self.har_data['log']['entries']
-        
         # Clear previous token data
-        for item in self.token_tree.get_children():
-            self.token_tree.delete(item)
+        self.token_tree.delete(*self.token_tree.get_children())
         
-        # Search for session tokens in each entry
-        for i, entry in enumerate(entries):
-            try:
-                # Get response data
-                response = entry.get('response', {})
-                content = response.get('content', {})
-                response_text = content.get('text', '')
-                
-                # Skip empty responses
-                if not response_text:
-                    continue
-                    
-                # Try to parse JSON responses
-                try:
-                    if response_text.strip().startswith('{'):
-                        json_data = json.loads(response_text)
-                        
-                        # Look for session tokens
-                        session_token = json_data.get('session_token')
-                        if session_token:
-                            self.session_tokens.append({
-                                'entry_index': i,
-                                'url': entry.get('request', {}).get('url', 'Unknown'),
-                                'session_token': session_token,
-                                'full_response': json_data
-                            })
-                            
-                            # Insert into token tree
-                            self.token_tree.insert("", "end", values=(i, entry.get('request', {}).get('url', 'Unknown'), session_token))
-                                
-                except json.JSONDecodeError:
-                    continue
-                        
-            except Exception as e:
-                continue
+        # Session tokens were collected while loading
+        session_tokens = self.analysis.session_tokens
+        for token in session_tokens:
+            self.token_tree.insert("", "end", values=(token['entry_index'], token['url'], token['session_token']))
         
         # Show results message
         messagebox.showinfo(
             "Session Tokens", 
-            f"Found {len(self.session_tokens)} session tokens in the HAR file!"
+            f"Found {len(session_tokens)} session tokens in the HAR file!"
         )
         
         # Switch to token tab
@@ -376,22 +1023,29 @@ class HARAnalyzerApp:
     
     def display_flag_results(self):
         """Display flag search results in the text area"""
+        flags_found, secrets_found = self.analysis.flags_found, self.analysis.secrets_found
         self.flag_text.delete(1.0, tk.END)
         
-        if self.flags_found:
+        if flags_found:
             self.flag_text.insert(tk.END, "🎉 FLAG ANALYSIS RESULTS\n")
             self.flag_text.insert(tk.END, "=" * 50 + "\n\n")
-            self.flag_text.insert(tk.END, f"🚩 Found {len(self.flags_found)} flag(s):\n\n")
+            self.flag_text.insert(tk.END, f"🚩 Found {len(flags_found)} flag(s):\n\n")
             
-            for i, flag_info in enumerate(self.flags_found, 1):
+            for i, flag_info in enumerate(flags_found, 1):
                 self.flag_text.insert(tk.END, f"{i}. FLAG: {flag_info['flag']}\n")
                 self.flag_text.insert(tk.END, f"   Entry Index: {flag_info['entry_index']}\n")
                 self.flag_text.insert(tk.END, f"   URL: {flag_info['url']}\n")
                 self.flag_text.insert(tk.END, f"   Context: {flag_info['context']}\n")
+                
+                # Index lookup: every entry this flag appears in
+                seen_in = flags_found.entries_with(flag_info['flag'])
+                if len(seen_in) > 1:
+                    self.flag_text.insert(tk.END, f"   Also in {len(seen_in) - 1} other entr{'y' if len(seen_in) == 2 else 'ies'}: "
+                                                  f"{', '.join(str(i) for i in seen_in[1:11])}{' ...' if len(seen_in) > 11 else ''}\n")
                 self.flag_text.insert(tk.END, "-" * 40 + "\n\n")
             
             # Highlight the main flag if found
-            for flag_info in self.flags_found:
+            for flag_info in flags_found:
                 if 'h4r_f1le_4n4lys1s_w1n' in flag_info['flag']:
                     self.flag_text.insert(tk.END, "🎯 MAIN CTF FLAG FOUND!\n")
                     self.flag_text.insert(tk.END, f"Submit this flag: {flag_info['flag']}\n\n")
@@ -403,99 +1057,328 @@ class HARAnalyzerApp:
             self.flag_text.insert(tk.END, "- Make sure you loaded the correct HAR file\n")
             self.flag_text.insert(tk.END, "- Check if the file contains API responses\n")
             self.flag_text.insert(tk.END, "- Try extracting session tokens first\n")
-
-def analyze_har_with_pandas(har_file_path):
-    """Analyze HAR file using pandas for data manipulation"""
-    try:
-        # Load HAR file
-        with open(har_file_path, 'r', encoding='utf-8') as file:
-            har_data = json.load(file)
-            
-        # Extract entries data
-        entries = har_data['log']['entries']
         
-        # Create list of dictionaries for DataFrame
-        data = []
-        for entry in entries:
-            try:
-                request = entry.get('request', {})
-                response = entry.get('response', {})
-                
-                data.append({
-                    'url': request.get('url', 'Unknown'),
-                    'method': request.get('method', 'Unknown'),
-                    'status': response.get('status', 0),
-                    'time': entry.get('time', 0),
-                    'size': response.get('bodySize', 0)
-                })
-            except Exception as e:
-                print(f"Warning: Skipping entry due to error: {e}")
-                continue
+        # Other secrets picked up by the scanner (capped so huge captures stay readable)
+        if secrets_found:
+            self.flag_text.insert(tk.END, "\n🔐 OTHER SECRETS FOUND\n")
+            self.flag_text.insert(tk.END, "=" * 50 + "\n\n")
+            self.flag_text.insert(tk.END, f"Found {len(secrets_found)} unique value(s):\n\n")
             
-        # Convert to pandas DataFrame
-        df = pd.DataFrame(data)
-        
-        # Basic analysis
-        print("HAR File Analysis Summary:")
-        print(f"Total requests: {len(df)}")
-        print(f"Average response time: {df['time'].mean():.2f}ms")
-        print(f"Status code distribution:\n{df['status'].value_counts()}")
+            for i, secret_info in enumerate(secrets_found.findings[:SECRETS_DISPLAY_LIMIT], 1):
+                value = secret_info['flag']
+                if len(value) > 80:
+                    value = value[:77] + "..."
+                seen_in = len(secrets_found.entries_with(secret_info['flag']))
+                self.flag_text.insert(tk.END, f"{i}. [{secret_info['detector']}] {value}\n")
+                self.flag_text.insert(tk.END, f"   First seen: entry {secret_info['entry_index']} ({secret_info['context']}), "
+                                              f"{seen_in} entr{'y' if seen_in == 1 else 'ies'} total\n")
+            
+            if len(secrets_found) > SECRETS_DISPLAY_LIMIT:
+                self.flag_text.insert(tk.END, f"\n... {len(secrets_found) - SECRETS_DISPLAY_LIMIT} more not shown\n")
+
+# Quantiles reported per group by latency_report()
+REPORT_QUANTILES = (0.5, 0.9, 0.99)
+
+def latency_report(df, by=('host', 'path', 'method'), quantiles=REPORT_QUANTILES):
+    """
+    Latency percentiles, bytes and error rates per host / path template / method
+    
+    All statistics come from one groupby; URL templates are computed once
+    per distinct URL, not once per request.
+    
+    Args:
+        df (DataFrame): Output of har_columns_to_dataframe()
+        by (tuple): Grouping columns, any of 'host', 'path' and 'method'
+        quantiles (tuple): Quantiles of total time and of every timing phase
         
-        return df
+    Returns:
+        DataFrame: One row per group with requests, error_rate, bytes,
+                   bytes_p50 and time_p50/time_p90/... plus <phase>_p50/...,
+                   sorted by the highest time quantile (slowest first)
+    """
+    import numpy as np
+    import pandas as pd
+    
+    data = df[['host', 'method', 'time', 'size', *HAR_TIMING_PHASES]].copy()
+    if 'path' in by:
+        urls = pd.Categorical(df['url'])
+        templates = np.asarray(urls.categories.map(url_template), dtype=object)
+        data['path'] = pd.Categorical(templates[urls.codes])
+    # Status 0 means the request never completed (blocked, aborted, ...)
+    status = df['status'].astype(np.int32)
+    data['error'] = ((status >= 400) | (status == 0)).astype(np.float32)
+    
+    groups = data.groupby(list(by), observed=True, sort=False)
+    
+    summary = groups.agg(requests=('time', 'size'), error_rate=('error', 'mean'),
+                         bytes=('size', 'sum'), bytes_p50=('size', 'median'))
+    
+    # Quantiles of every latency column at once: index (group..., quantile) -> wide columns
+    latency_columns = ['time', *HAR_TIMING_PHASES]
+    spread = groups[latency_columns].quantile(list(quantiles)).unstack()
+    spread.columns = [f"{column}_p{round(q * 100):g}" for column, q in spread.columns]
+    
+    report = summary.join(spread)
+    slowest = f"time_p{round(quantiles[-1] * 100):g}"
+    return report.sort_values(slowest, ascending=False, na_position='last').reset_index()
+
+def print_latency_report(report, top=20):
+    """Print the slowest groups of a latency_report()"""
+    import pandas as pd
+    
+    time_columns = [column for column in report.columns if column.startswith('time_p')]
+    columns = [column for column in ('host', 'path', 'method') if column in report.columns]
+    columns += ['requests', 'error_rate', 'bytes', *time_columns]
+    with pd.option_context('display.width', 200, 'display.max_colwidth', 60,
+                           'display.float_format', '{:.2f}'.format):
+        print(f"Latency by {', '.join(c for c in ('host', 'path', 'method') if c in report.columns)} "
+              f"({len(report)} groups, slowest {min(top, len(report))} shown):")
+        print(report[columns].head(top).to_string(index=False))
+
+def index_har_requests(har_file_path):
+    """
+    Stream a capture into a har_diff.RequestIndex keyed by request fingerprint
+    
+    The fingerprint is (method, host, URL template, request body hash), so
+    the same call with a different ID or query string matches across captures.
+    """
+    from har_diff import RequestIndex, body_hash
+    
+    index = RequestIndex()
+    for entry in iter_har_entries(har_file_path):
+        try:
+            url, method, host, status, response_time, size, _ = extract_entry(entry, with_phases=False)
+            post_data = entry.get('request', {}).get('postData') or {}
+        except Exception as e:
+            print(f"Warning: Skipping entry due to error: {e}")
+            continue
+        fingerprint = (method, host, url_template(url), body_hash(post_data.get('text')))
+        index.add(fingerprint, url, status, response_time, size)
+    return index
+
+def diff_har_files(before_path, after_path, output_path=None, top=20):
+    """
+    Compare two captures (e.g. before/after a deploy) and print what changed
+    
+    Args:
+        before_path (str): Baseline HAR file
+        after_path (str): HAR file compared against the baseline
+        output_path (str): Optional path for the full JSON diff
+        top (int): Rows printed per section
         
+    Returns:
+        dict: The diff from har_diff.diff_indexes(), or None on error
+    """
+    from har_diff import diff_indexes
+    from multiprocessing import Pool
+    
+    try:
+        start = time.perf_counter()
+        # Stream both captures at the same time, one process each, when there are cores for it
+        if (os.cpu_count() or 1) > 1:
+            with Pool(2) as pool:
+                before, after = pool.map(index_har_requests, [before_path, after_path])
+        else:
+            before, after = index_har_requests(before_path), index_har_requests(after_path)
+        diff = diff_indexes(before, after)
+        elapsed = time.perf_counter() - start
     except Exception as e:
-        print(f"Error analyzing HAR file: {str(e)}")
+        print(f"Error comparing HAR files: {str(e)}")
         return None
+    
+    summary = diff['summary']
+    print(f"HAR Diff: {before_path} -> {after_path} ({elapsed:.2f}s)")
+    print(f"Entries: {summary['entries_before']} -> {summary['entries_after']}, "
+          f"endpoints: {summary['endpoints_before']} -> {summary['endpoints_after']}")
+    print(f"Added: {summary['added']}, removed: {summary['removed']}, "
+          f"changed: {summary['changed']}, unchanged: {summary['unchanged']}")
+    
+    for title, items in (("New requests", diff['added']), ("Removed requests", diff['removed'])):
+        if items:
+            print(f"\n{title}:")
+            for item in items[:top]:
+                print(f"  {item['method']} {item['host']}{item['path']} x{item['count']}")
+    
+    if diff['changed']:
+        print("\nChanged requests (largest latency shift first):")
+        for item in diff['changed'][:top]:
+            line = f"  {item['method']} {item['host']}{item['path']} [{', '.join(item['reasons'])}]"
+            if item['median_shift_ms'] is not None:
+                line += (f" median {item['median_before_ms']:.1f}ms -> {item['median_after_ms']:.1f}ms"
+                         f" ({item['median_shift_ms']:+.1f}ms)")
+            if 'status' in item['reasons']:
+                line += f" status {sorted(item['statuses_before'])} -> {sorted(item['statuses_after'])}"
+            print(line)
+    
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as file:
+            json.dump(diff, file, indent=2)
+        print(f"Diff written to {output_path}")
+    
+    return diff
 
-def replay_requests_from_har(har_file_path):
-    """Replay HTTP requests from HAR file using requests library"""
-    try:
-        # Load HAR file
-        with open(har_file_path, 'r', encoding='utf-8') as file:
-            har_data = json.load(file)
-            
-        entries = har_data['log']['entries']
+def replay_requests_from_har(har_file_path, concurrency=8, pace=False, speed=1.0, base_url=None, timeout=5):
+    """
+    Replay HTTP requests from HAR file using requests library
+    
+    Args:
+        har_file_path (str): Path to the HAR file
+        concurrency (int): Max requests in flight at once
+        pace (bool): Keep the original gaps between request start times
+        speed (float): Pacing multiplier (2.0 = twice as fast as captured)
+        base_url (str): Send every request to this scheme://host[:port] instead
+                        (e.g. a local stand-in server)
+        timeout (float): Per-request timeout in seconds
         
-        # Replay each request
-        for entry in entries:
-            request_data = entry['request']
-            url = request_data['url']
-            method = request_data['method']
-            
-            # Extract headers
-            headers = {header['name']: header['value'] 
-                      for header in request_data.get('headers', [])}
-            
-            # Make request based on method
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=5)
-            elif method == 'POST':
-                # Extract POST data if available
-                post_data = request_data.get('postData', {}).get('text', '')
-                response = requests.post(url, data=post_data, headers=headers, timeout=5)
+    Returns:
+        list: One result dict per entry (see HARReplayer.send), or None on error
+    """
+    from har_replay import HARReplayer     # Imports requests, so only load it when replaying
+    
+    print_lock = threading.Lock()
+    
+    def report(result):
+        with print_lock:
+            if result['error']:
+                print(f"Failed {result['method']} {result['url']} - {result['error']}")
             else:
-                print(f"Unsupported method: {method}")
-                continue
-                
-            print(f"Replayed {method} {url} - Status: {response.status_code}")
-            
+                print(f"Replayed {result['method']} {result['url']} - Status: {result['status']}")
+    
+    replayer = HARReplayer(concurrency=concurrency, timeout=timeout, pace=pace,
+                           speed=speed, base_url=base_url)
+    try:
+        # Stream entries into the replay engine (all methods, pooled connections)
+        start = time.perf_counter()
+        results = replayer.replay(iter_har_entries(har_file_path), on_result=report)
+        elapsed = time.perf_counter() - start
+        
+        failed = sum(1 for result in results if result['error'])
+        print(f"Replayed {len(results)} requests in {elapsed:.2f}s ({failed} failed)")
+        return results
+        
     except Exception as e:
         print(f"Error replaying requests: {str(e)}")
+        return None
+    finally:
+        replayer.close()
+
+def benchmark_replay(har_file_path, output_path=None, threshold=1.5, concurrency=8, pace=False,
+                     speed=1.0, base_url=None, timeout=5):
+    """
+    Replay a HAR file and compare each request's latency with the capture
+    
+    Args:
+        har_file_path (str): Path to the HAR file
+        output_path (str): Optional path for the JSON report
+        threshold (float): Flag host/endpoint groups whose replayed p95 is
+                           more than this many times the captured p95
+        concurrency, pace, speed, base_url, timeout: See replay_requests_from_har
+        
+    Returns:
+        dict: The report from benchmark_report(), or None on error
+    """
+    from har_replay import HARReplayer, benchmark_report
+    
+    replayer = HARReplayer(concurrency=concurrency, timeout=timeout, pace=pace,
+                           speed=speed, base_url=base_url)
+    try:
+        print(f"Benchmarking replay of {har_file_path}...")
+        results = replayer.replay(iter_har_entries(har_file_path))
+        report = benchmark_report(results, threshold=threshold)
+        report['source'] = har_file_path
+        
+        # Summary
+        overall = report['overall']
+        print(f"Requests: {report['requests']} ({report['failed']} failed)")
+        if overall['count']:
+            print(f"Replayed p50/p95/p99: {overall['replayed_p50']:.1f} / "
+                  f"{overall['replayed_p95']:.1f} / {overall['replayed_p99']:.1f} ms")
+        if overall['captured_p50'] is not None:
+            print(f"Captured p50/p95/p99: {overall['captured_p50']:.1f} / "
+                  f"{overall['captured_p95']:.1f} / {overall['captured_p99']:.1f} ms")
+        
+        if report['regressions']:
+            print(f"Regressions (replayed p95 > {threshold}x captured p95):")
+            for group in report['regressions']:
+                name = group['host'] if 'path' not in group else f"{group['method']} {group['host']}{group['path']}"
+                print(f"  {name}: {group['captured_p95']:.1f} -> {group['replayed_p95']:.1f} ms "
+                      f"({group['p95_ratio']:.2f}x, {group['count']} requests)")
+        else:
+            print("No regressions found")
+        
+        if output_path:
+            with open(output_path, 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+            print(f"Report written to {output_path}")
+        
+        return report
+        
+    except Exception as e:
+        print(f"Error benchmarking replay: {str(e)}")
+        return None
+    finally:
+        replayer.close()
+
+# Bin counts for the pre-aggregated dashboard panels
+HISTOGRAM_BINS = 50
+SCATTER_BINS = 100
+
+def log_bin_edges(values, bins):
+    """Log-spaced bin edges covering the positive values (latency/size are long-tailed)"""
+    import numpy as np
+    
+    positive = values[values > 0]
+    if not len(positive):
+        return np.linspace(0, 1, bins + 1)
+    low, high = float(positive.min()), float(positive.max())
+    if high <= low:
+        high = low * 10
+    return np.geomspace(low, high, bins + 1)
 
-def visualize_har_data(har_file_path):
-    """Create visualizations of HAR data using matplotlib and seaborn"""
+def visualize_har_data(har_file_path, use_cache=True, output_path=None, bins=SCATTER_BINS):
+    """
+    Create visualizations of HAR data using matplotlib
+    
+    The histogram and the time-vs-size panel are binned with numpy before
+    plotting, so drawing cost depends on the bin count rather than the number
+    of requests.
+    
+    Args:
+        har_file_path (str): Path to the HAR file
+        use_cache (bool): Reuse cached columns for an unchanged capture
+        output_path (str): Write the dashboard to this .png/.svg/.pdf file with a
+                           non-interactive backend instead of opening a window
+        bins (int): Bins per axis of the time-vs-size heatmap
+        
+    Returns:
+        str: output_path when a file was written, otherwise None
+    """
+    import numpy as np
+    import matplotlib
+    if output_path:
+        matplotlib.use('Agg')                  # No display needed; must come before pyplot
+    import matplotlib.pyplot as plt        # Plotting and visualization
+    from matplotlib.colors import LogNorm
+    
     try:
-        # Load and analyze HAR file
-        df = analyze_har_with_pandas(har_file_path)
+        # Load and analyze HAR file (cached columns are reused)
+        df = analyze_har_with_pandas(har_file_path, use_cache)
         if df is None:
-            return
+            return None
             
+        times = df['time'].to_numpy(dtype=np.float64, na_value=np.nan)
+        sizes = df['size'].to_numpy(dtype=np.float64)
+        valid = np.isfinite(times) & (times > 0)
+        
         # Create figure with subplots
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle('HAR File Analysis Dashboard', fontsize=16)
         
-        # 1. Response time distribution
-        axes[0, 0].hist(df['time'], bins=30, color='skyblue', alpha=0.7)
+        # 1. Response time distribution (counted by numpy, drawn as one bar per bin)
+        time_edges = log_bin_edges(times[valid], HISTOGRAM_BINS)
+        counts, _ = np.histogram(times[valid], bins=time_edges)
+        axes[0, 0].stairs(counts, time_edges, fill=True, color='skyblue', alpha=0.7)
+        axes[0, 0].set_xscale('log')
         axes[0, 0].set_title('Response Time Distribution')
         axes[0, 0].set_xlabel('Time (ms)')
         axes[0, 0].set_ylabel('Frequency')
@@ -507,25 +1390,43 @@ def visualize_har_data(har_file_path):
         
         # 3. Request method distribution
         method_counts = df['method'].value_counts()
-        axes[1, 0].bar(method_counts.index, method_counts.values, color='lightgreen')
+        axes[1, 0].bar(method_counts.index.astype(str), method_counts.values, color='lightgreen')
         axes[1, 0].set_title('HTTP Method Distribution')
         axes[1, 0].set_xlabel('Method')
         axes[1, 0].set_ylabel('Count')
         
-        # 4. Response size vs time scatter plot
-        axes[1, 1].scatter(df['time'], df['size'], alpha=0.6, color='orange')
+        # 4. Response size vs time as a 2D density instead of one marker per request
+        sized = valid & (sizes > 0)
+        size_edges = log_bin_edges(sizes[sized], bins)
+        grid, x_edges, y_edges = np.histogram2d(times[sized], sizes[sized],
+                                                bins=(log_bin_edges(times[sized], bins), size_edges))
+        if grid.any():
+            mesh = axes[1, 1].pcolormesh(x_edges, y_edges, np.ma.masked_equal(grid.T, 0),
+                                         norm=LogNorm(), cmap='Oranges', rasterized=True)
+            fig.colorbar(mesh, ax=axes[1, 1], label='Requests')
+            axes[1, 1].set_xscale('log')
+            axes[1, 1].set_yscale('log')
         axes[1, 1].set_title('Response Time vs Size')
         axes[1, 1].set_xlabel('Time (ms)')
         axes[1, 1].set_ylabel('Size (bytes)')
         
         plt.tight_layout()
+        if output_path:
+            fig.savefig(output_path)
+            plt.close(fig)
+            print(f"Dashboard written to {output_path}")
+            return output_path
         plt.show()
+        return None
         
     except Exception as e:
         print(f"Error creating visualizations: {str(e)}")
+        return None
 
-# Main execution
-if __name__ == "__main__":
+def run_gui():
+    """Start the Tkinter frontend"""
+    load_gui_libraries()
+    
     # Create Tkinter root window
     root = tk.Tk()
     
@@ -535,7 +1436,229 @@ if __name__ == "__main__":
     # Run the Tkinter event loop to keep application open
     root.mainloop()
 
+def describe_credential(value, uses):
+    """One-line summary of where a credential was issued and used"""
+    if uses is None:
+        return "Not seen in this capture"
+    label = f"{uses.kind} {uses.name}".strip()
+    replays = uses.replays()
+    used = ', '.join(str(index) for index in replays[:10]) or 'none'
+    more = f" (+{len(replays) - 10} more)" if len(replays) > 10 else ''
+    if not uses.issued:
+        return f"{label}: never issued in this capture; used in entries {used}{more}"
+    issued = ', '.join(str(index) for index in uses.issued[:10])
+    return f"{label}: issued in entries {issued}; replayed in entries {used}{more}"
+
+def print_flag_findings(flags_found, secrets_found):
+    """Print flag and secret findings for the `flags` command"""
+    if flags_found:
+        print(f"Found {len(flags_found)} flag(s):")
+        for flag_info in flags_found:
+            seen_in = flags_found.entries_with(flag_info['flag'])
+            print(f"  {flag_info['flag']}")
+            print(f"    entry {flag_info['entry_index']} ({flag_info['context']}): {flag_info['url']}")
+            if len(seen_in) > 1:
+                print(f"    also in entries: {', '.join(str(i) for i in seen_in[1:11])}{' ...' if len(seen_in) > 11 else ''}")
+    else:
+        print("No flags found.")
+    
+    if secrets_found:
+        print(f"Found {len(secrets_found)} other secret(s):")
+        for secret_info in secrets_found:
+            print(f"  [{secret_info['detector']}] {secret_info['flag']}")
+            print(f"    entry {secret_info['entry_index']} ({secret_info['context']}): {secret_info['url']}")
+
+def finding_records(findings, kind):
+    """Turn FlagFindings into JSON-serialisable dicts for --json output"""
+    records = []
+    for finding in findings:
+        record = dict(finding)
+        record['type'] = kind
+        record['entries'] = findings.entries_with(finding['flag'])
+        records.append(record)
+    return records
+
+def credential_record(value, uses):
+    """JSON-serialisable view of one CredentialIndex entry"""
+    return {'value': value, 'kind': uses.kind, 'name': uses.name, 'issued': list(uses.issued),
+            'used': list(uses.used), 'replays': uses.replays()}
+
+def build_parser():
+    """Command line interface; every subcommand works without a display"""
+    parser = argparse.ArgumentParser(
+        description="Analyze HAR files. Run without a command to open the GUI."
+    )
+    commands = parser.add_subparsers(dest='command')
+    
+    analyze = commands.add_parser('analyze', help="Summarize requests with pandas")
+    analyze.add_argument('har_file')
+    analyze.add_argument('--no-cache', action='store_true', help="Re-read the capture instead of using the column cache")
+    
+    flags = commands.add_parser('flags', help="Find CTF flags and other secrets")
+    flags.add_argument('har_file')
+    flags.add_argument('--json', action='store_true', help="Print findings as JSON")
+    
+    tokens = commands.add_parser('tokens', help="List session tokens from JSON responses")
+    tokens.add_argument('har_file')
+    tokens.add_argument('--json', action='store_true', help="Print tokens as JSON")
+    
+    replay = commands.add_parser('replay', help="Replay the captured requests")
+    replay.add_argument('har_file')
+    replay.add_argument('--concurrency', type=int, default=8, help="Max requests in flight (default: 8)")
+    replay.add_argument('--pace', action='store_true', help="Keep the original gaps between requests")
+    replay.add_argument('--speed', type=float, default=1.0, help="Pacing multiplier (default: 1.0)")
+    replay.add_argument('--base-url', help="Send every request to this scheme://host[:port] instead")
+    replay.add_argument('--timeout', type=float, default=5, help="Per-request timeout in seconds (default: 5)")
+    replay.add_argument('--benchmark', action='store_true', help="Compare replayed latencies with the capture")
+    replay.add_argument('--report', help="Write the benchmark report to this JSON file")
+    replay.add_argument('--threshold', type=float, default=1.5,
+                        help="p95 slowdown factor reported as a regression (default: 1.5)")
+    
+    report = commands.add_parser('report', help="Latency percentiles per host, endpoint and method")
+    report.add_argument('har_file')
+    report.add_argument('--by', default='host,path,method',
+                        help="Comma-separated grouping columns from host, path, method (default: host,path,method)")
+    report.add_argument('--top', type=int, default=20, help="Groups printed, slowest first (default: 20)")
+    report.add_argument('-o', '--output', help="Write the full report to a .csv or .json file")
+    report.add_argument('--no-cache', action='store_true', help="Re-read the capture instead of using the column cache")
+    
+    diff = commands.add_parser('diff', help="Compare two captures (new, removed and changed requests)")
+    diff.add_argument('har_file', help="Baseline capture")
+    diff.add_argument('after_file', help="Capture to compare against the baseline")
+    diff.add_argument('--top', type=int, default=20, help="Rows printed per section (default: 20)")
+    diff.add_argument('-o', '--output', help="Write the full diff to a JSON file")
+    
+    credentials = commands.add_parser('credentials', help="Where cookies, tokens and auth headers were issued and used")
+    credentials.add_argument('har_file')
+    credentials.add_argument('--value', help="Trace one credential value")
+    credentials.add_argument('--top', type=int, default=20, help="Credentials listed per section (default: 20)")
+    credentials.add_argument('--json', action='store_true', help="Print the index as JSON")
+    
+    visualize = commands.add_parser('visualize', help="Show the analysis dashboard")
+    visualize.add_argument('har_file')
+    visualize.add_argument('--no-cache', action='store_true', help="Re-read the capture instead of using the column cache")
+    visualize.add_argument('-o', '--output', help="Write a PNG/SVG file instead of opening a window")
+    visualize.add_argument('--bins', type=int, default=SCATTER_BINS,
+                           help=f"Bins per axis of the time/size heatmap (default: {SCATTER_BINS})")
+    
+    return parser
+
+def main(argv=None):
+    """
+    Entry point: no command opens the GUI, otherwise run headless
+    
+    Returns:
+        int: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    
+    if args.command is None:
+        run_gui()
+        return 0
+    
+    if not os.path.isfile(args.har_file):
+        print(f"Error: HAR file not found: {args.har_file}", file=sys.stderr)
+        return 1
+    
+    if args.command == 'diff':
+        if not os.path.isfile(args.after_file):
+            print(f"Error: HAR file not found: {args.after_file}", file=sys.stderr)
+            return 1
+        return 0 if diff_har_files(args.har_file, args.after_file, args.output, args.top) is not None else 1
+    
+    if args.command == 'analyze':
+        return 0 if analyze_har_with_pandas(args.har_file, not args.no_cache) is not None else 1
+    
+    if args.command == 'report':
+        by = tuple(column.strip() for column in args.by.split(',') if column.strip())
+        unknown = set(by) - {'host', 'path', 'method'}
+        if not by or unknown:
+            print(f"Error: --by takes host, path and/or method, not {', '.join(sorted(unknown)) or 'nothing'}",
+                  file=sys.stderr)
+            return 1
+        df = analyze_har_with_pandas(args.har_file, not args.no_cache)
+        if df is None:
+            return 1
+        report = latency_report(df, by)
+        print_latency_report(report, args.top)
+        if args.output:
+            if args.output.endswith('.json'):
+                report.to_json(args.output, orient='records', indent=2)
+            else:
+                report.to_csv(args.output, index=False)
+            print(f"Report written to {args.output}")
+        return 0
+    
+    if args.command == 'visualize':
+        if args.output:
+            return 0 if visualize_har_data(args.har_file, not args.no_cache, args.output, args.bins) else 1
+        visualize_har_data(args.har_file, not args.no_cache, bins=args.bins)
+        return 0
+    
+    if args.command == 'replay':
+        options = dict(concurrency=args.concurrency, pace=args.pace, speed=args.speed,
+                       base_url=args.base_url, timeout=args.timeout)
+        if args.benchmark or args.report:
+            report = benchmark_replay(args.har_file, args.report, args.threshold, **options)
+            return 0 if report is not None else 1
+        return 0 if replay_requests_from_har(args.har_file, **options) is not None else 1
+    
+    try:
+        analysis = analyze_har_file(args.har_file)
+    except (KeyError, ValueError) as e:
+        print(f"Error: Invalid HAR file: {e}", file=sys.stderr)
+        return 1
+    
+    if args.command == 'flags':
+        flags_found, secrets_found = analysis.flags_found, analysis.secrets_found
+        if args.json:
+            print(json.dumps(finding_records(flags_found, 'flag') + finding_records(secrets_found, 'secret'), indent=2))
+        else:
+            print_flag_findings(flags_found, secrets_found)
+        return 0
+    
+    if args.command == 'credentials':
+        credential_index = analysis.credential_index
+        if args.value:
+            uses = credential_index.lookup(args.value)
+            if args.json:
+                print(json.dumps(credential_record(args.value, uses) if uses else None, indent=2))
+            else:
+                print(describe_credential(args.value, uses))
+            return 0 if uses else 1
+        if args.json:
+            print(json.dumps([credential_record(value, uses) for value, uses in credential_index], indent=2))
+            return 0
+        replayed = credential_index.replayed()
+        never_issued = credential_index.never_issued()
+        print(f"Indexed {len(credential_index)} credential value(s); "
+              f"{len(replayed)} replayed after being issued, {len(never_issued)} used but never issued")
+        for title, items in (("Replayed", replayed), ("Used but never issued", never_issued)):
+            if items:
+                print(f"{title}:")
+            for value, uses in sorted(items, key=lambda item: len(item[1].used), reverse=True)[:args.top]:
+                print(f"  {value}")
+                print(f"    {describe_credential(value, uses)}")
+        return 0
+    
+    # tokens
+    session_tokens = analysis.session_tokens
+    if args.json:
+        print(json.dumps([{key: token[key] for key in ('entry_index', 'url', 'session_token')}
+                          for token in session_tokens], indent=2))
+    else:
+        print(f"Found {len(session_tokens)} session token(s):")
+        for token in session_tokens:
+            print(f"  entry {token['entry_index']}: {token['session_token']}")
+            print(f"    {token['url']}")
+    return 0
+
+# Main execution
+if __name__ == "__main__":
+    sys.exit(main())
+
 # Example usage of additional functions:
+# python PythonPoweredHARAnalysis.py flags example.har --json
 # df = analyze_har_with_pandas('example.har')
 # replay_requests_from_har('example.har')
 # visualize_har_data('example.har')
@@ -7,107 +7,210 @@ This script analyzes the captured web traffic HAR file to find
 the session token containing the hidden flag.
 """
 
+import argparse
+import glob
 import json
-import re
+import os
 import sys
+import time
+from multiprocessing import Pool
 
-def analyze_har_for_flags(har_file_path):
+from har_findings import FlagFindings
+from har_stream import iter_har_entries, HARFollower
+from har_scanner import SecretScanner, FLAG_DETECTORS, RESPONSE_BODY, decoded_body
+
+# Default capture for the single-file CTF run
+DEFAULT_HAR_FILE = "CTF-W8_large_captured_web_traffic.har"
+
+# Context of flags found inside a session token (highlighted by main())
+SESSION_TOKEN_CONTEXT = 'Found in session token'
+
+# Scanner used by batch worker processes (set up by init_batch_worker)
+batch_scanner = None
+
+def build_scanner(secrets=False, extra_detectors=None):
     """
-    Analyze HAR file to extract session tokens and find the flag
+    Scanner for the extractor: the flag detector only, unless `secrets` asks
+    for the API key/JWT/token detectors too (they roughly double scan time)
+    """
+    return SecretScanner(None if secrets else FLAG_DETECTORS, extra_detectors)
+
+def scan_entry(i, entry, flags_found, session_tokens, secrets_found, scanner, log):
+    """
+    Collect the flags, session token and other secrets of one HAR entry
+    
+    Args:
+        i (int): Position of the entry in the capture
+        entry (dict): One HAR entry
+        flags_found, secrets_found (FlagFindings): Updated in place
+        session_tokens (list): Session tokens are appended here
+        scanner (SecretScanner): Detectors to use
+        log (callable): Called with a message for each token/flag found
+    """
+    url = entry.get('request', {}).get('url', 'Unknown')
+    
+    # Get response data (base64/compressed bodies decoded once, binary assets skipped)
+    response_text = decoded_body(entry)
+    body_context = 'Found in plain text response'
+        
+    # Try to parse JSON responses
+    if response_text and response_text.strip().startswith('{'):
+        try:
+            json_data = json.loads(response_text)
+        except json.JSONDecodeError:
+            json_data = None
+        
+        if isinstance(json_data, dict):
+            body_context = 'Found in JSON response'
+            
+            # Look for session tokens
+            session_token = json_data.get('session_token')
+            if session_token:
+                session_tokens.append({
+                    'entry_index': i,
+                    'url': url,
+                    'session_token': session_token
+                })
+                log(f"🎯 Found session token in entry {i}: {session_token}")
+                
+                # Check if session token contains flag
+                if isinstance(session_token, str) and 'FLAG{' in session_token:
+                    if flags_found.add(i, url, session_token, SESSION_TOKEN_CONTEXT):
+                        log(f"🚩 FLAG FOUND in entry {i}: {session_token}")
+    
+    # Every detector over URL, headers, cookies and bodies
+    for detector, value, location in scanner.scan_entry(entry):
+        if detector == 'flag':
+            context = body_context if location == RESPONSE_BODY else f"Found in {location}"
+            if flags_found.add(i, url, value, context):
+                log(f"🚩 FLAG FOUND in entry {i}: {value}")
+        else:
+            if secrets_found.add(i, url, value, f"{detector} in {location}", detector=detector):
+                log(f"🔐 {detector} in entry {i} ({location}): {value}")
+
+def scan_har_file(har_file_path, verbose=True, scanner=None):
+    """
+    Stream a HAR file and collect flags, session tokens and other secrets
     
     Args:
         har_file_path (str): Path to the HAR file
+        verbose (bool): Print each token/flag as it is found
+        scanner (SecretScanner): Detectors to use (default: flags only)
         
     Returns:
-        list: Found flags and session tokens
+        tuple: (FlagFindings of unique flags, list of session tokens,
+                FlagFindings of other secrets, number of entries)
+        
+    Raises:
+        KeyError, json.JSONDecodeError, OSError: If the file can't be read as a HAR file
     """
-    flags_found = []
+    scanner = scanner or build_scanner()
+    flags_found = FlagFindings()
+    secrets_found = FlagFindings()
     session_tokens = []
+    log = print if verbose else (lambda *args: None)
     
-    try:
-        # Load HAR file
-        print(f"📁 Loading HAR file: {har_file_path}")
-        with open(har_file_path, 'r', encoding='utf-8') as file:
-            har_data = json.load(file)
+    # Stream entries instead of json.load so large captures stay in bounded memory
+    count = 0
+    for i, entry in enumerate(iter_har_entries(har_file_path)):
+        count += 1
+        try:
+            scan_entry(i, entry, flags_found, session_tokens, secrets_found, scanner, log)
+        except Exception as e:
+            # Skip problematic entries
+            continue
             
-        # Extract entries
-        entries = har_data['log']['entries']
-        print(f"🔍 Analyzing {len(entries)} network requests...")
+    return flags_found, session_tokens, secrets_found, count
+
+def follow_har_file(har_file_path, interval=1.0, jsonl=None, offset=0, scanner=None):
+    """
+    Watch a capture that is still being written and report findings as they appear
+    
+    Only entries appended since the last check are parsed (see HARFollower),
+    so a long-running proxy capture is never re-read from the start. Runs
+    until interrupted with Ctrl+C.
+    
+    Args:
+        har_file_path (str): HAR or JSON-lines file to follow
+        interval (float): Seconds between checks for new data
+        jsonl (bool): Force JSON-lines/HAR parsing (None = detect)
+        offset (int): Byte offset to resume from (printed when stopping)
+        scanner (SecretScanner): Detectors to use (default: flags only)
         
-        # Analyze each entry
-        for i, entry in enumerate(entries):
-            try:
-                # Get response data
-                response = entry.get('response', {})
-                content = response.get('content', {})
-                response_text = content.get('text', '')
-                
-                # Skip empty responses
-                if not response_text:
-                    continue
-                    
-                # Try to parse JSON responses
+    Returns:
+        tuple: (FlagFindings of unique flags, list of session tokens,
+                FlagFindings of other secrets, number of entries)
+    """
+    scanner = scanner or build_scanner()
+    flags_found = FlagFindings()
+    secrets_found = FlagFindings()
+    session_tokens = []
+    follower = HARFollower(har_file_path, jsonl=jsonl, offset=offset)
+    
+    print(f"👀 Following {har_file_path} (Ctrl+C to stop)")
+    try:
+        while True:
+            entries = follower.poll()
+            first_index = follower.entry_count - len(entries)
+            for i, entry in enumerate(entries, first_index):
                 try:
-                    if response_text.strip().startswith('{'):
-                        json_data = json.loads(response_text)
-                        
-                        # Look for session tokens
-                        session_token = json_data.get('session_token')
-                        if session_token:
-                            session_tokens.append({
-                                'entry_index': i,
-                                'url': entry.get('request', {}).get('url', 'Unknown'),
-                                'session_token': session_token,
-                                'full_response': json_data
-                            })
-                            print(f"🎯 Found session token in entry {i}: {session_token}")
-                            
-                            # Check if session token contains flag
-                            if 'FLAG{' in session_token:
-                                flags_found.append({
-                                    'entry_index': i,
-                                    'url': entry.get('request', {}).get('url', 'Unknown'),
-                                    'flag': session_token,
-                                    'full_response': json_data
-                                })
-                                print(f"🚩 FLAG FOUND in entry {i}: {session_token}")
-                        
-                        # Also search for any FLAG pattern in the entire response
-                        response_str = str(json_data)
-                        flag_matches = re.findall(r'FLAG\{[^}]+\}', response_str)
-                        for flag in flag_matches:
-                            if flag not in [f['flag'] for f in flags_found]:
-                                flags_found.append({
-                                    'entry_index': i,
-                                    'url': entry.get('request', {}).get('url', 'Unknown'),
-                                    'flag': flag,
-                                    'context': 'Found in JSON response'
-                                })
-                                print(f"🚩 FLAG FOUND in entry {i}: {flag}")
-                                
-                except json.JSONDecodeError:
-                    # Not JSON, search for flags in plain text
-                    flag_matches = re.findall(r'FLAG\{[^}]+\}', response_text)
-                    for flag in flag_matches:
-                        flags_found.append({
-                            'entry_index': i,
-                            'url': entry.get('request', {}).get('url', 'Unknown'),
-                            'flag': flag,
-                            'context': 'Found in plain text response'
-                        })
-                        print(f"🚩 FLAG FOUND in entry {i}: {flag}")
-                        
-            except Exception as e:
-                # Skip problematic entries
-                continue
-                
-        return flags_found, session_tokens
+                    scan_entry(i, entry, flags_found, session_tokens, secrets_found, scanner, print)
+                except Exception:
+                    # Skip problematic entries
+                    continue
+            if not entries:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print(f"\n⏹️ Stopped after {follower.entry_count} entries (resume with --offset {follower.offset})")
+    
+    return flags_found, session_tokens, secrets_found, follower.entry_count
+
+def analyze_har(har_file_path, scanner):
+    """
+    Scan a HAR file with the given detectors, reporting progress and errors
+    
+    Returns:
+        tuple: (FlagFindings of unique flags, list of session tokens,
+                FlagFindings of other secrets) - empty if the file can't be read
+    """
+    try:
+        print(f"📁 Loading HAR file: {har_file_path}")
+        print("🔍 Analyzing network requests...")
+        flags_found, session_tokens, secrets_found, count = scan_har_file(har_file_path, scanner=scanner)
+        print(f"✅ Analyzed {count} network requests")
+        return flags_found, session_tokens, secrets_found
         
     except Exception as e:
         print(f"❌ Error analyzing HAR file: {str(e)}")
-        return [], []
+        return FlagFindings(), [], FlagFindings()
+
+def analyze_har_for_flags(har_file_path):
+    """
+    Analyze HAR file to extract session tokens and find the flag
+    
+    Args:
+        har_file_path (str): Path to the HAR file
+        
+    Returns:
+        tuple: (FlagFindings of unique flags, list of session tokens)
+    """
+    flags_found, session_tokens, _ = analyze_har(har_file_path, build_scanner())
+    return flags_found, session_tokens
+
+def analyze_har_for_secrets(har_file_path):
+    """
+    Like analyze_har_for_flags(), but also look for API keys, JWTs and other secrets
+    
+    Args:
+        har_file_path (str): Path to the HAR file
+        
+    Returns:
+        tuple: (FlagFindings of unique flags, list of session tokens,
+                FlagFindings of other secrets)
+    """
+    return analyze_har(har_file_path, build_scanner(secrets=True))
 
-def display_results(flags_found, session_tokens):
+def display_results(flags_found, session_tokens, secrets_found=None):
     """Display the analysis results"""
     
     print("\n" + "="*60)
@@ -123,6 +226,11 @@ def display_results(flags_found, session_tokens):
             print(f"   Entry Index: {flag_info['entry_index']}")
             if 'context' in flag_info:
                 print(f"   Context: {flag_info['context']}")
+            
+            # Other entries carrying the same flag (index lookup, no rescan)
+            seen_in = flags_found.entries_with(flag_info['flag']) if isinstance(flags_found, FlagFindings) else []
+            if len(seen_in) > 1:
+                print(f"   Also in entries: {', '.join(str(i) for i in seen_in[1:11])}{' ...' if len(seen_in) > 11 else ''}")
     else:
         print("\n❌ No flags found in the HAR file!")
     
@@ -136,17 +244,218 @@ def display_results(flags_found, session_tokens):
     else:
         print("\n❌ No session tokens found!")
     
+    if secrets_found:
+        print(f"\n🔐 OTHER SECRETS FOUND ({len(secrets_found)} unique):")
+        print("-" * 40)
+        for i, secret_info in enumerate(secrets_found, 1):
+            print(f"\n{i}. [{secret_info['detector']}] {secret_info['flag']}")
+            print(f"   URL: {secret_info['url']}")
+            print(f"   Entry Index: {secret_info['entry_index']} ({secret_info['context']})")
+            print(f"   Seen in {len(secrets_found.entries_with(secret_info['flag']))} entries")
+    
     print("\n" + "="*60)
 
-def main():
+def expand_har_paths(paths, pattern='*.har'):
+    """
+    Turn a mix of files, directories and glob patterns into a list of HAR files
+    
+    Args:
+        paths (list): Files, directories (searched recursively) or glob patterns
+        pattern (str): File name pattern used inside directories
+        
+    Returns:
+        list: Unique file paths, largest first so big files start early
+    """
+    found = {}
+    for path in paths:
+        if os.path.isdir(path):
+            matches = glob.glob(os.path.join(path, '**', pattern), recursive=True)
+        elif glob.has_magic(path):
+            matches = glob.glob(path, recursive=True)
+        else:
+            matches = [path]
+        for match in matches:
+            if os.path.isfile(match):
+                found.setdefault(os.path.abspath(match), match)
+    
+    return sorted(found.values(), key=lambda p: os.path.getsize(p), reverse=True)
+
+def init_batch_worker(extra_detectors, secrets=False):
+    """Process-pool initializer: compile the detector regexes once per worker"""
+    global batch_scanner
+    batch_scanner = build_scanner(secrets, extra_detectors)
+
+def scan_har_file_summary(har_file_path):
+    """
+    Process-pool worker: scan one file and return a JSON-friendly summary
+    
+    Args:
+        har_file_path (str): Path to the HAR file
+        
+    Returns:
+        dict: File name, entry/token counts, flags, secrets, timing and any error
+    """
+    start = time.perf_counter()
+    result = {'file': har_file_path, 'entries': 0, 'session_tokens': 0, 'flags': [], 'secrets': [], 'error': None}
+    try:
+        flags_found, session_tokens, secrets_found, count = scan_har_file(
+            har_file_path, verbose=False, scanner=batch_scanner
+        )
+        result['entries'] = count
+        result['session_tokens'] = len(session_tokens)
+        result['flags'] = [
+            {key: finding[key] for key in ('entry_index', 'url', 'flag', 'context')}
+            for finding in flags_found
+        ]
+        result['secrets'] = [
+            {'entry_index': finding['entry_index'], 'url': finding['url'], 'detector': finding['detector'],
+             'value': finding['flag'], 'context': finding['context'],
+             'entries': len(secrets_found.entries_with(finding['flag']))}
+            for finding in secrets_found
+        ]
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+def batch_main(argv):
+    """
+    Scan many HAR files in parallel and stream the merged findings as JSON lines
+    
+    Every flag is written as {"type": "flag", ...}, every other secret as
+    {"type": "secret", ...} and every file as {"type": "file", ...} with its
+    timing, as soon as that file finishes.
+    A throughput summary is printed to stderr at the end.
+    """
+    parser = argparse.ArgumentParser(
+        prog="ctf_har_flag_extractor.py batch",
+        description="Scan HAR files in parallel for flags and session tokens"
+    )
+    parser.add_argument("paths", nargs="+", help="HAR files, directories or glob patterns")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("-o", "--output", help="write JSON lines here instead of stdout")
+    parser.add_argument("--pattern", default="*.har", help="file pattern inside directories (default: *.har)")
+    parser.add_argument("--detector", action="append", default=[], metavar="NAME=REGEX",
+                        help="extra secret pattern to scan for (repeatable)")
+    parser.add_argument("--secrets", action="store_true",
+                        help="also scan for API keys, JWTs and other secrets (slower)")
+    args = parser.parse_args(argv)
+    
+    # Custom detectors run alongside the built-in ones
+    extra_detectors = {}
+    for spec in args.detector:
+        name, sep, pattern = spec.partition('=')
+        if not sep or not name:
+            parser.error(f"--detector expects NAME=REGEX, got {spec!r}")
+        extra_detectors[name] = pattern
+    try:
+        build_scanner(args.secrets, extra_detectors)
+    except Exception as e:
+        parser.error(f"invalid --detector pattern: {e}")
+    
+    files = expand_har_paths(args.paths, args.pattern)
+    if not files:
+        print("❌ No HAR files found", file=sys.stderr)
+        return 1
+    
+    workers = max(1, min(args.workers, len(files)))
+    print(f"🚀 Scanning {len(files)} HAR file(s) with {workers} worker(s)...", file=sys.stderr)
+    
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    total_entries = 0
+    total_flags = 0
+    failed = 0
+    unique_flags = set()
+    start = time.perf_counter()
+    
+    try:
+        with Pool(workers, initializer=init_batch_worker, initargs=(extra_detectors, args.secrets)) as pool:
+            # Results are written in completion order so output streams as files finish
+            for result in pool.imap_unordered(scan_har_file_summary, files):
+                for finding in result['flags']:
+                    output.write(json.dumps(dict(type='flag', file=result['file'], **finding)) + "\n")
+                    unique_flags.add(finding['flag'])
+                for finding in result['secrets']:
+                    output.write(json.dumps(dict(type='secret', file=result['file'], **finding)) + "\n")
+                
+                output.write(json.dumps({
+                    'type': 'file',
+                    'file': result['file'],
+                    'entries': result['entries'],
+                    'session_tokens': result['session_tokens'],
+                    'flags': len(result['flags']),
+                    'secrets': len(result['secrets']),
+                    'seconds': result['seconds'],
+                    'error': result['error']
+                }) + "\n")
+                output.flush()
+                
+                total_entries += result['entries']
+                total_flags += len(result['flags'])
+                if result['error']:
+                    failed += 1
+                    print(f"❌ {result['file']}: {result['error']}", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    elapsed = time.perf_counter() - start
+    rate = lambda n: n / elapsed if elapsed > 0 else 0.0
+    print("-" * 60, file=sys.stderr)
+    print(f"📊 Files: {len(files)} ({failed} failed)   Entries: {total_entries}   "
+          f"Flags: {total_flags} ({len(unique_flags)} unique)", file=sys.stderr)
+    print(f"⏱️ {elapsed:.2f}s   {rate(len(files)):.2f} files/s   {rate(total_entries):.0f} entries/s",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+def follow_main(argv):
+    """Follow a growing HAR or JSON-lines capture and print findings live"""
+    parser = argparse.ArgumentParser(
+        prog="ctf_har_flag_extractor.py follow",
+        description="Watch a capture that is still being written for flags and session tokens"
+    )
+    parser.add_argument("path", help="HAR or JSON-lines (one entry per line) file")
+    parser.add_argument("-i", "--interval", type=float, default=1.0,
+                        help="seconds between checks for new data (default: 1)")
+    parser.add_argument("--offset", type=int, default=0, help="byte offset to resume from")
+    file_format = parser.add_mutually_exclusive_group()
+    file_format.add_argument("--jsonl", action="store_const", const=True, dest="jsonl",
+                             help="parse as JSON lines (default: detect)")
+    file_format.add_argument("--har", action="store_const", const=False, dest="jsonl",
+                             help="parse as a HAR document (default: detect)")
+    parser.add_argument("--secrets", action="store_true",
+                        help="also scan for API keys, JWTs and other secrets (slower)")
+    args = parser.parse_args(argv)
+    
+    flags_found, session_tokens, secrets_found, count = follow_har_file(
+        args.path, args.interval, args.jsonl, args.offset, build_scanner(args.secrets)
+    )
+    display_results(flags_found, session_tokens, secrets_found)
+    return 0
+
+def main(argv=None):
     """Main function to run the CTF flag extractor"""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # `batch` scans many captures in parallel
+    if argv and argv[0] == 'batch':
+        return batch_main(argv[1:])
+    
+    # `follow` watches a capture that is still being written
+    if argv and argv[0] == 'follow':
+        return follow_main(argv[1:])
     
     print("🚀 CTF Week 8: Web Traffic Inspector - Flag Extractor")
     print("🎯 Mission: Find the hidden flag in session token")
     print("-" * 60)
     
-    # Path to the HAR file
-    har_file_path = "CTF-W8_large_captured_web_traffic.har"
+    # --secrets adds the API key/JWT/token detectors to the flag search
+    secrets = '--secrets' in argv
+    argv = [arg for arg in argv if arg != '--secrets']
+    
+    # Path to the HAR file (optional first argument)
+    har_file_path = argv[0] if argv else DEFAULT_HAR_FILE
     
     # Check if file exists
     try:
@@ -158,10 +467,14 @@ def main():
         return
     
     # Analyze the HAR file
-    flags_found, session_tokens = analyze_har_for_flags(har_file_path)
+    secrets_found = None
+    if secrets:
+        flags_found, session_tokens, secrets_found = analyze_har_for_secrets(har_file_path)
+    else:
+        flags_found, session_tokens = analyze_har_for_flags(har_file_path)
     
     # Display results
-    display_results(flags_found, session_tokens)
+    display_results(flags_found, session_tokens, secrets_found)
     
     # Provide submission guidance
     if flags_found:
@@ -170,11 +483,11 @@ def main():
         
         # If there's a session token with flag, highlight it
         for flag_info in flags_found:
-            if 'session_token' in str(flag_info):
+            if flag_info.get('context') == SESSION_TOKEN_CONTEXT:
                 print(f"\n🔑 Session Token Flag: {flag_info['flag']}")
     else:
         print("🔍 No flags found. The file might need manual inspection.")
         print("💡 Try checking the session tokens manually or look for encoded data.")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
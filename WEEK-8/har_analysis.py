@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+HAR Analysis - The headless analysis shared by the GUI, CLI and other tools
+
+Everything here works on a HAR file or entry without Tk: the per-entry scan
+behind the flag, token and credential views (folded into a CaptureAnalysis),
+the typed column extraction behind the pandas summary, and the URL templates
+that group requests by endpoint. PythonPoweredHARAnalysis builds its GUI and
+CLI on top of these; har_replay and har_benchmark import them from here so
+they don't pull in the GUI module.
+"""
+
+import json
+import re
+from array import array
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from har_cache import HARCache
+from har_credentials import CredentialIndex, entry_credentials
+from har_findings import FlagFindings
+from har_scanner import SecretScanner, RESPONSE_BODY, decoded_body
+from har_stream import iter_har_entries
+
+# Detectors for flags, JWTs, bearer tokens, API keys, ... (literal prefilters first)
+SCANNER = SecretScanner()
+
+
+def analyze_entry(index, entry):
+    """
+    Decode one entry's response body once, scan the whole entry once, and keep
+    only what the analysis tabs need
+
+    Args:
+        index (int): Position of the entry in log.entries
+        entry (dict): One HAR entry
+
+    Returns:
+        dict: Compact record (URL, session token, flag and secret hits and
+              credential values), or None if the entry has nothing of interest. Parsed bodies are not kept;
+              the entry can be re-read from the file when needed.
+    """
+    # Response body, with base64/compression undone (shared with the scanner below)
+    response_text = decoded_body(entry)
+
+    json_data = None
+    session_token = None
+    flags = []                                   # (flag, context) pairs in discovery order
+    secrets = []                                 # (detector, value, location) for non-flag hits
+
+    # Try to parse JSON responses - this is the only json.loads per entry
+    if response_text and response_text.strip().startswith('{'):
+        try:
+            json_data = json.loads(response_text)
+        except json.JSONDecodeError:
+            json_data = None
+
+    # Cookies, auth headers and token fields at any depth, for the credential index
+    credentials = entry_credentials(entry, json_data)
+
+    if isinstance(json_data, dict):
+        # Look for session tokens (and flags hidden inside them)
+        session_token = json_data.get('session_token')
+        if isinstance(session_token, str) and 'FLAG{' in session_token:
+            flags.append((session_token, 'Session Token'))
+        body_context = 'JSON Response'
+    else:
+        json_data = None
+        body_context = 'Plain Text Response'
+
+    # Every detector over URL, headers, cookies, request body and response body
+    for detector, value, location in SCANNER.scan_entry(entry):
+        if detector == 'flag':
+            context = body_context if location == RESPONSE_BODY else location[:1].upper() + location[1:]
+            flags.append((value, context))
+        else:
+            secrets.append((detector, value, location))
+
+    if not session_token and not flags and not secrets and not credentials:
+        return None
+
+    return {
+        'entry_index': index,
+        'url': entry.get('request', {}).get('url', 'Unknown'),
+        'session_token': session_token,
+        'flags': flags,
+        'secrets': secrets,
+        'credentials': credentials
+    }
+
+
+class CaptureAnalysis:
+    """
+    Flags, secrets, session tokens and credential index of one capture
+
+    analyze_entry() records are folded in as entries are read and then
+    dropped, so a loaded capture costs its deduplicated findings and index,
+    not one record per entry.
+    """
+
+    def __init__(self):
+        self.flags_found = FlagFindings()
+        self.secrets_found = FlagFindings()        # JWTs, bearer tokens, API keys, ...
+        self.session_tokens = []
+        self.credential_index = CredentialIndex()  # Credential value -> entries that issued/used it
+
+    def add(self, record):
+        """
+        Fold one analyze_entry() record into the findings, tokens and index
+
+        Returns:
+            int: Number of new unique flags and secrets
+        """
+        index, url = record['entry_index'], record['url']
+        new = 0
+        for flag, context in record['flags']:
+            new += self.flags_found.add(index, url, flag, context)
+
+        # Other credential-like values found by the scanner, deduplicated the same way
+        for detector, value, location in record['secrets']:
+            new += self.secrets_found.add(index, url, value, f"{detector} in {location}", detector=detector)
+
+        self.credential_index.add(index, record['credentials'])
+        if record['session_token']:
+            self.session_tokens.append({'entry_index': index, 'url': url, 'session_token': record['session_token']})
+        return new
+
+
+def analyze_har_file(har_file_path):
+    """Stream a HAR file into a CaptureAnalysis (headless load)"""
+    analysis = CaptureAnalysis()
+    for index, entry in enumerate(iter_har_entries(har_file_path)):
+        record = analyze_entry(index, entry)
+        if record:
+            analysis.add(record)
+    return analysis
+
+
+# Timing phases from entry['timings'] that get their own DataFrame column
+HAR_TIMING_PHASES = ('dns', 'connect', 'ssl', 'wait', 'receive')
+
+# Value ranges of the typed status ('i') and size ('q') columns
+STATUS_RANGE = (-2 ** 31, 2 ** 31)
+SIZE_RANGE = (0, 2 ** 63)
+
+
+def to_number(value, default):
+    """Return value as a float, or default if it is missing/not a number"""
+    if isinstance(value, bool) or value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def to_int(value, default, limits):
+    """Return value as an int in [low, high), or default if it is not a finite number in range"""
+    number = to_number(value, default)
+    low, high = limits
+    if not low <= number < high:                 # Also false for NaN and infinity
+        return default
+    return int(number)
+
+
+def extract_entry(entry, with_phases=True):
+    """
+    Pull the analysis fields out of one HAR entry
+
+    Args:
+        entry (dict): One HAR entry
+        with_phases (bool): Also convert the timing phases (skipped when only
+                            the totals are needed)
+
+    Returns:
+        tuple: (url, method, host, status, time, size, phases) with NaN for
+               missing/not-applicable timings and 0 for unknown sizes. Every
+               value fits its extract_har_columns() column, so a row is
+               appended either completely or not at all.
+    """
+    nan = float('nan')
+    request = entry.get('request', {})
+    response = entry.get('response', {})
+    timings = entry.get('timings') or {}
+
+    url = request.get('url', 'Unknown')
+    if not isinstance(url, str):
+        url = str(url)
+    host = urlsplit(url).hostname or ''
+    method = request.get('method', 'Unknown')
+    if not isinstance(method, str):
+        method = str(method)
+    status = to_int(response.get('status', 0), 0, STATUS_RANGE)
+    response_time = to_number(entry.get('time', 0), nan)
+    size = to_int(response.get('bodySize', 0), 0, SIZE_RANGE)
+    phases = []
+    if with_phases:
+        phases = [to_number(timings.get(phase), nan) for phase in HAR_TIMING_PHASES]
+        phases = [value if value >= 0 else nan for value in phases]
+    return url, method, host, status, response_time, size, phases
+
+
+def extract_har_columns(har_file_path):
+    """
+    Stream a HAR file into typed column buffers (one per DataFrame column)
+
+    Args:
+        har_file_path (str): Path to the HAR file
+
+    Returns:
+        dict: Column name -> list (url, method, host) or array (numeric columns).
+              Missing times/phases are NaN, HAR's -1 "not applicable" phase
+              values are NaN, and missing/unknown sizes are 0.
+    """
+    columns = {
+        'url': [],
+        'method': [],
+        'host': [],
+        'status': array('i'),
+        'time': array('d'),
+        'size': array('q'),
+    }
+    for phase in HAR_TIMING_PHASES:
+        columns[phase] = array('d')
+
+    for entry in iter_har_entries(har_file_path):
+        try:
+            url, method, host, status, response_time, size, phases = extract_entry(entry)
+        except Exception as e:
+            print(f"Warning: Skipping entry due to error: {e}")
+            continue
+
+        columns['url'].append(url)
+        columns['method'].append(method)
+        columns['host'].append(host)
+        columns['status'].append(status)
+        columns['time'].append(response_time)
+        columns['size'].append(size)
+        for phase, value in zip(HAR_TIMING_PHASES, phases):
+            columns[phase].append(value)
+
+    return columns
+
+
+def har_columns_to_dataframe(columns):
+    """
+    Build the analysis DataFrame from extract_har_columns() output
+
+    Repeated strings become categoricals and numbers use fixed-width dtypes,
+    so a million-row capture costs tens of MB instead of hundreds.
+    """
+    import numpy as np                     # Typed column buffers for pandas
+    import pandas as pd                    # Data manipulation and analysis
+
+    data = {
+        'url': columns['url'],
+        'method': pd.Categorical(columns['method']),
+        'host': pd.Categorical(columns['host']),
+        'status': pd.Categorical(np.frombuffer(columns['status'], dtype=np.int32)),
+        'time': np.frombuffer(columns['time'], dtype=np.float64).astype(np.float32),
+        'size': np.frombuffer(columns['size'], dtype=np.int64).copy(),
+    }
+    for phase in HAR_TIMING_PHASES:
+        data[phase] = np.frombuffer(columns[phase], dtype=np.float64).astype(np.float32)
+
+    return pd.DataFrame(data)
+
+
+def load_har_columns(har_file_path, use_cache=True):
+    """
+    Return extract_har_columns() output, reusing the on-disk cache when the
+    capture has not changed since it was last analysed
+    """
+    if not use_cache:
+        return extract_har_columns(har_file_path)
+    return HARCache().get_or_build(har_file_path, extract_har_columns, 'columns')
+
+
+def analyze_har_with_pandas(har_file_path, use_cache=True):
+    """Analyze HAR file using pandas for data manipulation"""
+    try:
+        # Typed columns straight from the cache, or streamed from the file on a miss
+        df = har_columns_to_dataframe(load_har_columns(har_file_path, use_cache))
+
+        # Basic analysis
+        print("HAR File Analysis Summary:")
+        print(f"Total requests: {len(df)}")
+        print(f"Average response time: {df['time'].mean():.2f}ms")
+        print(f"Status code distribution:\n{df['status'].value_counts()}")
+
+        return df
+
+    except Exception as e:
+        print(f"Error analyzing HAR file: {str(e)}")
+        return None
+
+
+# Path segments that identify one resource rather than an endpoint
+ID_SEGMENT_PATTERNS = (
+    (re.compile(r'^\d+$'), '{id}'),
+    (re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'), '{uuid}'),
+    (re.compile(r'^[0-9a-fA-F]{16,}$'), '{hex}'),
+    (re.compile(r'^(?=[^/]*\d)[A-Za-z0-9_\-]{24,}$'), '{token}'),
+)
+
+
+@lru_cache(maxsize=1 << 16)
+def url_template(url):
+    """
+    Return the URL's path with IDs replaced by placeholders
+
+    '/users/42/orders/9f1c...' -> '/users/{id}/orders/{hex}'; the query string
+    is dropped so every request to the same endpoint lands in one group.
+    """
+    path = urlsplit(url).path if isinstance(url, str) else ''
+    segments = path.split('/')
+    for i, segment in enumerate(segments):
+        for pattern, placeholder in ID_SEGMENT_PATTERNS:
+            if pattern.match(segment):
+                segments[i] = placeholder
+                break
+    return '/'.join(segments) or '/'
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+HAR Analyzer Benchmarks - Throughput and memory of the WEEK-8 analyzers
+
+Generates (or reuses) a synthetic capture with har_generator and times each
+analyzer on it:
+
+    analyze_har_for_flags   - ctf_har_flag_extractor streaming scan
+    search_flags            - GUI load: flag/secret findings
+    extract_session_tokens  - GUI load: session token list
+    analyze_har_with_pandas - column extraction + DataFrame (cache disabled)
+
+Every analyzer runs in a fresh process so its peak RSS is its own and not
+left over from the one before. Results can be saved as a baseline; later
+runs fail (exit code 1) when an analyzer's throughput drops more than the
+threshold below the baseline for the same dataset.
+
+Usage:
+    python har_benchmark.py -n 100000 --save-baseline
+    python har_benchmark.py -n 100000 --threshold 0.15
+    python har_benchmark.py --har capture.har --only search_flags
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from har_generator import generate_har, parse_encodings
+from har_stream import iter_har_entries
+
+# Analyzers in the order they are run
+ANALYZERS = ('analyze_har_for_flags', 'search_flags', 'extract_session_tokens', 'analyze_har_with_pandas')
+
+# Default baseline file, next to this script
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'har_benchmark_baseline.json')
+
+# Allowed throughput drop before a run counts as a regression (0.2 = 20%)
+DEFAULT_THRESHOLD = 0.2
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes (None if unavailable)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)     # Windows keeps the peak working set
+    except ImportError:
+        return None
+
+
+def run_analyzer(name, har_file_path):
+    """Run one analyzer on a file the way its frontend does"""
+    if name == 'analyze_har_for_flags':
+        from ctf_har_flag_extractor import scan_har_file
+        scan_har_file(har_file_path, verbose=False)
+        return
+
+    from har_analysis import analyze_har_file, analyze_har_with_pandas
+    if name in ('search_flags', 'extract_session_tokens'):
+        # Both read what the GUI load folds into a CaptureAnalysis
+        analyze_har_file(har_file_path)
+        return
+    if name == 'analyze_har_with_pandas':
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = analyze_har_with_pandas(har_file_path, use_cache=False)
+        if df is None:
+            raise RuntimeError("pandas analysis failed (is pandas installed?)")
+        return
+    raise ValueError(f"unknown analyzer {name!r}")
+
+
+def benchmark_worker(name, har_file_path, entries, repeat):
+    """
+    Process-pool worker: time one analyzer in a fresh interpreter
+
+    Args:
+        name (str): One of ANALYZERS
+        har_file_path (str): Capture to analyze
+        entries (int): Entries in the capture, for the throughput figure
+        repeat (int): Number of runs; the fastest is reported
+
+    Returns:
+        dict: analyzer, entries, seconds (best of `repeat`), entries_per_s,
+              peak_rss_mb, or error if the analyzer could not run
+    """
+    best = None
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run_analyzer(name, har_file_path)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    except Exception as e:
+        return {'analyzer': name, 'error': str(e)}
+
+    peak = peak_rss_bytes()
+    return {
+        'analyzer': name,
+        'entries': entries,
+        'seconds': round(best, 4),
+        'entries_per_s': round(entries / best, 1) if best else None,
+        'peak_rss_mb': round(peak / (1024 * 1024), 1) if peak is not None else None,
+    }
+
+
+def run_benchmarks(har_file_path, entries, analyzers=ANALYZERS, repeat=1):
+    """Benchmark each analyzer in its own spawned process"""
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for name in analyzers:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(benchmark_worker, (name, har_file_path, entries, repeat)))
+    return results
+
+
+def dataset_key(args):
+    """Baseline key: everything that changes the generated file"""
+    if args.har:
+        return f"file:{os.path.basename(args.har)}"
+    return (f"n={args.entries},body={args.body_size},enc={args.encodings or 'default'},"
+            f"flags={args.flag_density},tokens={args.token_density},seed={args.seed}")
+
+
+def dataset_path(args):
+    """Generate the synthetic capture once per configuration and reuse it"""
+    if args.har:
+        return args.har
+    data_dir = args.data_dir or os.path.join(tempfile.gettempdir(), 'har_benchmark')
+    os.makedirs(data_dir, exist_ok=True)
+    name = (f"synthetic_n{args.entries}_b{args.body_size}_f{args.flag_density}_t{args.token_density}"
+            f"_s{args.seed}_{(args.encodings or 'default').replace('=', '').replace(',', '-')}.har")
+    path = os.path.join(data_dir, name)
+    if not os.path.exists(path):
+        print(f"Generating {args.entries} entries into {path}...")
+        start = time.perf_counter()
+        encodings = parse_encodings(args.encodings) if args.encodings else None
+        generate_har(path + '.tmp', args.entries, body_size=args.body_size, encodings=encodings,
+                     flag_density=args.flag_density, token_density=args.token_density, seed=args.seed)
+        os.replace(path + '.tmp', path)
+        print(f"Generated in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def load_baselines(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Mark results whose throughput fell below baseline * (1 - threshold)
+
+    Returns:
+        list: Names of the analyzers that regressed
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['analyzer'])
+        if not previous or not result.get('entries_per_s') or not previous.get('entries_per_s'):
+            continue
+        ratio = result['entries_per_s'] / previous['entries_per_s']
+        result['baseline_ratio'] = round(ratio, 3)
+        if ratio < 1 - threshold:
+            regressions.append(result['analyzer'])
+    return regressions
+
+
+def print_results(results, regressions):
+    print(f"{'analyzer':<26}{'entries':>10}{'seconds':>10}{'entries/s':>12}{'peak MB':>10}{'vs base':>9}")
+    for result in results:
+        if 'error' in result:
+            print(f"{result['analyzer']:<26}  skipped: {result['error']}")
+            continue
+        ratio = result.get('baseline_ratio')
+        mark = ' REGRESSED' if result['analyzer'] in regressions else ''
+        print(f"{result['analyzer']:<26}{result['entries']:>10}{result['seconds']:>10.3f}"
+              f"{result['entries_per_s']:>12.0f}{result['peak_rss_mb'] or 0:>10.1f}"
+              f"{(f'{ratio:.2f}x' if ratio else '-'):>9}{mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the HAR analyzers on a synthetic capture")
+    parser.add_argument("--har", help="benchmark an existing file instead of a generated one")
+    parser.add_argument("-n", "--entries", type=int, default=10000, help="generated entries (default: 10000)")
+    parser.add_argument("--body-size", type=int, default=1024, help="generated body size (default: 1024)")
+    parser.add_argument("--encodings", default=None, help="body encoding weights, e.g. text=6,base64=2,gzip=1,binary=1")
+    parser.add_argument("--flag-density", type=float, default=0.001, help="fraction of entries with a flag")
+    parser.add_argument("--token-density", type=float, default=0.05, help="fraction of entries issuing a token")
+    parser.add_argument("--seed", type=int, default=8, help="generator seed (default: 8)")
+    parser.add_argument("--data-dir", help="where generated captures are kept (default: system temp dir)")
+    parser.add_argument("--only", help="comma-separated analyzers to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per analyzer, best time is kept")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed throughput drop vs the baseline (default: 0.2 = 20%%)")
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    analyzers = ANALYZERS
+    if args.only:
+        analyzers = tuple(name.strip() for name in args.only.split(','))
+        unknown = [name for name in analyzers if name not in ANALYZERS]
+        if unknown:
+            parser.error(f"unknown analyzer(s): {', '.join(unknown)} (choose from {', '.join(ANALYZERS)})")
+
+    try:
+        har_file_path = dataset_path(args)
+    except (OSError, ValueError) as e:
+        print(f"Error preparing dataset: {e}")
+        return 2
+
+    if args.har:
+        entries = sum(1 for _ in iter_har_entries(har_file_path))
+    else:
+        entries = args.entries
+
+    key = dataset_key(args)
+    results = run_benchmarks(har_file_path, entries, analyzers, max(1, args.repeat))
+
+    baselines = load_baselines(args.baseline)
+    regressions = compare_to_baseline(results, baselines.get(key, {}), args.threshold)
+    print(f"Dataset: {key}")
+    print_results(results, regressions)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({'dataset': key, 'results': results, 'regressions': regressions}, file, indent=2)
+
+    if args.save_baseline:
+        baselines[key] = {result['analyzer']: result for result in results if 'error' not in result}
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"Throughput regression (> {args.threshold:.0%} below baseline): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
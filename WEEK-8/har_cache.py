@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+HAR Analysis Cache - Persistent on-disk cache of data extracted from HAR files
+
+Re-parsing a multi-GB capture every time a table or chart is requested is
+slow. This module stores whatever a builder function extracts from a HAR
+file (for the analyzer: the typed column buffers) in a cache directory,
+keyed by the capture's content hash. A small index remembers the size and
+mtime each path had when it was hashed, so an unchanged file is recognised
+with a single stat() call. The directory is kept under a size budget by
+evicting the least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+# Cache location and size budget (overridable through the environment;
+# HAR_CACHE_MAX_BYTES is read when a HARCache is created)
+DEFAULT_CACHE_DIR = os.environ.get(
+    'HAR_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'har_analyzer')
+)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when the layout of cached data changes so old entries are ignored
+CACHE_VERSION = 1
+
+# Bytes read per step while hashing a capture
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def hash_file(file_path):
+    """Return the BLAKE2b hex digest of a file's content"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HARCache:
+    """Content-addressed cache directory with an LRU size budget"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=None):
+        """
+        Args:
+            cache_dir (str): Directory holding cached data and index.json
+            max_bytes (int): Total size the cached data may use on disk
+                             (default: HAR_CACHE_MAX_BYTES or DEFAULT_MAX_BYTES)
+        """
+        if max_bytes is None:
+            try:
+                max_bytes = int(os.environ.get('HAR_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+            except ValueError:
+                print("Warning: Ignoring invalid HAR_CACHE_MAX_BYTES, using the default budget")
+                max_bytes = DEFAULT_MAX_BYTES
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, 'index.json')
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self, index):
+        self.write_atomic(self.index_path, json.dumps(index).encode('utf-8'))
+
+    def write_atomic(self, path, data):
+        """Write via a temp file + rename so readers never see half a file"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def content_key(self, har_file_path):
+        """
+        Return the content hash of a capture, hashing it only if it changed
+
+        Args:
+            har_file_path (str): Path to the HAR file
+
+        Returns:
+            str: Hex digest identifying the file content
+        """
+        stat = os.stat(har_file_path)
+        path = os.path.abspath(har_file_path)
+        index = self.load_index()
+
+        known = index.get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['hash']
+
+        # New or modified file: hash the content and remember it for next time
+        content_hash = hash_file(har_file_path)
+        index[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash}
+        self.save_index(index)
+        return content_hash
+
+    def data_path(self, content_hash, kind):
+        return os.path.join(self.cache_dir, f"{content_hash}.{kind}.v{CACHE_VERSION}.pickle")
+
+    def get_or_build(self, har_file_path, build, kind):
+        """
+        Return cached data for a capture, building and storing it on a miss
+
+        Args:
+            har_file_path (str): Path to the HAR file
+            build (callable): Called as build(har_file_path) on a cache miss
+            kind (str): Name of the data being cached (e.g. 'columns')
+
+        Returns:
+            The cached or freshly built data
+        """
+        try:
+            data_path = self.data_path(self.content_key(har_file_path), kind)
+        except OSError as e:
+            # Unusable cache directory: analyse without the cache
+            print(f"Warning: HAR cache unavailable: {e}")
+            return build(har_file_path)
+
+        try:
+            with open(data_path, 'rb') as file:
+                data = pickle.load(file)
+        except Exception:
+            pass                          # Missing, truncated or stale (old classes/modules)
+        else:
+            # Mark as recently used for LRU eviction
+            try:
+                os.utime(data_path)
+            except OSError:
+                pass
+            return data
+
+        data = build(har_file_path)
+        try:
+            self.write_atomic(data_path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+            self.evict()
+        except OSError as e:
+            # A read-only or full disk should not break the analysis itself
+            print(f"Warning: Could not write HAR cache: {e}")
+        return data
+
+    def evict(self):
+        """Delete least recently used cache files until the budget is met"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pickle'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+        # Drop index rows for files that no longer exist
+        index = self.load_index()
+        live = {path: info for path, info in index.items() if os.path.exists(path)}
+        if len(live) != len(index):
+            self.save_index(live)
+
+    def clear(self):
+        """Remove every cached file and the index"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pickle') or name == 'index.json':
+                os.remove(os.path.join(self.cache_dir, name))
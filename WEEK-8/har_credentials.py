@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+HAR Credential Index - Where each token, cookie and auth header was issued and used
+
+Session token extraction only looked at a top-level `session_token` key in
+JSON responses, and answering "where was this token issued and where was it
+replayed" meant scanning the capture again. This module pulls every
+credential-like value out of an entry while it is loaded:
+
+    issued - Set-Cookie headers and response cookies, token-like response
+             headers and token-like JSON fields at any depth of the response
+    used   - Cookie headers and request cookies, Authorization headers
+             (scheme stripped), token-like request headers, query parameters
+             and JSON fields of the request body
+
+and folds them into an inverted index keyed by the value itself, so both
+questions are a single dictionary lookup.
+"""
+
+import json
+import re
+from array import array
+from urllib.parse import parse_qsl, urlsplit
+
+# Field, header and parameter names that hold credentials. Only whole name
+# segments count - split by -, _ or . or at a camelCase hump (X-Auth-Token,
+# session_id, accessToken, PHPSESSID) - so :authority, author, AUTHOR or
+# x-authored-by don't match. The boundaries are case-sensitive, the keywords not.
+TOKEN_NAME_BOUNDARY = r'(?:[-_.]|(?<=[a-z])(?=[A-Z]))'
+TOKEN_NAME_PATTERN = re.compile(
+    rf'(?:^|{TOKEN_NAME_BOUNDARY})'
+    r'(?i:token|jwt|[a-z]*sess(?:ion)?_?id|session|sid|auth(?:orization)?|bearer|api[-_]?key'
+    r'|secret|credential|passw(?:or)?d)'
+    rf'(?:$|{TOKEN_NAME_BOUNDARY})'
+)
+
+# Headers whose names look token-like but never carry a credential value
+NON_CREDENTIAL_HEADERS = ('www-authenticate',)
+
+# Shorter values are flags like "1" or "ok", not credentials
+MIN_CREDENTIAL_LENGTH = 8
+
+# Max nesting followed inside JSON bodies
+MAX_JSON_DEPTH = 32
+
+ISSUED = 'issued'
+USED = 'used'
+
+
+def split_cookie(text):
+    """Return (name, value) of one 'name=value' cookie pair"""
+    name, _, value = text.partition('=')
+    return name.strip(), value.strip().strip('"')
+
+
+def is_token_name(name):
+    """True if a header, parameter or JSON key name holds a credential"""
+    if name.startswith(':') or name.lower() in NON_CREDENTIAL_HEADERS:
+        return False                      # HTTP/2 pseudo-headers (:authority, :path, ...)
+    return TOKEN_NAME_PATTERN.search(name) is not None
+
+
+def json_credentials(data):
+    """Yield (path, value) for every string under a token-like key, at any depth"""
+    stack = [(data, '', 0)]
+    while stack:
+        node, path, depth = stack.pop()
+        if depth > MAX_JSON_DEPTH:
+            continue
+        if isinstance(node, dict):
+            for key, value in node.items():
+                key_path = f"{path}.{key}" if path else str(key)
+                if isinstance(value, str):
+                    if is_token_name(str(key)):
+                        yield key_path, value
+                elif isinstance(value, (dict, list)):
+                    stack.append((value, key_path, depth + 1))
+        elif isinstance(node, list):
+            for position, value in enumerate(node):
+                if isinstance(value, (dict, list)):
+                    stack.append((value, f"{path}[{position}]", depth + 1))
+
+
+def entry_credentials(entry, response_json=None):
+    """
+    Extract the credential-like values of one entry
+
+    Args:
+        entry (dict): One HAR entry
+        response_json: The already parsed response body, if it was JSON
+                       (avoids a second json.loads of the body)
+
+    Returns:
+        list: Unique (value, role, kind, name) tuples where role is ISSUED or
+              USED, kind is cookie/authorization/header/query/json and name is
+              the cookie, header, parameter or JSON path
+    """
+    found = []
+    seen = set()
+
+    def add(value, role, kind, name):
+        if isinstance(value, str) and len(value) >= MIN_CREDENTIAL_LENGTH and (value, role) not in seen:
+            seen.add((value, role))
+            found.append((value, role, kind, name))
+
+    request = entry.get('request') or {}
+    response = entry.get('response') or {}
+
+    # Issued by the server
+    for header in response.get('headers') or []:
+        name = str(header.get('name', ''))
+        value = header.get('value')
+        if name.lower() == 'set-cookie' and isinstance(value, str):
+            cookie_name, cookie_value = split_cookie(value.split(';', 1)[0])
+            add(cookie_value, ISSUED, 'cookie', cookie_name)
+        elif is_token_name(name):
+            add(value, ISSUED, 'header', name)
+    for cookie in response.get('cookies') or []:
+        add(cookie.get('value'), ISSUED, 'cookie', cookie.get('name', ''))
+    if isinstance(response_json, (dict, list)):
+        for path, value in json_credentials(response_json):
+            add(value, ISSUED, 'json', path)
+
+    # Sent back by the client
+    for header in request.get('headers') or []:
+        name = str(header.get('name', ''))
+        value = header.get('value')
+        if not isinstance(value, str):
+            continue
+        lower = name.lower()
+        if lower == 'cookie':
+            for pair in value.split(';'):
+                cookie_name, cookie_value = split_cookie(pair)
+                add(cookie_value, USED, 'cookie', cookie_name)
+        elif lower == 'authorization':
+            scheme, _, credential = value.strip().partition(' ')
+            add(credential.strip() if credential else scheme, USED, 'authorization', scheme if credential else '')
+        elif is_token_name(name):
+            add(value, USED, 'header', name)
+    for cookie in request.get('cookies') or []:
+        add(cookie.get('value'), USED, 'cookie', cookie.get('name', ''))
+
+    query = urlsplit(str(request.get('url', ''))).query
+    if query:
+        for name, value in parse_qsl(query):
+            if is_token_name(name):
+                add(value, USED, 'query', name)
+
+    post_text = (request.get('postData') or {}).get('text')
+    if isinstance(post_text, str) and post_text.lstrip().startswith(('{', '[')):
+        try:
+            post_json = json.loads(post_text)
+        except json.JSONDecodeError:
+            post_json = None
+        for path, value in json_credentials(post_json):
+            add(value, USED, 'json', path)
+
+    return found
+
+
+class CredentialUses:
+    """Every entry that issued or used one credential value"""
+
+    __slots__ = ('kind', 'name', 'issued', 'used')
+
+    def __init__(self, kind, name):
+        self.kind = kind                   # How it was first seen (cookie, authorization, json, ...)
+        self.name = name                   # Cookie/header/parameter name or JSON path
+        self.issued = array('i')           # Entry indexes, in load order
+        self.used = array('i')
+
+    def first_issued(self):
+        """Entry index where the value was first issued (None if never)"""
+        return self.issued[0] if self.issued else None
+
+    def replays(self):
+        """Entry indexes that used the value after it was first issued"""
+        first = self.first_issued()
+        if first is None:
+            return list(self.used)
+        return [index for index in self.used if index > first]
+
+
+class CredentialIndex:
+    """Inverted index: credential value -> CredentialUses"""
+
+    def __init__(self):
+        self.credentials = {}
+
+    def add(self, entry_index, credentials):
+        """
+        Index the credentials of one entry
+
+        Args:
+            entry_index (int): Position of the entry in log.entries
+            credentials (list): (value, role, kind, name) tuples from entry_credentials()
+        """
+        for value, role, kind, name in credentials:
+            uses = self.credentials.get(value)
+            if uses is None:
+                uses = self.credentials[value] = CredentialUses(kind, name)
+            (uses.issued if role == ISSUED else uses.used).append(entry_index)
+
+    def lookup(self, value):
+        """Return the CredentialUses of a value, or None if it never appeared"""
+        return self.credentials.get(value)
+
+    def first_issued(self, value):
+        uses = self.credentials.get(value)
+        return uses.first_issued() if uses else None
+
+    def replays(self, value):
+        uses = self.credentials.get(value)
+        return uses.replays() if uses else []
+
+    def replayed(self):
+        """Return (value, uses) for every credential used after it was issued"""
+        return [(value, uses) for value, uses in self.credentials.items() if uses.issued and uses.replays()]
+
+    def never_issued(self):
+        """Return (value, uses) for credentials the client sent but the capture never issued"""
+        return [(value, uses) for value, uses in self.credentials.items() if uses.used and not uses.issued]
+
+    def __contains__(self, value):
+        return value in self.credentials
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def __iter__(self):
+        return iter(self.credentials.items())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+HAR Diff - Match the requests of two captures by fingerprint
+
+Comparing a capture from before a deploy with one from after it means
+pairing up "the same" request in both. Each request is reduced to a
+fingerprint of its method, host, URL template and a hash of its body, and
+both captures are folded into a dictionary keyed by that fingerprint while
+they are streamed. Matching is then one hash lookup per fingerprint, so the
+diff is O(n) in the number of entries and only keeps per-endpoint
+statistics in memory, never the entries themselves.
+"""
+
+import hashlib
+import statistics
+from array import array
+
+# Digest size of the request body hash (collisions only merge two endpoints)
+BODY_HASH_SIZE = 8
+
+# A matched endpoint counts as changed when its median latency moves by more
+# than this factor and by at least MIN_LATENCY_SHIFT_MS
+LATENCY_SHIFT_FACTOR = 1.2
+MIN_LATENCY_SHIFT_MS = 5.0
+
+
+def body_hash(text):
+    """Short BLAKE2b hex digest of a request body ('' for no body)"""
+    if not text:
+        return ''
+    if isinstance(text, str):
+        text = text.encode('utf-8', errors='surrogatepass')
+    return hashlib.blake2b(text, digest_size=BODY_HASH_SIZE).hexdigest()
+
+
+class RequestStats:
+    """Aggregated view of every request that shares one fingerprint"""
+
+    __slots__ = ('count', 'times', 'statuses', 'bytes', 'example_url')
+
+    def __init__(self, example_url):
+        self.count = 0
+        self.times = array('d')            # Latencies, kept compact for the median
+        self.statuses = {}                 # status -> count
+        self.bytes = 0
+        self.example_url = example_url
+
+    def add(self, status, time, size):
+        self.count += 1
+        if time == time and time >= 0:     # Skip NaN/unknown timings
+            self.times.append(time)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes += size
+
+    def median(self):
+        return statistics.median(self.times) if self.times else None
+
+
+class RequestIndex:
+    """Hash index of one capture: fingerprint -> RequestStats"""
+
+    def __init__(self):
+        self.requests = {}
+        self.entries = 0
+
+    def add(self, fingerprint, url, status, time, size):
+        """
+        Fold one request into the index
+
+        Args:
+            fingerprint (tuple): (method, host, url template, body hash)
+            url (str): Full URL, remembered once per fingerprint as an example
+            status (int): Response status
+            time (float): Total time in ms (NaN if unknown)
+            size (int): Response body size in bytes
+        """
+        self.entries += 1
+        stats = self.requests.get(fingerprint)
+        if stats is None:
+            stats = self.requests[fingerprint] = RequestStats(url)
+        stats.add(status, time, size)
+
+
+def fingerprint_record(fingerprint, stats):
+    method, host, template, digest = fingerprint
+    return {'method': method, 'host': host, 'path': template, 'body_hash': digest,
+            'example_url': stats.example_url}
+
+
+def diff_indexes(before, after, shift_factor=LATENCY_SHIFT_FACTOR, min_shift_ms=MIN_LATENCY_SHIFT_MS):
+    """
+    Compare two RequestIndex objects
+
+    Args:
+        before (RequestIndex): Baseline capture
+        after (RequestIndex): Capture to compare against the baseline
+        shift_factor (float): Median latency ratio treated as a change
+        min_shift_ms (float): Smaller absolute shifts are ignored
+
+    Returns:
+        dict: 'summary' counts plus 'added', 'removed' and 'changed' lists.
+              Changed requests have a different status mix or a latency
+              shift and are sorted by the absolute median shift.
+    """
+    added = []
+    removed = []
+    changed = []
+    unchanged = 0
+
+    for fingerprint, stats in after.requests.items():
+        if fingerprint not in before.requests:
+            added.append(dict(fingerprint_record(fingerprint, stats), count=stats.count,
+                              statuses=stats.statuses, median_ms=stats.median()))
+
+    for fingerprint, old in before.requests.items():
+        new = after.requests.get(fingerprint)
+        if new is None:
+            removed.append(dict(fingerprint_record(fingerprint, old), count=old.count,
+                                statuses=old.statuses, median_ms=old.median()))
+            continue
+
+        old_median = old.median()
+        new_median = new.median()
+        reasons = []
+        if set(old.statuses) != set(new.statuses):
+            reasons.append('status')
+        if old_median is not None and new_median is not None:
+            shift = new_median - old_median
+            low, high = sorted((old_median, new_median))
+            if abs(shift) >= min_shift_ms and (low <= 0 or high / low >= shift_factor):
+                reasons.append('latency')
+        else:
+            shift = None
+
+        if not reasons:
+            unchanged += 1
+            continue
+        changed.append(dict(fingerprint_record(fingerprint, new),
+                            reasons=reasons,
+                            count_before=old.count, count_after=new.count,
+                            statuses_before=old.statuses, statuses_after=new.statuses,
+                            median_before_ms=old_median, median_after_ms=new_median,
+                            median_shift_ms=shift))
+
+    added.sort(key=lambda item: item['count'], reverse=True)
+    removed.sort(key=lambda item: item['count'], reverse=True)
+    changed.sort(key=lambda item: abs(item['median_shift_ms'] or 0), reverse=True)
+
+    return {
+        'summary': {
+            'entries_before': before.entries,
+            'entries_after': after.entries,
+            'endpoints_before': len(before.requests),
+            'endpoints_after': len(after.requests),
+            'added': len(added),
+            'removed': len(removed),
+            'changed': len(changed),
+            'unchanged': unchanged,
+        },
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+    }
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+HAR Findings Store - Deduplicated, indexed storage for flags found in HAR files
+
+Both the GUI analyzer and the CTF flag extractor used to check for duplicates
+with `flag not in [f['flag'] for f in flags_found]`, which rebuilds a list on
+every match. This store keeps the unique findings in discovery order and
+hash indexes by flag value, entry index and URL, so deduplication and
+"where does this flag appear" questions are dictionary lookups.
+"""
+
+
+class FlagFindings:
+    """Unique flag findings plus indexes of every place each flag was seen"""
+
+    def __init__(self):
+        self.findings = []         # One dict per unique flag, in discovery order
+        self.by_flag = {}          # flag -> [occurrence, ...]
+        self.by_entry = {}         # entry_index -> [occurrence, ...]
+        self.by_url = {}           # url -> [occurrence, ...]
+        self.seen = set()          # (entry_index, flag) pairs already indexed
+
+    def add(self, entry_index, url, flag, context, **extra):
+        """
+        Record a flag match
+
+        Every (entry, flag) pair is indexed once; only the first time a flag
+        value is seen does it become a new finding.
+
+        Args:
+            entry_index (int): Position of the entry in log.entries
+            url (str): Request URL of the entry
+            flag (str): The matched flag text
+            context (str): Where the flag was found (e.g. 'Session Token')
+            **extra: Extra fields stored on the finding (e.g. full_response)
+
+        Returns:
+            bool: True if this is a new unique flag
+        """
+        if (entry_index, flag) in self.seen:
+            return False
+        self.seen.add((entry_index, flag))
+
+        occurrence = {'entry_index': entry_index, 'url': url, 'flag': flag, 'context': context}
+        self.by_entry.setdefault(entry_index, []).append(occurrence)
+        self.by_url.setdefault(url, []).append(occurrence)
+
+        if flag in self.by_flag:
+            self.by_flag[flag].append(occurrence)
+            return False
+
+        self.by_flag[flag] = [occurrence]
+        finding = dict(occurrence)
+        finding.update(extra)
+        self.findings.append(finding)
+        return True
+
+    def entries_with(self, flag):
+        """Return the entry indexes that contain `flag`"""
+        return [occurrence['entry_index'] for occurrence in self.by_flag.get(flag, [])]
+
+    def flags_in_entry(self, entry_index):
+        """Return the flags found in one entry"""
+        return [occurrence['flag'] for occurrence in self.by_entry.get(entry_index, [])]
+
+    def flags_for_url(self, url):
+        """Return the flags found in responses for one URL"""
+        return [occurrence['flag'] for occurrence in self.by_url.get(url, [])]
+
+    def __contains__(self, flag):
+        return flag in self.by_flag
+
+    def __len__(self):
+        return len(self.findings)
+
+    def __iter__(self):
+        return iter(self.findings)
+
+    def __getitem__(self, index):
+        return self.findings[index]
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Synthetic HAR Generator - Deterministic captures for testing and benchmarks
+
+Real captures can't be shared and never have the size or mix needed to
+measure the analyzers. This module writes HAR (or JSON-lines) files with a
+configurable number of entries, body sizes, body encodings and density of
+planted flags and session tokens. The same seed always produces the same
+file byte for byte, so benchmark numbers are comparable across runs.
+
+Entries are written one at a time, so a 1M-entry capture needs no more
+memory than a 10-entry one.
+
+Usage:
+    python har_generator.py out.har -n 100000 --flag-density 0.001
+    python har_generator.py out.jsonl -n 50000 --encodings text=6,base64=2,gzip=1,binary=1
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Body encodings and their default share of the entries
+#   text   - plain JSON / text body
+#   base64 - the same body with content.encoding = "base64"
+#   gzip   - gzip-compressed body, base64-encoded, with Content-Encoding: gzip
+#   binary - random bytes served as image/png (skipped by the scanner)
+DEFAULT_ENCODINGS = {'text': 6, 'base64': 2, 'gzip': 1, 'binary': 1}
+
+# Where planted flags are hidden, in rotation
+FLAG_LOCATIONS = ('session_token', 'body', 'header', 'url', 'cookie')
+
+HOSTS = ('api.example.com', 'auth.example.com', 'cdn.example.com', 'static.example.com')
+PATHS = ('/v1/users/{id}', '/v1/users/{id}/orders', '/v1/search', '/v1/items/{id}',
+         '/auth/session', '/assets/img/{id}.png', '/graphql')
+METHODS = ('GET', 'GET', 'GET', 'POST', 'PUT', 'DELETE')
+STATUSES = (200, 200, 200, 200, 201, 204, 301, 304, 400, 401, 404, 500, 502)
+
+# First entry's start time (fixed for reproducible files)
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_encodings(spec):
+    """Parse 'text=6,base64=2' into {'text': 6, 'base64': 2}"""
+    encodings = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_ENCODINGS:
+            raise ValueError(f"unknown encoding {name!r} (choose from {', '.join(DEFAULT_ENCODINGS)})")
+        encodings[name] = float(weight) if weight else 1.0
+    return encodings
+
+
+class HARGenerator:
+    """Builds synthetic HAR entries from a seeded random source"""
+
+    def __init__(self, body_size=1024, encodings=None, flag_density=0.001,
+                 token_density=0.05, seed=8):
+        """
+        Args:
+            body_size (int): Approximate response body size in bytes
+            encodings (dict): Encoding name -> weight (default: DEFAULT_ENCODINGS)
+            flag_density (float): Fraction of entries that carry a flag
+            token_density (float): Fraction of entries that issue a session token
+            seed (int): Random seed; same seed and settings give the same file
+        """
+        self.body_size = body_size
+        self.encodings = encodings or DEFAULT_ENCODINGS
+        self.flag_density = flag_density
+        self.token_density = token_density
+        self.random = random.Random(seed)
+        self.flags = []                # (entry index, location, flag) planted so far
+        self.tokens = []               # Session tokens issued so far (reused by later requests)
+
+        self.encoding_names = list(self.encodings)
+        self.encoding_weights = [self.encodings[name] for name in self.encoding_names]
+
+    def filler(self, size):
+        """Deterministic pseudo-text of roughly `size` characters"""
+        words = ('alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel')
+        choices = self.random.choices(words, k=max(1, size // 6))
+        return ' '.join(choices)[:size]
+
+    def entry(self, index):
+        """Return entry number `index` (call with increasing indexes)"""
+        rnd = self.random
+        host = rnd.choice(HOSTS)
+        path = rnd.choice(PATHS).replace('{id}', str(rnd.randrange(1, 100000)))
+        method = rnd.choice(METHODS)
+        status = rnd.choice(STATUSES)
+        encoding = rnd.choices(self.encoding_names, self.encoding_weights)[0]
+
+        flag_location = None
+        if rnd.random() < self.flag_density:
+            flag_location = FLAG_LOCATIONS[len(self.flags) % len(FLAG_LOCATIONS)]
+            flag = f"FLAG{{synthetic_{len(self.flags)}_{rnd.getrandbits(32):08x}}}"
+            self.flags.append((index, flag_location, flag))
+
+        request_headers = [{'name': 'User-Agent', 'value': 'har-generator/1.0'},
+                           {'name': 'Accept', 'value': 'application/json'}]
+        request_cookies = []
+        response_headers = [{'name': 'Content-Type', 'value': 'application/json'}]
+
+        # Later requests replay previously issued tokens
+        if self.tokens and rnd.random() < 0.3:
+            token = rnd.choice(self.tokens)
+            if rnd.random() < 0.5:
+                request_headers.append({'name': 'Authorization', 'value': f"Bearer {token}"})
+            else:
+                request_cookies.append({'name': 'session', 'value': token})
+                request_headers.append({'name': 'Cookie', 'value': f"session={token}"})
+
+        query = '' if rnd.random() < 0.7 else f"?page={rnd.randrange(1, 50)}"
+        if flag_location == 'url':
+            query = f"?debug={flag}"
+        if flag_location == 'header':
+            request_headers.append({'name': 'X-Debug-Token', 'value': flag})
+        if flag_location == 'cookie':
+            request_cookies.append({'name': 'ctf', 'value': flag})
+            request_headers.append({'name': 'Cookie', 'value': f"ctf={flag}"})
+
+        # Response body
+        body = {'id': index, 'status': 'ok', 'data': self.filler(self.body_size)}
+        if flag_location == 'session_token' or rnd.random() < self.token_density:
+            token = flag if flag_location == 'session_token' else f"sess_{rnd.getrandbits(64):016x}"
+            body['session_token'] = token
+            if flag_location != 'session_token':
+                self.tokens.append(token)
+                response_headers.append({'name': 'Set-Cookie', 'value': f"session={token}; Path=/; HttpOnly"})
+        if flag_location == 'body':
+            body['message'] = f"congrats {flag}"
+        text = json.dumps(body)
+
+        content = {'size': len(text), 'mimeType': 'application/json'}
+        if encoding == 'text':
+            content['text'] = text
+        elif encoding == 'base64':
+            content['text'] = base64.b64encode(text.encode('utf-8')).decode('ascii')
+            content['encoding'] = 'base64'
+        elif encoding == 'gzip':
+            compressed = gzip.compress(text.encode('utf-8'), mtime=0)
+            content['text'] = base64.b64encode(compressed).decode('ascii')
+            content['encoding'] = 'base64'
+            response_headers.append({'name': 'Content-Encoding', 'value': 'gzip'})
+        else:
+            # Binary asset: the flag (if any) stays findable through the request side only
+            data = rnd.getrandbits(8 * self.body_size).to_bytes(self.body_size, 'little')
+            content.update(size=len(data), mimeType='image/png',
+                           text=base64.b64encode(data).decode('ascii'), encoding='base64')
+            response_headers[0]['value'] = 'image/png'
+            if flag_location in ('session_token', 'body'):
+                self.flags.pop()     # Unreachable inside an image - don't count it
+
+        post_data = None
+        if method in ('POST', 'PUT'):
+            post_data = {'mimeType': 'application/json',
+                         'text': json.dumps({'query': self.filler(64), 'page': rnd.randrange(1, 10)})}
+
+        timings = {
+            'blocked': round(rnd.random() * 2, 3),
+            'dns': -1 if rnd.random() < 0.8 else round(rnd.random() * 20, 3),
+            'connect': -1 if rnd.random() < 0.8 else round(rnd.random() * 30, 3),
+            'ssl': -1,
+            'send': round(rnd.random(), 3),
+            'wait': round(rnd.lognormvariate(3.5, 0.8), 3),
+            'receive': round(rnd.random() * 10, 3),
+        }
+        total = sum(value for value in timings.values() if value > 0)
+
+        request = {
+            'method': method,
+            'url': f"https://{host}{path}{query}",
+            'httpVersion': 'HTTP/1.1',
+            'headers': request_headers,
+            'cookies': request_cookies,
+            'queryString': [],
+            'headersSize': -1,
+            'bodySize': len(post_data['text']) if post_data else 0,
+        }
+        if post_data:
+            request['postData'] = post_data
+
+        return {
+            'startedDateTime': (START_TIME + timedelta(milliseconds=index * 37)).isoformat(timespec='milliseconds'),
+            'time': round(total, 3),
+            'request': request,
+            'response': {
+                'status': status,
+                'statusText': '',
+                'httpVersion': 'HTTP/1.1',
+                'headers': response_headers,
+                'cookies': [],
+                'content': content,
+                'redirectURL': '',
+                'headersSize': -1,
+                'bodySize': content['size'],
+            },
+            'cache': {},
+            'timings': timings,
+        }
+
+
+def generate_har(output_path, entries=10000, jsonl=False, **options):
+    """
+    Write a synthetic capture
+
+    Args:
+        output_path (str): File to write
+        entries (int): Number of entries
+        jsonl (bool): Write one entry per line instead of a HAR document
+        **options: HARGenerator settings (body_size, encodings, flag_density,
+                   token_density, seed)
+
+    Returns:
+        dict: entries, flags (list of (index, location, flag)) and session_tokens
+    """
+    generator = HARGenerator(**options)
+    with open(output_path, 'w', encoding='utf-8') as file:
+        if not jsonl:
+            file.write('{"log": {"version": "1.2", "creator": {"name": "har_generator", "version": "1.0"},'
+                       ' "pages": [], "entries": [\n')
+        for index in range(entries):
+            text = json.dumps(generator.entry(index), separators=(',', ':'))
+            if jsonl:
+                file.write(text + '\n')
+            else:
+                file.write(text if index == 0 else ',\n' + text)
+        if not jsonl:
+            file.write('\n]}}\n')
+
+    return {'entries': entries, 'flags': generator.flags, 'session_tokens': len(generator.tokens)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic HAR file")
+    parser.add_argument("output", help="file to write (.jsonl/.ndjson for one entry per line)")
+    parser.add_argument("-n", "--entries", type=int, default=10000, help="number of entries (default: 10000)")
+    parser.add_argument("--body-size", type=int, default=1024, help="approximate response body size (default: 1024)")
+    parser.add_argument("--encodings", default=None,
+                        help="body encoding weights, e.g. text=6,base64=2,gzip=1,binary=1 (the default)")
+    parser.add_argument("--flag-density", type=float, default=0.001,
+                        help="fraction of entries carrying a flag (default: 0.001)")
+    parser.add_argument("--token-density", type=float, default=0.05,
+                        help="fraction of entries issuing a session token (default: 0.05)")
+    parser.add_argument("--seed", type=int, default=8, help="random seed (default: 8)")
+    args = parser.parse_args(argv)
+
+    try:
+        encodings = parse_encodings(args.encodings) if args.encodings else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    jsonl = args.output.lower().endswith(('.jsonl', '.ndjson'))
+    summary = generate_har(args.output, args.entries, jsonl=jsonl, body_size=args.body_size,
+                           encodings=encodings, flag_density=args.flag_density,
+                           token_density=args.token_density, seed=args.seed)
+    print(f"Wrote {summary['entries']} entries to {args.output} "
+          f"({len(summary['flags'])} flags, {summary['session_tokens']} session tokens)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+HAR Replay Engine - Concurrent, connection-pooled replay of HAR requests
+
+Sending each captured request one after another with bare requests.get/post
+opens a new connection every time and only handles GET and POST. This engine
+replays every method with its body, keeps one pooled keep-alive session per
+host, runs a bounded number of requests at once, and can optionally pace
+requests to the capture's original start times.
+
+benchmark_report() compares the replayed latencies with the timings stored
+in the capture and reports percentiles per host and endpoint, so backend
+performance can be tracked from one captured workload to the next.
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from har_analysis import url_template
+
+# Timing phases that make up the server round trip of a reused connection
+ROUND_TRIP_PHASES = ('send', 'wait', 'receive')
+
+# Percentiles reported by benchmark_report()
+BENCHMARK_PERCENTILES = (50, 95, 99)
+
+# Headers that describe the captured connection rather than the request
+SKIPPED_HEADERS = {'content-length', 'connection', 'keep-alive', 'transfer-encoding',
+                   'proxy-connection', 'upgrade', 'te', 'trailer'}
+
+
+def parse_started_time(value):
+    """Return a HAR startedDateTime as seconds since the epoch, or None"""
+    if not value:
+        return None
+    try:
+        # fromisoformat() only accepts a trailing 'Z' from Python 3.11
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def captured_round_trip_ms(entry):
+    """
+    Return the captured latency comparable to a replay over a pooled connection
+
+    Uses send + wait + receive from entry['timings'] (DNS, connect and TLS
+    setup don't happen on a reused connection); falls back to entry['time'].
+    """
+    timings = entry.get('timings') or {}
+    phases = [timings.get(phase) for phase in ROUND_TRIP_PHASES]
+    if all(isinstance(value, (int, float)) and value >= 0 for value in phases):
+        return float(sum(phases))
+    total = entry.get('time')
+    return float(total) if isinstance(total, (int, float)) and total >= 0 else None
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+class HARReplayer:
+    """Replays HAR entries over pooled per-host sessions with bounded concurrency"""
+
+    def __init__(self, concurrency=8, timeout=5, pace=False, speed=1.0, base_url=None, verify=True):
+        """
+        Args:
+            concurrency (int): Max requests in flight at once
+            timeout (float): Per-request timeout in seconds
+            pace (bool): Keep the original gaps between request start times
+            speed (float): Pacing multiplier (2.0 = replay twice as fast)
+            base_url (str): Optional scheme://host[:port] every request is sent
+                            to instead of its captured host (e.g. a local test server)
+            verify (bool): Verify TLS certificates
+        """
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.pace = pace
+        self.speed = speed if speed > 0 else 1.0
+        self.base_url = urlsplit(base_url) if base_url else None
+        self.verify = verify
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the keep-alive session for the URL's scheme and host"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        with self.sessions_lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self.sessions[key] = session
+        return session
+
+    def build_request(self, entry):
+        """
+        Turn a HAR entry into keyword arguments for Session.request
+
+        Returns:
+            dict: method, url, headers and data
+        """
+        request_data = entry['request']
+        url = request_data['url']
+        if self.base_url:
+            parts = urlsplit(url)
+            url = urlunsplit((self.base_url.scheme, self.base_url.netloc, parts.path, parts.query, ''))
+
+        # Extract headers, leaving out HTTP/2 pseudo-headers and per-connection ones
+        headers = {}
+        for header in request_data.get('headers', []):
+            name = header.get('name', '')
+            if name.startswith(':') or name.lower() in SKIPPED_HEADERS:
+                continue
+            headers[name] = header.get('value', '')
+
+        # Body: raw text if captured, otherwise form params
+        data = None
+        post_data = request_data.get('postData') or {}
+        if post_data.get('text'):
+            data = post_data['text'].encode('utf-8')
+        elif post_data.get('params'):
+            data = [(param.get('name', ''), param.get('value', '')) for param in post_data['params']]
+
+        return {
+            'method': request_data.get('method', 'GET').upper(),
+            'url': url,
+            'headers': headers,
+            'data': data
+        }
+
+    def send(self, index, entry):
+        """
+        Replay one entry
+
+        Returns:
+            dict: index, method, url, status (None on error), elapsed_ms, bytes,
+                  error, plus the captured URL and latency for comparison
+        """
+        result = {'index': index, 'method': None, 'url': None, 'status': None,
+                  'elapsed_ms': None, 'bytes': 0, 'error': None,
+                  'captured_url': None, 'captured_ms': None}
+        try:
+            result['captured_url'] = entry['request']['url']
+            result['captured_ms'] = captured_round_trip_ms(entry)
+            kwargs = self.build_request(entry)
+            result['method'] = kwargs['method']
+            result['url'] = kwargs['url']
+
+            start = time.perf_counter()
+            response = self.session_for(kwargs['url']).request(
+                timeout=self.timeout, verify=self.verify, allow_redirects=False, **kwargs
+            )
+            content = response.content                # Read the body so the connection is reusable
+            result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+            result['status'] = response.status_code
+            result['bytes'] = len(content)
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    def replay(self, entries, on_result=None):
+        """
+        Replay entries (any iterable, e.g. iter_har_entries) concurrently
+
+        Args:
+            entries: Iterable of HAR entries
+            on_result (callable): Optional callback for each finished result;
+                                  called from worker threads
+
+        Returns:
+            list: Result dicts from send(), in entry order
+        """
+        results = []
+        # Limit queued + running work so a streamed capture is never fully buffered
+        slots = threading.BoundedSemaphore(self.concurrency * 2)
+        first_started = None
+        replay_start = time.monotonic()
+
+        def run(index, entry):
+            try:
+                result = self.send(index, entry)
+                if on_result:
+                    on_result(result)
+                return result
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = []
+            for index, entry in enumerate(entries):
+                # Wait until this request is due, relative to the first one
+                if self.pace:
+                    started = parse_started_time(entry.get('startedDateTime'))
+                    if started is not None:
+                        if first_started is None:
+                            first_started = started
+                        delay = (started - first_started) / self.speed - (time.monotonic() - replay_start)
+                        if delay > 0:
+                            time.sleep(delay)
+
+                slots.acquire()
+                futures.append(pool.submit(run, index, entry))
+
+            results = [future.result() for future in futures]
+
+        return results
+
+    def close(self):
+        """Close all pooled connections"""
+        with self.sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+def summarize_latencies(pairs):
+    """
+    Percentiles for a group of (replayed_ms, captured_ms) pairs
+
+    Returns:
+        dict: count plus replayed/captured p50/p95/p99 and the p95 ratio
+    """
+    replayed = sorted(r for r, _ in pairs)
+    captured = sorted(c for _, c in pairs if c is not None)
+    summary = {'count': len(pairs)}
+    for pct in BENCHMARK_PERCENTILES:
+        summary[f'replayed_p{pct}'] = percentile(replayed, pct)
+        summary[f'captured_p{pct}'] = percentile(captured, pct)
+    if summary['captured_p95']:
+        summary['p95_ratio'] = summary['replayed_p95'] / summary['captured_p95']
+    else:
+        summary['p95_ratio'] = None
+    return summary
+
+
+def benchmark_report(results, threshold=1.5, min_count=5):
+    """
+    Compare replayed latencies with the capture, grouped by host and endpoint
+
+    Endpoints are keyed by URL template ('/users/{id}'), so requests for
+    different resources of one endpoint are compared as a single group.
+
+    Args:
+        results (list): Result dicts from HARReplayer.replay()
+        threshold (float): Flag a group whose replayed p95 exceeds its
+                           captured p95 by more than this factor
+        min_count (int): Groups with fewer successful requests are reported
+                         but never flagged
+
+    Returns:
+        dict: JSON-serialisable report with 'overall', 'hosts', 'endpoints'
+              and 'regressions'
+    """
+    by_host = defaultdict(list)
+    by_endpoint = defaultdict(list)
+    everything = []
+    failed = 0
+
+    for result in results:
+        if result['error'] or result['elapsed_ms'] is None:
+            failed += 1
+            continue
+        url = result['captured_url'] or result['url']
+        pair = (result['elapsed_ms'], result['captured_ms'])
+        everything.append(pair)
+        by_host[urlsplit(url).netloc].append(pair)
+        by_endpoint[(urlsplit(url).netloc, result['method'], url_template(url))].append(pair)
+
+    hosts = [dict(host=host, **summarize_latencies(pairs)) for host, pairs in sorted(by_host.items())]
+    endpoints = [dict(host=host, method=method, path=path, **summarize_latencies(pairs))
+                 for (host, method, path), pairs in sorted(by_endpoint.items())]
+
+    regressions = [
+        group for group in hosts + endpoints
+        if group['count'] >= min_count and group['p95_ratio'] is not None and group['p95_ratio'] > threshold
+    ]
+    regressions.sort(key=lambda group: group['p95_ratio'], reverse=True)
+
+    return {
+        'generated': datetime.now().astimezone().isoformat(timespec='seconds'),
+        'threshold': threshold,
+        'requests': len(results),
+        'failed': failed,
+        'overall': summarize_latencies(everything),
+        'hosts': hosts,
+        'endpoints': endpoints,
+        'regressions': regressions
+    }
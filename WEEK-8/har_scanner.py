@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+HAR Secret Scanner - Multi-pattern scanning of whole HAR entries
+
+The HAR tools used to look for FLAG{...} in response bodies only. Secrets
+also leak through request headers, cookies, query strings, POST bodies and
+response headers. This scanner gathers every text field of an entry into one
+buffer and matches the detectors against it in a single pass of one combined
+alternation. Each built-in detector has a few literal strings, at least one
+of which every match contains; a plain substring test for them decides
+whether it joins that alternation at all, so the common case (no flag, no
+secret) costs a handful of `in` checks per entry.
+
+Response bodies are decoded transparently (base64 content, gzip/deflate and,
+when the optional libraries are installed, brotli >= 1.2 and zstd payloads) by
+decoded_body(), which runs at most once per entry and skips binary assets
+such as images and fonts based on their MIME type.
+"""
+
+import base64
+import binascii
+import re
+import zlib
+from bisect import bisect_right
+from urllib.parse import unquote
+
+# Optional decompressors - bodies in these formats are skipped if missing
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Built-in detectors: name -> regex. Patterns must not match FIELD_SEPARATOR.
+DEFAULT_DETECTORS = {
+    'flag': r'FLAG\{[^}\x00]+\}',
+    'jwt': r'\beyJ[A-Za-z0-9_-]{5,}\.eyJ[A-Za-z0-9_-]{5,}\.[A-Za-z0-9_-]*',
+    'bearer_token': r'\b[Bb]earer[ \t]+[A-Za-z0-9\-._~+/]{8,}=*',
+    'aws_access_key': r'\b(?:AKIA|ASIA)[0-9A-Z]{16}\b',
+    'github_token': r'\bgh[pousr]_[A-Za-z0-9]{36,}\b',
+    'google_api_key': r'\bAIza[0-9A-Za-z\-_]{35}\b',
+    'slack_token': r'\bxox[abprs]-[0-9A-Za-z-]{10,}',
+    'stripe_key': r'\b(?:sk|pk|rk)_(?:live|test)_[0-9A-Za-z]{16,}\b',
+    'api_key_assignment': r'(?i:\b(?:api[_-]?key|apikey|access[_-]?token|client[_-]?secret)\b["\']?[ \t]*[:=][ \t]*["\']?[A-Za-z0-9_\-]{16,})',
+}
+
+# Just the CTF flag detector - what the flag extractor runs unless asked for secrets
+FLAG_DETECTORS = {'flag': DEFAULT_DETECTORS['flag']}
+
+# Literals at least one of which is part of every match of a detector. A
+# detector whose literals are all absent from an entry is skipped. Detectors
+# in CASE_INSENSITIVE_PREFILTERS test lowercase literals against the
+# lowercased buffer. Detectors without an entry here always run.
+DETECTOR_PREFILTERS = {
+    'flag': ('FLAG{',),
+    'jwt': ('eyJ',),
+    'bearer_token': ('earer',),
+    'aws_access_key': ('AKIA', 'ASIA'),
+    'github_token': ('ghp_', 'gho_', 'ghu_', 'ghs_', 'ghr_'),
+    'google_api_key': ('AIza',),
+    'slack_token': ('xox',),
+    'stripe_key': ('_live_', '_test_'),
+    'api_key_assignment': ('api_key', 'api-key', 'apikey', 'access_token', 'access-token',
+                           'accesstoken', 'client_secret', 'client-secret', 'clientsecret'),
+}
+CASE_INSENSITIVE_PREFILTERS = {'api_key_assignment'}
+
+# Separates the fields of an entry in the scan buffer
+FIELD_SEPARATOR = '\x00'
+
+# Location label used for the response body
+RESPONSE_BODY = 'response body'
+
+# MIME types whose bodies can't hold readable tokens (never decoded or scanned)
+BINARY_MIME_PREFIXES = ('image/', 'font/', 'audio/', 'video/', 'application/font',
+                        'application/x-font', 'application/vnd.ms-fontobject',
+                        'application/octet-stream', 'application/wasm', 'application/zip',
+                        'application/pdf')
+TEXT_MIME_EXCEPTIONS = ('image/svg+xml',)
+
+# Key under which decoded_body() memoizes its result on the content dict
+DECODED_BODY_KEY = '_decoded_text'
+
+# Upper bound for a decompressed body (protects against decompression bombs)
+MAX_DECODED_BYTES = 64 * 1024 * 1024
+
+
+def is_binary_mime(mime_type):
+    """True for images, fonts and other assets that can't contain tokens"""
+    mime_type = (mime_type or '').split(';')[0].strip().lower()
+    return mime_type.startswith(BINARY_MIME_PREFIXES) and mime_type not in TEXT_MIME_EXCEPTIONS
+
+
+def brotli_decompress(data, limit=MAX_DECODED_BYTES):
+    """
+    Decompress brotli data, stopping after `limit` bytes of output
+
+    Returns:
+        bytes: The output, or b'' with brotli < 1.2, whose process() has no
+               output_buffer_limit - such bodies are skipped rather than
+               decompressed without a cap
+    """
+    try:
+        output = brotli.Decompressor().process(data, output_buffer_limit=limit)
+    except TypeError:
+        return b''
+    return output[:limit]
+
+
+def decompress(data, content_encoding=''):
+    """
+    Undo gzip/deflate/brotli/zstd compression, detected by magic bytes or the
+    Content-Encoding header
+
+    Returns:
+        bytes: The decompressed payload, or `data` unchanged if not compressed
+    """
+    content_encoding = content_encoding.lower()
+    try:
+        if data[:2] == b'\x1f\x8b':
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            return decompressor.decompress(data, MAX_DECODED_BYTES)
+        if data[:1] == b'\x78' and len(data) > 1 and (data[0] * 256 + data[1]) % 31 == 0:
+            return zlib.decompressobj().decompress(data, MAX_DECODED_BYTES)
+        if data[:4] == b'\x28\xb5\x2f\xfd' and zstandard:
+            return zstandard.ZstdDecompressor().decompress(data, max_output_size=MAX_DECODED_BYTES)
+        if 'br' in content_encoding and brotli:
+            return brotli_decompress(data)
+        if 'deflate' in content_encoding:
+            return zlib.decompressobj(-zlib.MAX_WBITS).decompress(data, MAX_DECODED_BYTES)
+    except Exception:
+        pass                                      # Corrupt or truncated - keep the raw bytes
+    return data
+
+
+def charset_of(mime_type):
+    """Return the charset parameter of a MIME type (default utf-8)"""
+    for param in (mime_type or '').split(';')[1:]:
+        name, _, value = param.partition('=')
+        if name.strip().lower() == 'charset' and value.strip():
+            return value.strip().strip('"')
+    return 'utf-8'
+
+
+def decoded_body(entry):
+    """
+    Return the response body of an entry as text, decoding it on first use
+
+    base64 content (content.encoding == 'base64') is decoded and compressed
+    payloads are decompressed. The result is memoized on the content dict so
+    every consumer of the same entry shares one decode.
+
+    Args:
+        entry (dict): One HAR entry
+
+    Returns:
+        str: Body text ('' if empty or a binary asset)
+    """
+    response = entry.get('response') or {}
+    content = response.get('content') or {}
+    if DECODED_BODY_KEY in content:
+        return content[DECODED_BODY_KEY]
+
+    text = content.get('text') or ''
+    mime_type = content.get('mimeType', '')
+    if not isinstance(text, str) or is_binary_mime(mime_type):
+        text = ''
+    elif content.get('encoding') == 'base64':
+        content_encoding = ''
+        for header in response.get('headers') or []:
+            if header.get('name', '').lower() == 'content-encoding':
+                content_encoding = header.get('value', '')
+
+        try:
+            data = decompress(base64.b64decode(text), content_encoding)
+            try:
+                text = data.decode(charset_of(mime_type), errors='replace')
+            except LookupError:
+                text = data.decode('utf-8', errors='replace')
+        except (binascii.Error, ValueError):
+            pass                                  # Not really base64 - scan the raw text
+
+    content[DECODED_BODY_KEY] = text
+    return text
+
+
+class SecretScanner:
+    """Matches many detectors against every text field of a HAR entry"""
+
+    def __init__(self, detectors=None, extra_detectors=None):
+        """
+        Args:
+            detectors (dict): name -> regex, replaces DEFAULT_DETECTORS
+            extra_detectors (dict): name -> regex, added to the detectors
+                                    (e.g. custom patterns from the user)
+        """
+        self.detectors = dict(DEFAULT_DETECTORS if detectors is None else detectors)
+        self.detectors.update(extra_detectors or {})
+
+        # (name, compiled regex, prefilter literals, case-insensitive prefilter)
+        # A built-in name only keeps its prefilter while it keeps its pattern
+        self.compiled = []
+        for name, pattern in self.detectors.items():
+            literals = DETECTOR_PREFILTERS.get(name) if pattern == DEFAULT_DETECTORS.get(name) else None
+            self.compiled.append((name, re.compile(pattern), literals, name in CASE_INSENSITIVE_PREFILTERS))
+
+        # Combined alternations, keyed by the indexes of the detectors in them
+        self.combined = {}
+
+    def combined_regex(self, indexes):
+        """
+        Return one alternation of the given detectors, compiled on first use
+
+        Each detector becomes a named group, so match.lastgroup tells which
+        one matched. Where matches of two detectors overlap, the leftmost
+        wins, and the detector listed first breaks a tie.
+
+        Returns:
+            tuple: (compiled regex, {group name: detector name})
+        """
+        if indexes not in self.combined:
+            names = {f"d{index}": self.compiled[index][0] for index in indexes}
+            pattern = '|'.join(f"(?P<d{index}>{self.compiled[index][1].pattern})" for index in indexes)
+            self.combined[indexes] = (re.compile(pattern), names)
+        return self.combined[indexes]
+
+    @staticmethod
+    def entry_fields(entry):
+        """
+        Yield (location, text) for every scannable field of a HAR entry
+
+        Query strings are covered through the (URL-decoded) request URL.
+        """
+        request = entry.get('request') or {}
+        response = entry.get('response') or {}
+
+        url = request.get('url')
+        if url:
+            yield 'request url', unquote(url)
+        for header in request.get('headers') or []:
+            yield f"request header {header.get('name', '')}", header.get('value', '')
+        for cookie in request.get('cookies') or []:
+            yield f"request cookie {cookie.get('name', '')}", cookie.get('value', '')
+        post_data = request.get('postData') or {}
+        if post_data.get('text'):
+            yield 'request body', post_data['text']
+        for param in post_data.get('params') or []:
+            yield f"request param {param.get('name', '')}", param.get('value', '')
+
+        for header in response.get('headers') or []:
+            yield f"response header {header.get('name', '')}", header.get('value', '')
+        for cookie in response.get('cookies') or []:
+            yield f"response cookie {cookie.get('name', '')}", cookie.get('value', '')
+        body = decoded_body(entry)
+        if body:
+            yield RESPONSE_BODY, body
+
+    def scan_fields(self, fields):
+        """
+        Scan (location, text) pairs, all fields joined into one buffer
+
+        Returns:
+            list: (detector, value, location) tuples in field order
+        """
+        fields = [(location, text) for location, text in fields if isinstance(text, str) and text]
+        if not fields:
+            return []
+        joined = FIELD_SEPARATOR.join([text for _, text in fields])
+
+        # Cheap literal checks first; most entries stop here
+        lowered = None
+        combinable = []
+        passes = []
+        for index, (name, regex, literals, ignore_case) in enumerate(self.compiled):
+            if literals:
+                if ignore_case:
+                    if lowered is None:
+                        lowered = joined.lower()
+                    haystack = lowered
+                else:
+                    haystack = joined
+                for literal in literals:
+                    if literal in haystack:
+                        break
+                else:
+                    continue
+            if regex.groups:
+                # Capture groups of its own would be renumbered in the
+                # alternation (breaking backreferences), so it runs alone
+                passes.append((regex, name))
+            else:
+                combinable.append(index)
+        if len(combinable) == 1:
+            # A lone detector keeps its own regex (and re's literal-prefix search)
+            name, regex = self.compiled[combinable[0]][:2]
+            passes.append((regex, name))
+        elif combinable:
+            passes.append(self.combined_regex(tuple(combinable)))
+        if not passes:
+            return []
+
+        starts = []
+        ends = []
+        offset = 0
+        for _, text in fields:
+            starts.append(offset)
+            offset += len(text)
+            ends.append(offset)
+            offset += 1
+
+        def detector(match, names):
+            return names if isinstance(names, str) else names[match.lastgroup]
+
+        hits = []
+        for regex, names in passes:
+            position = 0
+            while True:
+                match = regex.search(joined, position)
+                if match is None:
+                    break
+                start, end = match.span()
+                field = bisect_right(starts, start) - 1
+                if end > ends[field]:
+                    # The match runs into the next field: search this field on
+                    # its own, then carry on from the start of the next one
+                    for inner in regex.finditer(joined, start, ends[field]):
+                        hits.append((inner.start(), detector(inner, names), inner.group(), fields[field][0]))
+                    position = ends[field] + 1
+                    continue
+                hits.append((start, detector(match, names), match.group(), fields[field][0]))
+                position = end if end > start else end + 1
+
+        hits.sort(key=lambda hit: hit[0])
+        return [hit[1:] for hit in hits]
+
+    def scan_entry(self, entry):
+        """
+        Scan every text field of one HAR entry
+
+        Returns:
+            list: (detector, value, location) tuples
+        """
+        return self.scan_fields(self.entry_fields(entry))
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+HAR Stream Reader - Incremental parser for large HTTP Archive files
+
+json.load() needs the whole capture in memory before a single entry can be
+looked at, which does not work for multi-GB proxy captures. This module walks
+the HAR document with a small rolling text buffer and yields the objects of
+log.entries one at a time, so memory stays bounded by the largest single
+entry instead of the whole file.
+
+HARFollower does the same for a capture that is still being written: it
+remembers a byte offset and only parses what was appended since.
+
+Both can report the byte span of every entry, so callers can keep a few
+integers per entry and re-read a full entry later through EntryFile.
+"""
+
+import codecs
+import json
+import mmap
+import os
+import re
+
+# Size of each read from disk (bytes)
+CHUNK_SIZE = 1 << 20
+
+# Whitespace allowed between JSON tokens
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Start of the log.entries array in a HAR file
+ENTRIES_START = re.compile(rb'"entries"\s*:\s*\[')
+
+# File name endings treated as one-entry-per-line captures
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson', '.jsonlines')
+
+
+class IncrementalJSONReader:
+    """Pull-style JSON reader that only keeps a window of the file in memory"""
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE, on_progress=None):
+        """
+        Args:
+            file: Binary file object opened for reading (UTF-8 content)
+            chunk_size (int): Number of bytes to read per refill
+            on_progress (callable): Optional callback receiving the number
+                of bytes read so far after every refill
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.bytes_read = 0
+        self.eof = False
+        self.mark = 0                # Buffer position whose file byte offset is known
+        self.mark_offset = 0         # File byte offset of buffer[mark]
+
+    def fill(self, min_size=None):
+        """
+        Read more text into the buffer, dropping the part already consumed
+
+        Returns:
+            bool: False if the end of the file was reached
+        """
+        if self.eof:
+            return False
+
+        # Throw away everything before the current position
+        self.byte_offset(self.pos)
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        self.mark = 0
+
+        chunk = self.file.read(max(min_size or 0, self.chunk_size))
+        self.bytes_read += len(chunk)
+        if self.on_progress:
+            self.on_progress(self.bytes_read)
+
+        # Multi-byte characters split across reads are held back by the decoder
+        self.buffer += self.text_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self.eof = True
+            return False
+        return True
+
+    def byte_offset(self, pos):
+        """
+        Return the file byte offset of a buffer position
+
+        Positions must be asked for in increasing order; each stretch of text
+        is encoded once, so tracking offsets costs O(file size) in total.
+        """
+        text = self.buffer[self.mark:pos]
+        self.mark_offset += len(text) if text.isascii() else len(text.encode('utf-8'))
+        self.mark = pos
+        return self.mark_offset
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at end of file)"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be `char`"""
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def read_value(self):
+        """
+        Decode the next complete JSON value
+
+        Values that run past the end of the buffer are retried after reading
+        more data; the read size grows with the buffer so one huge entry does
+        not cause repeated re-decoding.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number touching the end of the buffer may be cut short
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(len(self.buffer) - self.pos)
+
+    def iter_object_keys(self):
+        """
+        Iterate over the keys of the object whose '{' comes next
+
+        The caller must consume each key's value (read_value, or a nested
+        iterator) before asking for the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", self.buffer, self.pos)
+            self.expect(':')
+            yield key
+
+            # Move on to the next key or the end of the object
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+    def iter_array(self, spans=False):
+        """
+        Iterate over the items of the array whose '[' comes next
+
+        Args:
+            spans (bool): Yield (item, start, end) with the item's byte span
+                          in the file instead of just the item
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            if spans:
+                start = self.byte_offset(self.pos)
+                value = self.read_value()
+                yield value, start, self.byte_offset(self.pos)
+            else:
+                yield self.read_value()
+
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+
+def iter_har_entries(har_file_path, chunk_size=CHUNK_SIZE, on_progress=None, spans=False):
+    """
+    Yield the entries of a HAR file one at a time without loading the file
+
+    Args:
+        har_file_path (str): Path to the HAR file
+        chunk_size (int): Number of bytes to read per refill
+        on_progress (callable): Optional callback receiving bytes read so far
+        spans (bool): Yield (entry, start, end) byte spans for EntryFile
+
+    Yields:
+        dict: One element of log.entries (or a tuple, see `spans`)
+
+    Raises:
+        KeyError: If the file has no 'log' or 'entries' key
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    with open(har_file_path, 'rb') as file:
+        reader = IncrementalJSONReader(file, chunk_size, on_progress)
+        found_log = found_entries = False
+
+        for key in reader.iter_object_keys():
+            if key != 'log':
+                reader.read_value()          # creator, comment, etc. are small
+                continue
+
+            found_log = True
+            for log_key in reader.iter_object_keys():
+                if log_key == 'entries':
+                    found_entries = True
+                    yield from reader.iter_array(spans)
+                else:
+                    reader.read_value()      # version, creator, pages
+
+        if not found_log:
+            raise KeyError('log')
+        if not found_entries:
+            raise KeyError('entries')
+
+
+class HARFollower:
+    """
+    Incrementally parse the entries appended to a growing capture
+
+    Works like `tail -f`: every poll() reads from the byte offset where the
+    previous one stopped and returns only the entries completed since. Both
+    regular HAR files (entries appended to log.entries, with or without the
+    closing brackets written yet) and JSON-lines files with one entry per
+    line are supported. An entry that is still being written is re-read on
+    the next poll; the offset only moves past complete entries, so it can be
+    stored as a checkpoint and passed back in to resume later.
+    """
+
+    def __init__(self, file_path, jsonl=None, offset=0, chunk_size=CHUNK_SIZE):
+        """
+        Args:
+            file_path (str): Capture to follow (may not be complete or even exist yet)
+            jsonl (bool): Force JSON-lines (True) or HAR (False) parsing;
+                          None detects it from the extension or first line
+            offset (int): Checkpoint from a previous follower (0 = from the start).
+                          For HAR files a non-zero offset must lie inside log.entries.
+            chunk_size (int): Max bytes read per poll (grows for huge entries)
+        """
+        self.file_path = file_path
+        if jsonl is None and file_path.lower().endswith(JSONL_EXTENSIONS):
+            jsonl = True
+        self.jsonl = jsonl
+        self.offset = offset
+        self.in_entries = offset > 0
+        self.chunk_size = chunk_size
+        self.read_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.closed = False          # HAR only: the closing ']' of log.entries was seen
+        self.entry_count = 0         # Entries returned so far
+        self.bad_lines = 0           # JSON-lines only: unparseable lines skipped
+        self.restarts = 0            # Times the file was truncated or replaced
+
+    def size(self):
+        try:
+            return os.path.getsize(self.file_path)
+        except OSError:
+            return 0
+
+    def poll(self, spans=False):
+        """
+        Return the entries appended since the last poll
+
+        Reads at most one chunk; keep calling while it returns entries to
+        catch up with a large backlog.
+
+        Args:
+            spans (bool): Return (entry, start, end) byte spans for EntryFile
+
+        Returns:
+            list: New entry dicts (or tuples, see `spans`), in file order
+        """
+        size = self.size()
+        if size < self.offset:
+            # Truncated or replaced by a new capture: start over
+            self.offset = 0
+            self.in_entries = False
+            self.restarts += 1
+        if size == self.offset:
+            return []
+
+        while True:
+            with open(self.file_path, 'rb') as file:
+                file.seek(self.offset)
+                data = file.read(self.read_size)
+
+            if self.jsonl is None:
+                self.jsonl = self.detect_jsonl(data)
+            if self.jsonl is None:
+                entries, consumed = [], 0        # First line still incomplete
+            elif self.jsonl:
+                entries, consumed = self.parse_lines(data)
+            else:
+                entries, consumed = self.parse_entries(data)
+
+            self.offset += consumed
+            if entries or len(data) < self.read_size:
+                break
+            # Nothing complete in a full read: the next entry is bigger than the window
+            if not consumed:
+                self.read_size *= 2
+
+        if entries:
+            self.read_size = self.chunk_size
+        if not spans:
+            entries = [entry for entry, _, _ in entries]
+
+        self.entry_count += len(entries)
+        return entries
+
+    def detect_jsonl(self, data):
+        """Guess the format from the first line (None until it can tell)"""
+        if self.offset or self.in_entries:
+            return False
+        line, newline, _ = data.lstrip().partition(b'\n')
+        if not newline:
+            return False if b'"log"' in line else None
+        try:
+            first = json.loads(line)
+        except ValueError:
+            return False                     # Pretty-printed HAR: '{' alone on the first line
+        return isinstance(first, dict) and 'log' not in first
+
+    def parse_lines(self, data):
+        """Parse the complete lines of a JSON-lines chunk into (entry, start, end)"""
+        end = data.rfind(b'\n') + 1
+        entries = []
+        start = 0
+        while start < end:
+            line_end = data.index(b'\n', start)
+            line = data[start:line_end]
+            if line.strip():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                    self.bad_lines += 1
+                if isinstance(entry, dict):
+                    entries.append((entry, self.offset + start, self.offset + line_end))
+            start = line_end + 1
+        return entries, end
+
+    def parse_entries(self, data):
+        """Parse the complete log.entries items of a HAR chunk into (entry, start, end)"""
+        skipped = 0
+        if not self.in_entries:
+            match = ENTRIES_START.search(data)
+            if not match:
+                return [], 0
+            self.in_entries = True
+            skipped = match.end()
+            data = data[skipped:]
+
+        # Decode up to the last complete UTF-8 character
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError as e:
+            text = data[:e.start].decode('utf-8', errors='replace')
+
+        entries = []
+        pos = 0
+        mark = 0                             # Text position whose byte offset is known
+        mark_offset = self.offset + skipped
+        while True:
+            pos = WHITESPACE.match(text, pos).end()
+            if pos < len(text) and text[pos] == ',':
+                pos += 1
+                continue
+            if pos >= len(text):
+                break
+            if text[pos] == ']':
+                # Stop in front of the bracket: writers that rewrite the end of
+                # the file on every append will put the next ',' entry here
+                self.closed = True
+                break
+            try:
+                entry, end = self.decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                break                        # Entry still being written
+            self.closed = False
+            mark_offset += len(text[mark:pos].encode('utf-8'))
+            start = mark_offset
+            mark_offset += len(text[pos:end].encode('utf-8'))
+            mark = pos = end
+            entries.append((entry, start, mark_offset))
+
+        mark_offset += len(text[mark:pos].encode('utf-8'))
+        return entries, mark_offset - self.offset
+
+
+class EntryFile:
+    """
+    Random access to single entries of a capture by byte span
+
+    The file is memory-mapped on first use, so reading one entry back costs
+    a page fault or two instead of re-parsing the capture. Callers keep only
+    the (start, end) spans from iter_har_entries(spans=True) or
+    HARFollower.poll(spans=True).
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.file = None
+        self.map = None
+
+    def entry(self, start, end):
+        """Parse and return the entry stored at file[start:end]"""
+        if self.map is None or end > len(self.map):
+            # First use, or a followed file has grown past the current mapping
+            self.close()
+            self.file = open(self.file_path, 'rb')
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return json.loads(self.map[start:end])
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -4,12 +4,44 @@
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+import argparse
+import os
+import queue
 import threading
-from scapy.all import sniff, IP, TCP, UDP, conf, get_if_list
+import time
+from collections import deque
+from scapy.all import Raw, conf, get_if_list
+from scapy.utils import RawPcapReader                        # Streams .pcap/.pcapng frames without dissecting
+from scapy.arch.common import compile_filter                 # BPF syntax check before capture starts
+from packet_ring import PacketRing, RING_SLOTS, RING_BYTES   # Raw frame storage, dissected on demand
+from packet_headers import parse_frame                       # Fast-path header fields from raw bytes
+
+# Display pipeline: the sniff thread never touches Tk. It pushes rows into a
+# bounded queue that the GUI drains in batches on root.after ticks; when the
+# GUI falls behind, rows are dropped (and counted) instead of slowing capture.
+DISPLAY_QUEUE_SIZE = 10000             # Max rows waiting for the GUI
+DISPLAY_POLL_MS = 50                   # How often the GUI drains the queue
+MAX_ROWS_PER_TICK = 500                # Rows inserted per tick so the window stays responsive
+SELECT_TIMEOUT = 0.5                   # Seconds the capture loop waits before re-checking its stop event
+
+# Capture file replay speeds offered in the GUI ("Max" = as fast as possible)
+REPLAY_SPEEDS = ("Max", "1x", "2x", "10x", "100x")
 
 # Global variables
-sniffing = False
-packet_list = []
+capture_stop = None                    # threading.Event that ends the current capture session
+capture_thread = None                  # Live capture or file replay thread
+packet_ring = None                     # PacketRing of raw frames, created by the entry point
+shown_sequences = deque()              # Ring sequence numbers of the rows in the table
+shown_count = 0                        # Rows inserted into the table so far
+display_queue = queue.Queue(maxsize=DISPLAY_QUEUE_SIZE)
+captured_count = 0                     # Packets seen by process_packet (sniff thread)
+dropped_rows = 0                       # Rows discarded because the display queue was full
+
+def init_packet_ring(slots=RING_SLOTS, buffer_bytes=RING_BYTES):
+    """Allocate the frame ring (tens of MB, so only once a capture is about to run)"""
+    global packet_ring
+    packet_ring = PacketRing(slots, buffer_bytes)
+    return packet_ring
 
 def check_interfaces():
     """Check available network interfaces"""
@@ -19,136 +51,416 @@ def check_interfaces():
         print(f"{i}: {interface}")
     return interfaces
 
-def start_sniffing():
-    """Start packet sniffing"""
-    global sniffing
-    sniffing = True
+def start_capture(target, *args):
+    """Run a capture source on its own thread (live interface or capture file)"""
+    global capture_stop, capture_thread
+    if capture_thread and capture_thread.is_alive():
+        # One session at a time: the previous thread still has to see its stop event
+        status_label.config(text="Previous capture is still stopping - try again")
+        return
+    
+    # Each session gets its own event, so a late-exiting thread can't be
+    # revived (or a new one stopped) by the next start/stop
+    capture_stop = threading.Event()
     start_button.config(state="disabled")
+    file_button.config(state="disabled")
     stop_button.config(state="normal")
+    filter_entry.config(state="disabled")   # Read at start of live capture; never applied to files
     
     # Run sniffing in a separate thread to keep GUI responsive
-    sniff_thread = threading.Thread(target=packet_sniffing_logic)
-    sniff_thread.daemon = True
-    sniff_thread.start()
+    capture_thread = threading.Thread(target=target, args=args, kwargs={'stop': capture_stop})
+    capture_thread.daemon = True
+    capture_thread.start()
+
+def start_sniffing():
+    """Start packet sniffing"""
+    # Capture filter (BPF) runs in the kernel, so unwanted frames never reach Python
+    capture_filter = filter_entry.get().strip() or None
+    if capture_filter:
+        error = check_capture_filter(capture_filter)
+        if error:
+            from tkinter import messagebox
+            messagebox.showerror("Invalid capture filter", error)
+            return
+    start_capture(packet_sniffing_logic, capture_filter)
+
+def check_capture_filter(capture_filter, linktype=1):
+    """
+    Compile a BPF expression once so mistakes are reported before capturing
+    
+    Returns:
+        str: Error message, or None if the filter compiles
+    """
+    try:
+        compile_filter(capture_filter, linktype=linktype)
+    except ImportError:
+        return "Capture filters need libpcap (Npcap on Windows)"
+    except Exception as e:
+        return f"{capture_filter!r}: {e}"
+    return None
+
+def open_capture_file():
+    """Pick a .pcap/.pcapng file and replay it at the selected speed"""
+    from tkinter import filedialog
+    capture_path = filedialog.askopenfilename(
+        title="Select Capture File",
+        filetypes=[("Capture files", "*.pcap *.pcapng *.cap"), ("All files", "*.*")]
+    )
+    if capture_path:
+        start_capture(read_capture_file, capture_path, parse_speed(speed_box.get()))
 
 def stop_sniffing():
-    """Stop packet sniffing"""
-    global sniffing
-    sniffing = False
-    start_button.config(state="normal")
+    """Ask the capture thread to stop; the controls come back once it has exited"""
+    if capture_stop:
+        capture_stop.set()
     stop_button.config(state="disabled")
 
-def packet_sniffing_logic():
-    """Main packet sniffing logic"""
+def capture_finished():
+    """Re-enable the controls after the capture thread has exited"""
+    global capture_thread
+    capture_thread = None
+    start_button.config(state="normal")
+    file_button.config(state="normal")
+    stop_button.config(state="disabled")
+    filter_entry.config(state="normal")
+
+def parse_speed(text):
+    """'Max' -> 0 (no pacing), '10x' -> 10.0"""
+    text = str(text).strip().lower()
+    if text in ('', 'max'):
+        return 0.0
+    return float(text[:-1] if text.endswith('x') else text)
+
+def packet_sniffing_logic(capture_filter=None, stop=None):
+    """
+    Main packet sniffing logic
+    
+    Args:
+        capture_filter (str): Optional BPF expression (e.g. "tcp port 443"),
+                              attached to the capture socket so the kernel
+                              (or Npcap driver) drops other frames
+        stop (threading.Event): Set to end the capture
+    
+    Returns:
+        int: Frames received
+    """
+    stop = stop or threading.Event()
+    frames = 0
     try:
         # Choose a valid network interface dynamically
         interface = conf.route.route("0.0.0.0")[0]
         
-        # Start sniffing packets
-        sniff(iface=interface, prn=process_packet, stop_filter=lambda x: not sniffing)
+        # Read raw frames instead of sniff(): scapy would dissect every packet
+        # before handing it over, and the table only needs a few header fields
+        capture_socket = conf.L2listen(iface=interface, filter=capture_filter)
+        try:
+            while not stop.is_set():
+                if not capture_socket.select([capture_socket], SELECT_TIMEOUT):
+                    continue
+                layer, frame, timestamp = capture_socket.recv_raw()
+                if frame is None:
+                    continue
+                process_frame(frame, timestamp or time.time(), conf.l2types.layer2num.get(layer, 1))
+                frames += 1
+        finally:
+            capture_socket.close()
         
     except Exception as e:
         print(f"Error during packet sniffing: {e}")
         print("Make sure you have Npcap installed and are running as Administrator")
+    stop.set()
+    return frames
+
+def frame_timestamp(reader, metadata):
+    """Capture time (epoch seconds) of a frame from RawPcapReader/RawPcapNgReader"""
+    if hasattr(metadata, 'tshigh'):
+        return ((metadata.tshigh << 32) | metadata.tslow) / metadata.tsresol
+    return metadata.sec + metadata.usec / (1e9 if reader.nano else 1e6)
+
+def read_capture_file(capture_path, speed=0.0, stop=None):
+    """
+    Stream a .pcap/.pcapng file through process_frame
+    
+    Frames are read one at a time, so multi-GB captures never sit in memory.
+    
+    Args:
+        capture_path (str): Capture file
+        speed (float): 0 replays as fast as possible; otherwise the original
+                       gaps between frames are kept, divided by `speed`
+        stop (threading.Event): Set to end the replay early
+    
+    Returns:
+        int: Frames read (IPv4/IPv6 or not)
+    """
+    stop = stop or threading.Event()
+    frames = 0
+    first_capture = first_wall = None
+    
+    try:
+        with RawPcapReader(capture_path) as reader:
+            for frame, metadata in reader:
+                if stop.is_set():
+                    break
+                timestamp = frame_timestamp(reader, metadata)
+                linktype = getattr(metadata, 'linktype', None) or getattr(reader, 'linktype', 1)
+                
+                # Pace the replay against the capture timestamps
+                if speed > 0:
+                    if first_capture is None:
+                        first_capture, first_wall = timestamp, time.monotonic()
+                    delay = (timestamp - first_capture) / speed - (time.monotonic() - first_wall)
+                    while delay > 0 and not stop.wait(min(delay, SELECT_TIMEOUT)):
+                        delay = (timestamp - first_capture) / speed - (time.monotonic() - first_wall)
+                
+                process_frame(frame, timestamp, linktype)
+                frames += 1
+    except Exception as e:
+        print(f"Error reading capture file: {e}")
+    
+    stop.set()
+    return frames
+
+def run_headless(source, args=(), print_rows=False):
+    """
+    Run a capture source without the GUI and print a summary
+    
+    The source (read_capture_file or packet_sniffing_logic) runs on a worker
+    thread and the rows are drained from the same display queue the GUI
+    uses, so this measures the real pipeline. Ctrl+C stops a live capture.
+    """
+    if packet_ring is None:
+        init_packet_ring()
+    stop = threading.Event()
+    protocols = {}
+    shown = 0
+    result = {}
+    
+    def reader():
+        started = time.perf_counter()
+        result['frames'] = source(*args, stop=stop)
+        result['elapsed'] = time.perf_counter() - started
+    
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.daemon = True
+    reader_thread.start()
+    
+    try:
+        while reader_thread.is_alive() or not display_queue.empty():
+            try:
+                row, sequence = display_queue.get(timeout=SELECT_TIMEOUT)
+            except queue.Empty:
+                continue
+            shown += 1
+            protocols[row[2]] = protocols.get(row[2], 0) + 1
+            if print_rows:
+                print(f"{sequence}\t" + "\t".join(str(value) for value in row))
+    except KeyboardInterrupt:
+        stop.set()
+        reader_thread.join()
+    
+    frames = result.get('frames', 0)
+    elapsed = result.get('elapsed', 0)
+    print(f"Frames read:   {frames}")
+    print(f"IP packets:    {captured_count} ({shown} rows, {dropped_rows} dropped)")
+    print(f"Protocols:     {', '.join(f'{name} {count}' for name, count in sorted(protocols.items()))}")
+    print(f"Elapsed:       {elapsed:.2f}s ({frames / elapsed if elapsed else 0:.0f} frames/s)")
+    return 0
+
+def process_frame(frame, timestamp, linktype=1):
+    """Process one raw captured frame (runs on the capture thread - no Tk calls here)"""
+    global captured_count, dropped_rows
+    
+    # Source, destination, protocol and length straight from the header bytes
+    row = parse_frame(frame, linktype)
+    if row is None:
+        return                         # Not IPv4/IPv6
+    
+    # Keep only the raw frame; it is dissected if the user opens it
+    sequence = packet_ring.append(frame, timestamp, linktype)
+    
+    # Hand the row to the GUI thread
+    captured_count += 1
+    try:
+        display_queue.put_nowait((row, sequence))
+    except queue.Full:
+        dropped_rows += 1
 
 def process_packet(packet):
-    """Process captured packets"""
-    global packet_list
-    
-    if IP in packet:
-        # Extract packet information
-        src_ip = packet[IP].src
-        dst_ip = packet[IP].dst
-        length = len(packet)
-        
-        # Determine protocol
-        if TCP in packet:
-            protocol = "TCP"
-        elif UDP in packet:
-            protocol = "UDP"
-        else:
-            protocol = "Other"
+    """Process an already dissected scapy packet (e.g. from sniff(prn=...))"""
+    process_frame(bytes(packet), float(packet.time), conf.l2types.layer2num.get(type(packet), 1))
+
+def drain_display_queue():
+    """Insert queued rows on the GUI thread, a bounded batch per tick"""
+    global shown_count
+    inserted = 0
+    while inserted < MAX_ROWS_PER_TICK:
+        try:
+            row, sequence = display_queue.get_nowait()
+        except queue.Empty:
+            break
         
-        # Store packet for detailed view
-        packet_list.append(packet)
-        
-        # Insert packet info into the GUI table
-        packet_tree.insert("", "end", values=(src_ip, dst_ip, protocol, length))
+        # The row id is the frame's ring sequence number, used by the detail view
+        packet_tree.insert("", "end", iid=str(sequence), values=row)
+        shown_sequences.append(sequence)
+        inserted += 1
+    
+    # Keep the table as bounded as the ring: rows of overwritten frames go
+    while shown_sequences and (len(shown_sequences) > packet_ring.slots
+                               or shown_sequences[0] not in packet_ring):
+        packet_tree.delete(str(shown_sequences.popleft()))
+    
+    if inserted:
+        shown_count += inserted
+        status_label.config(text=f"Captured: {captured_count}   Shown: {shown_count}   "
+                                 f"Dropped rows: {dropped_rows}")
+    
+    # The thread exits when stopped, or by itself at the end of a capture file
+    if capture_thread and not capture_thread.is_alive():
+        capture_finished()
+    root.after(DISPLAY_POLL_MS, drain_display_queue)
 
 def show_packet_details(event):
     """Show detailed packet information when clicked"""
     selection = packet_tree.selection()
     if selection:
-        # Get selected item index
-        item = packet_tree.selection()[0]
-        index = packet_tree.index(item)
+        # Row ids are ring sequence numbers
+        stored = packet_ring.get(int(selection[0]))
+        
+        # Clear previous details
+        detail_text.delete(1.0, tk.END)
+        
+        if stored is None:
+            detail_text.insert(tk.END, "Packet is no longer in the capture buffer.\n")
+            return
         
-        if index < len(packet_list):
-            packet = packet_list[index]
-            
-            # Clear previous details
-            detail_text.delete(1.0, tk.END)
-            
-            # Show packet details
-            detail_text.insert(tk.END, f"Packet Details:\n")
-            detail_text.insert(tk.END, f"{'='*50}\n")
-            detail_text.insert(tk.END, packet.show(dump=True))
-
-# Create the main GUI window
-root = tk.Tk()
-root.title("Python Packet Sniffer")
-root.geometry("800x600")
-
-# Create start and stop buttons
-button_frame = tk.Frame(root)
-button_frame.pack(pady=10)
-
-start_button = tk.Button(button_frame, text="Start Sniffing", command=start_sniffing, bg="green", fg="white")
-start_button.pack(side=tk.LEFT, padx=5)
-
-stop_button = tk.Button(button_frame, text="Stop Sniffing", command=stop_sniffing, bg="red", fg="white", state="disabled")
-stop_button.pack(side=tk.LEFT, padx=5)
-
-# Create packet table (Treeview widget)
-tree_frame = tk.Frame(root)
-tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-
-# Create Treeview with columns
-columns = ("Source", "Destination", "Protocol", "Length")
-packet_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=15)
-
-# Define column headings
-for col in columns:
-    packet_tree.heading(col, text=col)
-    packet_tree.column(col, width=150)
-
-# Add scrollbar to the treeview
-tree_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=packet_tree.yview)
-packet_tree.configure(yscrollcommand=tree_scrollbar.set)
-
-# Pack the treeview and scrollbar
-packet_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-# Bind click event to show packet details
-packet_tree.bind("<ButtonRelease-1>", show_packet_details)
-
-# Create packet details section
-detail_frame = tk.Frame(root)
-detail_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-
-detail_label = tk.Label(detail_frame, text="Packet Details:", font=("Arial", 12, "bold"))
-detail_label.pack(anchor=tk.W)
-
-detail_text = scrolledtext.ScrolledText(detail_frame, height=10, wrap=tk.WORD)
-detail_text.pack(fill=tk.BOTH, expand=True)
-
-# Check available interfaces when starting
-print("Checking available network interfaces...")
-check_interfaces()
+        # Full scapy dissection only for the packet being looked at
+        frame, timestamp, linktype = stored
+        packet = conf.l2types.num2layer.get(linktype, Raw)(frame)
+        packet.time = timestamp
+        
+        # Show packet details
+        detail_text.insert(tk.END, f"Packet Details:\n")
+        detail_text.insert(tk.END, f"{'='*50}\n")
+        detail_text.insert(tk.END, packet.show(dump=True))
+
+def build_gui(initial_filter=None):
+    """Create the main window and its widgets"""
+    global root, start_button, stop_button, file_button, speed_box, filter_entry, status_label, packet_tree, detail_text
+    if packet_ring is None:
+        init_packet_ring()
+    
+    # Create the main GUI window
+    root = tk.Tk()
+    root.title("Python Packet Sniffer")
+    root.geometry("800x600")
+
+    # Create start and stop buttons
+    button_frame = tk.Frame(root)
+    button_frame.pack(pady=10)
+
+    start_button = tk.Button(button_frame, text="Start Sniffing", command=start_sniffing, bg="green", fg="white")
+    start_button.pack(side=tk.LEFT, padx=5)
+
+    stop_button = tk.Button(button_frame, text="Stop Sniffing", command=stop_sniffing, bg="red", fg="white", state="disabled")
+    stop_button.pack(side=tk.LEFT, padx=5)
+
+    # Replay a recorded capture through the same pipeline
+    file_button = tk.Button(button_frame, text="Open Capture File", command=open_capture_file, bg="#2196F3", fg="white")
+    file_button.pack(side=tk.LEFT, padx=5)
+
+    speed_box = ttk.Combobox(button_frame, values=REPLAY_SPEEDS, width=6, state="readonly")
+    speed_box.set(REPLAY_SPEEDS[0])
+    speed_box.pack(side=tk.LEFT, padx=5)
+
+    # Capture filter (BPF, applied in the kernel) - separate from what the table shows
+    filter_frame = tk.Frame(root)
+    filter_frame.pack(fill=tk.X, padx=10)
+    tk.Label(filter_frame, text="Live capture filter (BPF):").pack(side=tk.LEFT)
+    filter_entry = tk.Entry(filter_frame)
+    filter_entry.insert(0, initial_filter or "")
+    filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+    # Capture counters, refreshed by drain_display_queue
+    status_label = tk.Label(button_frame, text="Captured: 0   Shown: 0   Dropped rows: 0")
+    status_label.pack(side=tk.LEFT, padx=15)
+
+    # Create packet table (Treeview widget)
+    tree_frame = tk.Frame(root)
+    tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+    # Create Treeview with columns
+    columns = ("Source", "Destination", "Protocol", "Length")
+    packet_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=15)
+
+    # Define column headings
+    for col in columns:
+        packet_tree.heading(col, text=col)
+        packet_tree.column(col, width=150)
+
+    # Add scrollbar to the treeview
+    tree_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=packet_tree.yview)
+    packet_tree.configure(yscrollcommand=tree_scrollbar.set)
+
+    # Pack the treeview and scrollbar
+    packet_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    # Bind click event to show packet details
+    packet_tree.bind("<ButtonRelease-1>", show_packet_details)
+
+    # Create packet details section
+    detail_frame = tk.Frame(root)
+    detail_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+    detail_label = tk.Label(detail_frame, text="Packet Details:", font=("Arial", 12, "bold"))
+    detail_label.pack(anchor=tk.W)
+
+    detail_text = scrolledtext.ScrolledText(detail_frame, height=10, wrap=tk.WORD)
+    detail_text.pack(fill=tk.BOTH, expand=True)
+    
+    # Start draining captured rows into the table
+    root.after(DISPLAY_POLL_MS, drain_display_queue)
 
 # Start the GUI event loop
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Python Packet Sniffer")
+    parser.add_argument("--ring-size", type=int, default=RING_SLOTS,
+                        help=f"captured frames kept for the detail view (default: {RING_SLOTS})")
+    parser.add_argument("--ring-mb", type=int, default=RING_BYTES // (1024 * 1024),
+                        help=f"memory for those frames in MB (default: {RING_BYTES // (1024 * 1024)})")
+    parser.add_argument("--read", metavar="FILE", help="replay a .pcap/.pcapng file instead of capturing live")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="replay speed multiplier for --read (default: 0 = as fast as possible)")
+    parser.add_argument("--filter", metavar="BPF",
+                        help='live capture filter applied in the kernel, e.g. "host 10.0.0.5 and tcp port 443"')
+    parser.add_argument("--no-gui", action="store_true",
+                        help="print a summary instead of opening the GUI (live capture stops with Ctrl+C)")
+    parser.add_argument("--print-rows", action="store_true", help="with --no-gui: print every table row")
+    args = parser.parse_args()
+    init_packet_ring(args.ring_size, args.ring_mb * 1024 * 1024)
+    
+    if args.filter:
+        if args.read:
+            parser.error("--filter applies to live capture only and can't be combined with --read")
+        error = check_capture_filter(args.filter)
+        if error:
+            parser.error(f"invalid capture filter: {error}")
+    
+    if args.no_gui:
+        if args.read:
+            if not os.path.isfile(args.read):
+                parser.error(f"capture file not found: {args.read}")
+            raise SystemExit(run_headless(read_capture_file, (args.read, args.speed), args.print_rows))
+        raise SystemExit(run_headless(packet_sniffing_logic, (args.filter,), args.print_rows))
+    
+    # Check available interfaces when starting
+    print("Checking available network interfaces...")
+    check_interfaces()
+    
+    build_gui(args.filter)
+    if args.read:
+        root.after(0, start_capture, read_capture_file, args.read, args.speed)
+    
     print("Starting Packet Sniffer GUI...")
     print("Note: Make sure you have Npcap installed and run as Administrator on Windows")
     root.mainloop()
@@ -160,7 +472,7 @@ if __name__ == "__main__":
 Main Differences from LMS Material:
     1. Interface Check: LMS shows simple print(get_if_list()) - Complete code adds user-friendly formatting with numbered list
 
-    2. Global Variables: LMS doesn't show explicit globals - Complete code needs sniffing = False and packet_list = [] for state management
+    2. Global Variables: LMS doesn't show explicit globals - Complete code needs a stop flag (now a threading.Event per capture session) and a packet store (now a fixed-size PacketRing of raw frames) for state management
 
     3. Error Handling: LMS mentions it conceptually - Complete code implements actual try/catch blocks
 
@@ -178,6 +490,8 @@ pip install scapy tkinter
     * Install Npcap (Windows) with WinPcap compatibility
     * Run as Administrator
     * Handles IP packets (TCP/UDP) with GUI display
+    * Offline mode: python packetSniffingTool.py --read capture.pcapng [--speed 10] [--no-gui]
+    * Capture filter: python packetSniffingTool.py --filter "tcp port 443" (BPF, dropped in the kernel; live capture only)
 
 Core Architecture:
     * Multi-threaded (GUI + packet capture)
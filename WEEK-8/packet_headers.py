@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Packet Headers - Fast-path Ethernet/IPv4/IPv6/TCP/UDP parsing from raw bytes
+
+The sniffer table only needs source, destination, protocol and length, but
+getting them through scapy (`IP in packet`, `TCP in packet`) means building
+every layer object of every frame. parse_frame() reads the few header
+fields it needs straight from the frame bytes with precompiled struct
+formats on a memoryview, without copying or dissecting. Full scapy
+dissection is still used for the detail view of a single packet.
+
+Run this module with a capture file to compare the two on real traffic:
+    python packet_headers.py capture.pcap
+"""
+
+import argparse
+import socket
+import struct
+import sys
+import time
+
+# Link types (DLT numbers) understood by parse_frame
+DLT_NULL = 0                # BSD loopback: 4-byte address family in host order
+DLT_EN10MB = 1              # Ethernet
+DLT_RAW = 101               # Raw IPv4/IPv6 (also 12 and 14 on some systems)
+DLT_LINUX_SLL = 113         # Linux "cooked" capture
+DLT_IPV4 = 228
+DLT_IPV6 = 229
+RAW_IP_LINKTYPES = (DLT_RAW, 12, 14, DLT_IPV4, DLT_IPV6)
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+VLAN_ETHERTYPES = (0x8100, 0x88A8, 0x9100)
+
+PROTOCOL_NAMES = {6: "TCP", 17: "UDP"}
+
+# IPv6 extension headers skipped on the way to TCP/UDP
+IPV6_EXTENSION_HEADERS = (0, 43, 60)   # Hop-by-hop, routing, destination options
+IPV6_FRAGMENT = 44
+
+ETHERTYPE = struct.Struct('!H')
+IPV4_HEADER = struct.Struct('!B8xB2x4s4s')         # version/IHL, protocol, src, dst
+IPV6_HEADER = struct.Struct('!6xBx16s16s')         # next header, src, dst
+IPV6_EXTENSION = struct.Struct('!BB')              # next header, length in 8-byte units - 1
+NULL_FAMILY = struct.Struct('=I')
+
+inet_ntoa = socket.inet_ntoa
+
+
+def inet6_ntoa(packed):
+    return socket.inet_ntop(socket.AF_INET6, packed)
+
+
+def network_offset(view, linktype):
+    """Return (ethertype, offset of the network header) for a frame, or (None, 0)"""
+    if linktype == DLT_EN10MB:
+        if len(view) < 14:
+            return None, 0
+        offset = 12
+        ethertype, = ETHERTYPE.unpack_from(view, offset)
+        while ethertype in VLAN_ETHERTYPES and len(view) >= offset + 6:
+            offset += 4
+            ethertype, = ETHERTYPE.unpack_from(view, offset)
+        return ethertype, offset + 2
+    if linktype in RAW_IP_LINKTYPES:
+        if not len(view):
+            return None, 0
+        version = view[0] >> 4
+        return (ETHERTYPE_IPV4 if version == 4 else ETHERTYPE_IPV6 if version == 6 else None), 0
+    if linktype == DLT_LINUX_SLL:
+        if len(view) < 16:
+            return None, 0
+        return ETHERTYPE.unpack_from(view, 14)[0], 16
+    if linktype == DLT_NULL:
+        if len(view) < 4:
+            return None, 0
+        family, = NULL_FAMILY.unpack_from(view, 0)
+        if family == socket.AF_INET:
+            return ETHERTYPE_IPV4, 4
+        if family in (24, 28, 30):          # AF_INET6 on the BSDs and macOS
+            return ETHERTYPE_IPV6, 4
+    return None, 0
+
+
+def parse_frame(frame, linktype=DLT_EN10MB):
+    """
+    Read the table fields of one captured frame
+
+    Args:
+        frame (bytes): Raw frame, link layer included
+        linktype (int): DLT number of the capture
+
+    Returns:
+        tuple: (src, dst, protocol, length) where protocol is "TCP", "UDP" or
+               "Other", or None if the frame is not IPv4/IPv6 or is truncated
+    """
+    view = memoryview(frame)
+    ethertype, offset = network_offset(view, linktype)
+
+    try:
+        if ethertype == ETHERTYPE_IPV4:
+            version_ihl, protocol, src, dst = IPV4_HEADER.unpack_from(view, offset)
+            if version_ihl >> 4 != 4:
+                return None
+            return inet_ntoa(src), inet_ntoa(dst), PROTOCOL_NAMES.get(protocol, "Other"), len(frame)
+
+        if ethertype == ETHERTYPE_IPV6:
+            protocol, src, dst = IPV6_HEADER.unpack_from(view, offset)
+            offset += 40
+            # Walk extension headers (bounded) to find the transport protocol
+            for _ in range(8):
+                if protocol in IPV6_EXTENSION_HEADERS:
+                    protocol, length = IPV6_EXTENSION.unpack_from(view, offset)
+                    offset += (length + 1) * 8
+                elif protocol == IPV6_FRAGMENT:
+                    protocol, _ = IPV6_EXTENSION.unpack_from(view, offset)
+                    offset += 8
+                else:
+                    break
+            return inet6_ntoa(src), inet6_ntoa(dst), PROTOCOL_NAMES.get(protocol, "Other"), len(frame)
+    except struct.error:
+        return None                          # Truncated header
+    return None
+
+
+def scapy_fields(frame, linktype=DLT_EN10MB):
+    """The same fields through full scapy dissection (the old code path)"""
+    from scapy.all import conf, IP, IPv6, TCP, UDP, Raw
+    packet = conf.l2types.num2layer.get(linktype, Raw)(frame)
+    if IP in packet:
+        layer = packet[IP]
+    elif IPv6 in packet:
+        layer = packet[IPv6]
+    else:
+        return None
+    protocol = "TCP" if TCP in packet else "UDP" if UDP in packet else "Other"
+    return layer.src, layer.dst, protocol, len(packet)
+
+
+def benchmark(capture_path, limit=None):
+    """
+    Time parse_frame against scapy dissection on the frames of a capture
+
+    Returns:
+        dict: frames, per-packet microseconds for both parsers, speedup and
+              the number of frames where the two disagree
+    """
+    from scapy.utils import RawPcapReader
+
+    frames = []
+    with RawPcapReader(capture_path) as reader:
+        linktype = reader.linktype
+        for frame, _ in reader:
+            frames.append(frame)
+            if limit and len(frames) >= limit:
+                break
+    if not frames:
+        raise ValueError(f"no packets in {capture_path}")
+
+    start = time.perf_counter()
+    fast = [parse_frame(frame, linktype) for frame in frames]
+    fast_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slow = [scapy_fields(frame, linktype) for frame in frames]
+    scapy_seconds = time.perf_counter() - start
+
+    return {
+        'frames': len(frames),
+        'fast_us': fast_seconds / len(frames) * 1e6,
+        'scapy_us': scapy_seconds / len(frames) * 1e6,
+        'speedup': scapy_seconds / fast_seconds if fast_seconds else float('inf'),
+        'mismatches': sum(1 for a, b in zip(fast, slow) if a != b),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the fast-path header parser against scapy")
+    parser.add_argument("capture", help=".pcap or .pcapng file")
+    parser.add_argument("-n", "--limit", type=int, help="only use the first N packets")
+    args = parser.parse_args(argv)
+
+    try:
+        result = benchmark(args.capture, args.limit)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Frames:      {result['frames']}")
+    print(f"Fast path:   {result['fast_us']:.2f} us/packet")
+    print(f"Scapy:       {result['scapy_us']:.2f} us/packet")
+    print(f"Speedup:     {result['speedup']:.1f}x")
+    print(f"Mismatches:  {result['mismatches']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
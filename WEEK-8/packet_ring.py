@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Packet Ring - Fixed-size storage of raw captured frames
+
+The sniffer used to keep every dissected scapy Packet in a list, which grows
+without bound and costs kilobytes per packet. This ring keeps only the raw
+frame bytes, the capture timestamp and the link type, in buffers that are
+allocated once:
+
+    data     - one bytearray holding frame bytes back to back, wrapping around
+    offsets  - start of each frame in data          (array 'q', one per slot)
+    lengths  - frame length                          (array 'I')
+    times    - capture timestamp                     (array 'd')
+    linktypes- DLT number used to dissect the frame  (array 'H')
+
+Every frame gets an increasing sequence number. When either the slots or the
+byte buffer run out, the oldest frames are overwritten, so memory stays flat
+however long the capture runs. A frame is dissected again (by the caller)
+only when it is looked up.
+"""
+
+import threading
+from array import array
+
+# Defaults: 100k frames in a 64 MB byte buffer
+RING_SLOTS = 100000
+RING_BYTES = 64 * 1024 * 1024
+
+
+class PacketRing:
+    """Bounded ring of raw frames addressed by sequence number"""
+
+    def __init__(self, slots=RING_SLOTS, buffer_bytes=RING_BYTES):
+        """
+        Args:
+            slots (int): Max number of frames kept
+            buffer_bytes (int): Size of the frame byte buffer; frames longer
+                                than this are truncated
+        """
+        if slots < 1 or buffer_bytes < 1:
+            raise ValueError("ring needs at least one slot and one byte")
+        self.slots = slots
+        self.data = bytearray(buffer_bytes)
+        self.offsets = array('q', bytes(8 * slots))
+        self.lengths = array('I', [0]) * slots
+        self.times = array('d', bytes(8 * slots))
+        self.linktypes = array('H', [0]) * slots
+        self.head = 0                      # Sequence number of the next frame
+        self.oldest = 0                    # Oldest sequence number still stored
+        self.position = 0                  # Write position in data
+        self.lock = threading.Lock()       # Sniff thread writes while the GUI reads
+
+    def evict_while(self, condition):
+        while self.oldest < self.head and condition(self.offsets[self.oldest % self.slots]):
+            self.oldest += 1
+
+    def append(self, frame, timestamp, linktype=1):
+        """
+        Store one raw frame
+
+        Args:
+            frame (bytes): Frame as captured (link layer included)
+            timestamp (float): Capture time (epoch seconds)
+            linktype (int): DLT number (1 = Ethernet)
+
+        Returns:
+            int: Sequence number of the frame
+        """
+        size = min(len(frame), len(self.data))
+        with self.lock:
+            # Frames never straddle the end of the buffer: wrap early instead,
+            # dropping the (oldest) frames that still sit past the write position
+            if self.position + size > len(self.data):
+                start = self.position
+                self.evict_while(lambda offset: offset >= start)
+                self.position = 0
+
+            # Free the slot and the bytes the new frame will overwrite
+            if self.head - self.oldest >= self.slots:
+                self.oldest += 1
+            end = self.position + size
+            self.evict_while(lambda offset: offset < end and offset >= self.position)
+
+            slot = self.head % self.slots
+            self.data[self.position:end] = frame[:size]
+            self.offsets[slot] = self.position
+            self.lengths[slot] = size
+            self.times[slot] = timestamp
+            self.linktypes[slot] = linktype
+            self.position = end
+
+            sequence = self.head
+            self.head += 1
+            return sequence
+
+    def get(self, sequence):
+        """
+        Return (frame bytes, timestamp, linktype), or None if the frame was
+        overwritten or never stored
+        """
+        with self.lock:
+            if not self.oldest <= sequence < self.head:
+                return None
+            slot = sequence % self.slots
+            offset = self.offsets[slot]
+            return (bytes(self.data[offset:offset + self.lengths[slot]]),
+                    self.times[slot], self.linktypes[slot])
+
+    def __contains__(self, sequence):
+        return self.oldest <= sequence < self.head
+
+    def __len__(self):
+        return self.head - self.oldest
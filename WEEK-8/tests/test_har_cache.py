@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Tests for har_cache.HARCache fallbacks"""
+
+import contextlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import har_cache
+from har_cache import HARCache
+
+
+class HARCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.har_path = os.path.join(self.tmp.name, 'capture.har')
+        with open(self.har_path, 'w', encoding='utf-8') as file:
+            file.write('{"log": {"entries": []}}')
+        self.builds = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, path):
+        self.builds += 1
+        return {'built_from': path}
+
+    def get(self, cache):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return cache.get_or_build(self.har_path, self.build, 'columns')
+
+    def test_hit_after_miss(self):
+        cache = HARCache(os.path.join(self.tmp.name, 'cache'))
+        self.assertEqual(self.get(cache), {'built_from': self.har_path})
+        self.assertEqual(self.get(cache), {'built_from': self.har_path})
+        self.assertEqual(self.builds, 1)
+
+    def test_unwritable_cache_dir_falls_back_to_build(self):
+        cache = HARCache('/proc/nonexist/har_cache')
+        self.assertEqual(self.get(cache), {'built_from': self.har_path})
+        self.assertEqual(self.builds, 1)
+
+    def test_failed_utime_keeps_the_hit(self):
+        cache = HARCache(os.path.join(self.tmp.name, 'cache'))
+        self.get(cache)
+        with mock.patch('har_cache.os.utime', side_effect=PermissionError('read-only')):
+            self.assertEqual(self.get(cache), {'built_from': self.har_path})
+        self.assertEqual(self.builds, 1)
+
+    def test_stale_pickle_is_rebuilt(self):
+        cache = HARCache(os.path.join(self.tmp.name, 'cache'))
+        self.get(cache)
+        data_path = cache.data_path(cache.content_key(self.har_path), 'columns')
+        # Pickle referring to a module that no longer exists
+        stale = pickle.dumps(HARCache).replace(b'har_cache', b'gone_mod_')
+        for payload in (stale, b'garbage', b''):
+            with self.subTest(payload=payload[:10]):
+                with open(data_path, 'wb') as file:
+                    file.write(payload)
+                builds = self.builds
+                self.assertEqual(self.get(cache), {'built_from': self.har_path})
+                self.assertEqual(self.builds, builds + 1)
+
+    def test_invalid_max_bytes_environment(self):
+        with mock.patch.dict(os.environ, {'HAR_CACHE_MAX_BYTES': '1GB'}), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(HARCache(self.tmp.name).max_bytes, har_cache.DEFAULT_MAX_BYTES)
+        with mock.patch.dict(os.environ, {'HAR_CACHE_MAX_BYTES': '1024'}):
+            self.assertEqual(HARCache(self.tmp.name).max_bytes, 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
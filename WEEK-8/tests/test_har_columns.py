@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for extract_har_columns() typed column extraction"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from har_analysis import extract_har_columns
+
+
+def entry(url='https://a.example/x', status=200, time=1.5, size=10, method='GET'):
+    return {'request': {'url': url, 'method': method},
+            'response': {'status': status, 'bodySize': size},
+            'time': time, 'timings': {'dns': -1, 'connect': 2, 'ssl': -1, 'wait': 3, 'receive': 'x'}}
+
+
+class ExtractColumnsTest(unittest.TestCase):
+    def extract(self, entries):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'capture.har')
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump({'log': {'entries': entries}}, file)
+            with contextlib.redirect_stdout(io.StringIO()):
+                return extract_har_columns(path)
+
+    def test_out_of_range_values_keep_columns_aligned(self):
+        columns = self.extract([
+            entry(status=10 ** 12),
+            entry(size=10 ** 30),
+            entry(size=2 ** 63),
+            entry(status='NaN', size='Infinity'),
+            entry(time='slow', method=7, url=12345),
+            entry(url='https://b.example/ok', status=404, size=-1),
+        ])
+        lengths = {name: len(values) for name, values in columns.items()}
+        self.assertEqual(set(lengths.values()), {6}, lengths)
+        self.assertEqual(list(columns['status']), [0, 200, 200, 0, 200, 404])
+        self.assertEqual(list(columns['size']), [10, 0, 0, 0, 10, 0])
+        self.assertEqual(columns['url'][4], '12345')
+        self.assertEqual(columns['method'][4], '7')
+        self.assertEqual(columns['host'][5], 'b.example')
+
+    def test_unparseable_entry_is_skipped_whole(self):
+        columns = self.extract([entry(url='http://[broken/'), entry()])
+        self.assertEqual({len(values) for values in columns.values()}, {1})
+
+
+if __name__ == '__main__':
+    unittest.main()
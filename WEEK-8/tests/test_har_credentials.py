@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Tests for har_credentials name matching and entry_credentials()"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from har_credentials import ISSUED, USED, entry_credentials, is_token_name
+
+
+def header(name, value):
+    return {'name': name, 'value': value}
+
+
+class TokenNameTest(unittest.TestCase):
+    def test_credential_names(self):
+        for name in ('token', 'X-Auth-Token', 'session_id', 'sessionid', 'access_token', 'api-key',
+                     'apikey', 'X-API-Key', 'Authorization', 'jwt', 'client_secret', 'password',
+                     'passwd', 'user.credential', 'sid', 'accessToken', 'refreshToken', 'idToken',
+                     'sessionToken', 'authToken', 'AuthToken', 'PHPSESSID', 'JSESSIONID',
+                     'ASP.NET_SessionId', 'csrfToken', 'user.apiKey'):
+            with self.subTest(name=name):
+                self.assertTrue(is_token_name(name))
+
+    def test_names_that_only_contain_a_keyword(self):
+        for name in (':authority', 'author', 'considered', 'assessment', 'x-authored-by',
+                     'WWW-Authenticate', 'www-authenticate', ':path', 'tokenizer', 'side',
+                     'AUTHOR', 'authorName', 'AUTHENTICATED', 'isSideBar', 'Access-Control-Allow-Origin',
+                     'considerAuthored', 'tokens', 'obsession'):
+            with self.subTest(name=name):
+                self.assertFalse(is_token_name(name))
+
+
+class EntryCredentialsTest(unittest.TestCase):
+    def test_http2_request_keeps_only_real_credentials(self):
+        entry = {
+            'request': {
+                'url': 'https://api.example.com/v1/items?author=someone-long&api_key=abcdef123456',
+                'headers': [header(':authority', 'api.example.com'),
+                            header(':path', '/v1/items'),
+                            header('x-authored-by', 'someone-long'),
+                            header('X-Auth-Token', 'tok_1234567890')],
+            },
+            'response': {
+                'headers': [header('WWW-Authenticate', 'Bearer realm="example"'),
+                            header('Set-Cookie', 'session=sess_abcdef123; Path=/')],
+            },
+        }
+        found = {(value, role) for value, role, _, _ in entry_credentials(entry)}
+        self.assertEqual(found, {('tok_1234567890', USED), ('abcdef123456', USED),
+                                 ('sess_abcdef123', ISSUED)})
+
+    def test_camel_case_json_tokens(self):
+        entry = {'request': {'url': 'https://auth.example.com/token', 'headers': []},
+                 'response': {'headers': []}}
+        response_json = {'accessToken': 'at_1234567890', 'data': {'refreshToken': 'rt_1234567890'},
+                         'author': 'someone-long'}
+        found = {(value, role, name) for value, role, _, name in entry_credentials(entry, response_json)}
+        self.assertEqual(found, {('at_1234567890', ISSUED, 'accessToken'),
+                                 ('rt_1234567890', ISSUED, 'data.refreshToken')})
+
+    def test_plain_http2_request_has_no_credentials(self):
+        entry = {'request': {'url': 'https://cdn.example.com/app.js',
+                             'headers': [header(':authority', 'cdn.example.com'),
+                                         header(':scheme', 'https')]},
+                 'response': {'headers': [header('content-type', 'text/javascript')]}}
+        self.assertEqual(entry_credentials(entry), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Headless tests of the GUI load path: loader thread -> bounded queue ->
+batched inserts into the request table's RequestStore
+
+Tk widgets are replaced with mocks, so no display is needed; the worker
+threads, queues, RequestStore and EntryFile are the real ones.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PythonPoweredHARAnalysis as analyzer
+from har_generator import generate_har
+from har_stream import iter_har_entries
+
+# Size of the stand-in capture
+ENTRIES = 20000
+
+
+def make_app():
+    """HARAnalyzerApp with every Tk module replaced by a mock"""
+    gui = {name: mock.MagicMock() for name in ('tk', 'ttk', 'filedialog', 'messagebox', 'scrolledtext')}
+    patcher = mock.patch.multiple(analyzer, load_gui_libraries=mock.DEFAULT, **gui)
+    patcher.start()
+    app = analyzer.HARAnalyzerApp(mock.MagicMock())
+    return app, patcher
+
+
+def drain(app, timeout=60):
+    """
+    Run poll_load_queue until the worker finishes (the root.after loop by hand)
+
+    Returns:
+        list: Rows inserted per tick
+    """
+    inserted = []
+    original = app.request_table.append_rows
+
+    def append_rows(rows):
+        inserted[-1] += len(rows)
+        original(rows)
+
+    app.request_table.append_rows = append_rows
+    deadline = analyzer.time.monotonic() + timeout
+    while app.load_queue is not None:
+        if analyzer.time.monotonic() > deadline:
+            raise AssertionError("loader did not finish")
+        inserted.append(0)
+        app.poll_load_queue()
+        analyzer.time.sleep(0.001)
+    app.request_table.append_rows = original
+    return inserted
+
+
+def drain_until(app, condition, timeout=30):
+    """Poll a following app until condition() holds"""
+    deadline = analyzer.time.monotonic() + timeout
+    while not condition():
+        if analyzer.time.monotonic() > deadline:
+            raise AssertionError("condition not reached while following")
+        app.poll_load_queue()
+        analyzer.time.sleep(0.005)
+
+
+def jsonl_entry(url, status=200):
+    return json.dumps({'request': {'method': 'GET', 'url': url, 'headers': []},
+                       'response': {'status': status, 'headers': [], 'content': {}},
+                       'time': 1.0}) + '\n'
+
+
+class RequestStoreTest(unittest.TestCase):
+    def test_columns_and_records(self):
+        store = analyzer.RequestStore()
+        store.append(('https://a.example/x', 200, 12.5, 'GET', 321, 10, 90))
+        store.append(('https://a.example/y', 'Unknown', None, 'BREW', 'n/a', -1, -1))
+        store.append(('https://a.example/z', '404', '7', 'GET', 0, 90, 150))
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.row(0), ('https://a.example/x', 200, '12.50'))
+        self.assertEqual(store.row(1), ('https://a.example/y', 'Unknown', '0.00'))
+        self.assertEqual(store.method_names, ['GET', 'BREW'])
+
+        record = store.record(2)
+        self.assertEqual((record.method, record.status, record.time, record.offset, record.length),
+                         ('GET', 404, 7.0, 90, 60))
+        record = store.record(1)
+        self.assertEqual((record.size, record.offset, record.length), (-1, -1, 0))
+
+    def test_out_of_range_values_keep_columns_aligned(self):
+        store = analyzer.RequestStore()
+        store.append(('https://a.example/big', 2 ** 40, 1.0, 'GET', 2 ** 70, 0, 10))
+        store.append(('https://a.example/nan', float('nan'), float('inf'), 'GET', -5, 10, 20))
+        store.append(('https://a.example/ok', 200, 3.0, 'GET', 2 ** 40, 20, 30))
+
+        columns = (store.urls, store.statuses, store.times, store.methods, store.sizes, store.offsets, store.lengths)
+        self.assertEqual({len(column) for column in columns}, {3})
+        self.assertEqual(store.row(0), ('https://a.example/big', 'Unknown', '1.00'))
+        self.assertEqual(store.record(0).size, -1)
+        self.assertEqual(store.record(1).size, -1)
+        self.assertEqual(store.record(2).size, 2 ** 40)
+
+
+class LoadWorkerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.har_path = os.path.join(cls.tmp.name, 'standin.har')
+        cls.summary = generate_har(cls.har_path, ENTRIES, body_size=128, flag_density=0.001, seed=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.app, patcher = make_app()
+        self.addCleanup(patcher.stop)
+        analyzer.filedialog.askopenfilename.return_value = self.har_path
+
+    def test_load_inserts_every_entry_in_bounded_batches(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.app.load_har_file()
+            self.assertEqual(self.app.load_queue.maxsize, analyzer.LOAD_QUEUE_SIZE)
+            per_tick = drain(self.app)
+
+        store = self.app.request_table.store
+        self.assertEqual(len(store), ENTRIES)
+        self.assertEqual(self.app.entry_count, ENTRIES)
+        self.assertEqual(self.app.har_file_path, self.har_path)
+        self.assertLessEqual(max(per_tick), analyzer.MAX_ROWS_PER_TICK + analyzer.ROW_BATCH_SIZE)
+        self.assertGreater(len([n for n in per_tick if n]), 1)          # Spread over several ticks
+
+        # Store columns line up with the file, and byte spans re-read the right entry
+        for index, entry in enumerate(iter_har_entries(self.har_path)):
+            if index % 997:
+                continue
+            record = store.record(index)
+            self.assertEqual(record.url, entry['request']['url'])
+            self.assertEqual(record.status, entry['response']['status'])
+            reread = self.app.entry_file.entry(record.offset, record.offset + record.length)
+            self.assertEqual(reread['startedDateTime'], entry['startedDateTime'])
+
+        # Analysis works from the findings built while loading
+        self.app.search_flags()
+        self.assertEqual({finding['flag'] for finding in self.app.analysis.flags_found},
+                         {flag for _, _, flag in self.summary['flags']})
+
+    def test_reload_clears_previous_findings(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.app.load_har_file()
+            drain(self.app)
+            self.app.search_flags()
+            self.app.extract_session_tokens()
+            self.assertTrue(self.app.analysis.flags_found)
+            self.assertTrue(self.app.analysis.session_tokens)
+
+            # A capture without flags or tokens: nothing from the first file survives
+            empty_path = os.path.join(self.tmp.name, 'plain.har')
+            generate_har(empty_path, 10, flag_density=0, token_density=0)
+            analyzer.filedialog.askopenfilename.return_value = empty_path
+            self.app.token_tree.delete.reset_mock()
+            self.app.load_har_file()
+            self.assertEqual(len(self.app.analysis.flags_found), 0)
+            self.assertEqual(len(self.app.analysis.secrets_found), 0)
+            self.assertEqual(self.app.analysis.session_tokens, [])
+            self.app.token_tree.delete.assert_called()
+            self.app.flag_text.delete.assert_called()
+            drain(self.app)
+        self.assertEqual(len(self.app.request_table.store), 10)
+
+    def test_cancel_stops_the_worker(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.app.load_har_file()
+            self.app.cancel_loading()
+            drain(self.app)
+        self.assertLessEqual(len(self.app.request_table.store), ENTRIES)
+        self.assertIsNone(self.app.har_file_path)
+        self.assertIn('Cancelled', self.app.status_label.config.call_args[1]['text'])
+
+
+
+class FollowTest(unittest.TestCase):
+    def setUp(self):
+        self.app, patcher = make_app()
+        self.addCleanup(patcher.stop)
+        follow_poll = mock.patch.object(analyzer, 'FOLLOW_POLL_SECONDS', 0.02)
+        follow_poll.start()
+        self.addCleanup(follow_poll.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'live.jsonl')
+        analyzer.filedialog.askopenfilename.return_value = self.path
+
+    def stop(self):
+        self.app.cancel_loading()
+        drain(self.app)
+
+    def test_unreadable_entry_keeps_a_placeholder_row(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(jsonl_entry('https://a.example/0'))
+            file.write('{"request": "not an object"}\n')
+            file.write(jsonl_entry('https://a.example/2'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.app.follow_har_file()
+            drain_until(self.app, lambda: self.app.entry_count == 3)
+            self.stop()
+
+        store = self.app.request_table.store
+        self.assertEqual(store.urls, ['https://a.example/0', 'Unreadable entry', 'https://a.example/2'])
+        record = store.record(2)
+        self.assertEqual(self.app.entry_file.entry(record.offset, record.offset + record.length)
+                         ['request']['url'], 'https://a.example/2')
+
+    def test_truncated_file_resets_rows_and_findings(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            for n in range(50):
+                file.write(jsonl_entry(f"https://old.example/{n}?debug=FLAG{{old_{n}}}"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.app.follow_har_file()
+            drain_until(self.app, lambda: self.app.entry_count == 50)
+            self.assertEqual(len(self.app.analysis.flags_found), 50)
+
+            # Replace the capture with a shorter one
+            with open(self.path, 'w', encoding='utf-8') as file:
+                for n in range(3):
+                    file.write(jsonl_entry(f"https://new.example/{n}", status=201))
+            drain_until(self.app, lambda: self.app.request_table.store.urls[:1] == ['https://new.example/0']
+                        and self.app.entry_count == 3)
+            self.stop()
+
+        store = self.app.request_table.store
+        self.assertEqual(store.urls, [f"https://new.example/{n}" for n in range(3)])
+        self.assertEqual(len(self.app.analysis.flags_found), 0)
+        for index in range(3):
+            record = store.record(index)
+            entry = self.app.entry_file.entry(record.offset, record.offset + record.length)
+            self.assertEqual(entry['request']['url'], record.url)
+
+
+if __name__ == '__main__':
+    unittest.main()
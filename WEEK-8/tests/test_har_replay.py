@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Tests for har_replay against a local http.server stand-in"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+# Extra latency the stand-in server adds to /v1/users/... requests
+SLOW_SECONDS = 0.05
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'        # Keep-alive, so pooled sessions reuse connections
+
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.server.seen.append((self.command, self.path, body, self.headers.get('X-Test')))
+        if self.path.startswith('/v1/users/'):
+            time.sleep(SLOW_SECONDS)
+        payload = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+def entry(method, url, wait_ms=1.0, body=None):
+    request = {'method': method, 'url': url,
+               'headers': [{'name': ':authority', 'value': 'api.example.com'},
+                           {'name': 'Connection', 'value': 'close'},
+                           {'name': 'X-Test', 'value': 'replayed'}]}
+    if body is not None:
+        request['postData'] = {'mimeType': 'application/json', 'text': body}
+    return {'startedDateTime': '2024-01-01T00:00:00.000Z', 'time': wait_ms, 'request': request,
+            'response': {'status': 200, 'headers': [], 'content': {}},
+            'timings': {'send': 0, 'wait': wait_ms, 'receive': 0}}
+
+
+@unittest.skipIf(requests is None, "requests is not installed")
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.server.seen = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        # Six requests for different users of one endpoint (captured at ~1 ms)
+        # and six fast /v1/search requests captured at their real speed
+        self.entries = [entry('GET', f"https://api.example.com/v1/users/{user_id}") for user_id in range(1, 7)]
+        self.entries += [entry('GET', f"https://api.example.com/v1/search?q={n}", wait_ms=1000) for n in range(6)]
+        self.entries.append(entry('POST', 'https://api.example.com/v1/items', body='{"name": "x"}'))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_replayer_sends_every_method_to_the_base_url(self):
+        from har_replay import HARReplayer
+        replayer = HARReplayer(concurrency=4, base_url=self.base_url)
+        try:
+            results = replayer.replay(self.entries)
+        finally:
+            replayer.close()
+
+        self.assertEqual([result['index'] for result in results], list(range(len(self.entries))))
+        self.assertTrue(all(result['status'] == 200 and not result['error'] for result in results))
+        self.assertIn(('POST', '/v1/items', b'{"name": "x"}', 'replayed'), self.server.seen)
+        self.assertEqual(len(self.server.seen), len(self.entries))
+
+    def test_benchmark_report_groups_endpoints_by_template(self):
+        from PythonPoweredHARAnalysis import benchmark_replay
+        with tempfile.TemporaryDirectory() as tmp:
+            har_path = os.path.join(tmp, 'capture.har')
+            report_path = os.path.join(tmp, 'report.json')
+            with open(har_path, 'w', encoding='utf-8') as file:
+                json.dump({'log': {'entries': self.entries}}, file)
+            with contextlib.redirect_stdout(io.StringIO()):
+                report = benchmark_replay(har_path, report_path, threshold=5, concurrency=4,
+                                          base_url=self.base_url)
+            with open(report_path, 'r', encoding='utf-8') as file:
+                self.assertEqual(json.load(file)['requests'], len(self.entries))
+
+        paths = {(group['method'], group['path']): group['count'] for group in report['endpoints']}
+        self.assertEqual(paths, {('GET', '/v1/users/{id}'): 6, ('GET', '/v1/search'): 6,
+                                 ('POST', '/v1/items'): 1})
+        regressed = [group.get('path') for group in report['regressions']]
+        self.assertIn('/v1/users/{id}', regressed)
+        self.assertNotIn('/v1/search', regressed)
+
+
+if __name__ == '__main__':
+    unittest.main()